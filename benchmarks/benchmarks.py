@@ -1,11 +1,34 @@
-from imas_validator.rules.loading import load_rules
+import sys
+from pathlib import Path
+
+import imas  # type: ignore
+
+from imas_validator.report.summaryReportGenerator import SummaryReportGenerator
+from imas_validator.report.validationReportGenerator import ValidationReportGenerator
+from imas_validator.rules.ast_rewrite import _get_cache_path, compile_rule_file
+from imas_validator.rules.data import IDSValidationRule
+from imas_validator.rules.helpers import Select
+from imas_validator.rules.loading import (
+    discover_rule_modules,
+    discover_rulesets,
+    load_rules,
+)
+from imas_validator.training.benchmark_setup import (
+    benchmark_core_profiles,
+    benchmark_uri,
+    create_benchmark_db_entry,
+)
+from imas_validator.validate.ids_wrapper import IDSWrapper
 from imas_validator.validate.result_collector import ResultCollector
 from imas_validator.validate.validate import validate
 from imas_validator.validate_options import RuleFilter, ValidateOptions
 
-uri_list = [
-    "imas:hdf5?path=/work/imas/shared/imasdb/ITER/3/130505/3",
-]
+# Sizes of the synthetic data entries: number of time slices, number of ions and
+# number of nodes of the GGD grids
+entry_sizes = {
+    "small": (10, 2, 100),
+    "medium": (20, 5, 500),
+}
 
 generic_ruleset_list = [
     "generic",
@@ -14,53 +37,210 @@ generic_ruleset_list = [
 ]
 
 
-class FullValidate:
+class SyntheticEntries:
+    """Base class of benchmarks on the synthetic data entries"""
+
+    def setup_cache(self):
+        # Runs once in a directory that asv keeps for the benchmarks of the class
+        return {
+            size: create_benchmark_db_entry(
+                benchmark_uri(Path.cwd(), f"benchmark_{size}"), *entry_size
+            )
+            for size, entry_size in entry_sizes.items()
+        }
+
+    setup_cache.timeout = 600
+
+
+class FullValidate(SyntheticEntries):
     params = [
-        uri_list,
+        list(entry_sizes),
         generic_ruleset_list,
     ]
+    param_names = ["size", "ruleset"]
 
-    def setup(self, uri, ruleset):
+    def setup(self, uris, size, ruleset):
         self.validate_options = ValidateOptions(
             rulesets=[ruleset],
         )
 
-    def time_validate_full_run(self, uri, ruleset):
+    def time_validate_full_run(self, uris, size, ruleset):
         validate(
-            imas_uri=uri,
+            imas_uri=uris[size],
             validate_options=self.validate_options,
         )
+
     time_validate_full_run.timeout = 300
 
+    def peakmem_validate_full_run(self, uris, size, ruleset):
+        validate(
+            imas_uri=uris[size],
+            validate_options=self.validate_options,
+        )
 
-class NodeDict:
-    params = uri_list
+    peakmem_validate_full_run.timeout = 300
 
-    def setup(self, uri):
+
+class NodeDict(SyntheticEntries):
+    params = list(entry_sizes)
+    param_names = ["size"]
+
+    def setup(self, uris, size):
         rule_filter = RuleFilter(name=["increasing_time"])
         self.validate_options = ValidateOptions(
             rule_filter=rule_filter,
             track_node_dict=True,
         )
 
-    def time_validate_with_node_dict(self, uri):
+    def time_validate_with_node_dict(self, uris, size):
         validate(
-            imas_uri=uri,
+            imas_uri=uris[size],
             validate_options=self.validate_options,
         )
+
     time_validate_with_node_dict.timeout = 300
 
+    def peakmem_validate_with_node_dict(self, uris, size):
+        validate(
+            imas_uri=uris[size],
+            validate_options=self.validate_options,
+        )
+
+    peakmem_validate_with_node_dict.timeout = 300
+
+
+class NodeReport(SyntheticEntries):
+    params = [
+        list(entry_sizes),
+        [True, False],
+    ]
+    param_names = ["size", "node_report"]
+
+    def setup(self, uris, size, node_report):
+        self.validate_options = ValidateOptions(
+            rulesets=["generic"],
+            node_report=node_report,
+        )
+
+    def time_validate_generic(self, uris, size, node_report):
+        validate(
+            imas_uri=uris[size],
+            validate_options=self.validate_options,
+        )
+
+    time_validate_generic.timeout = 300
+
+
+class SelectQueries(SyntheticEntries):
+    params = [
+        list(entry_sizes),
+        [".*", "(^|/)time$", "_min$", "_error_upper$"],
+    ]
+    param_names = ["size", "query"]
+    timeout = 300
+
+    def setup(self, uris, size, query):
+        with imas.DBEntry(uris[size], "r") as entry:
+            self.edge_profiles = IDSWrapper(entry.get("edge_profiles"))
+
+    def time_select(self, uris, size, query):
+        for _ in Select(self.edge_profiles, query):
+            pass
+
+
+class GenerateReports(SyntheticEntries):
+    params = list(entry_sizes)
+    param_names = ["size"]
+    timeout = 300
+
+    def setup(self, uris, size):
+        self.results = validate(
+            imas_uri=uris[size],
+            validate_options=ValidateOptions(
+                rulesets=["generic"],
+                track_node_dict=True,
+            ),
+        )
+
+    def time_generate_reports(self, uris, size):
+        # The reports are generated when the generators are created
+        ValidationReportGenerator(self.results)
+        SummaryReportGenerator([self.results], "")
+
+    def peakmem_generate_reports(self, uris, size):
+        # The reports are generated when the generators are created
+        ValidationReportGenerator(self.results)
+        SummaryReportGenerator([self.results], "")
+
 
 class LoadRules:
-    def setup(self):
+    params = ["cold", "warm"]
+    param_names = ["cache"]
+    # setup is called once per repeat, so run a single load per repeat to keep the
+    # cache cold
+    number = 1
+
+    def setup(self, cache):
         self.validate_options = ValidateOptions()
         self.result_collector = ResultCollector(
             validate_options=self.validate_options,
-            imas_uri=uri_list[0],
+            imas_uri="",
         )
+        # Rule files are cached even when bytecode writing is disabled for asv
+        sys.dont_write_bytecode = False
+        rule_dirs = discover_rulesets(validate_options=self.validate_options)
+        for path in discover_rule_modules(rule_dirs):
+            cache_path = _get_cache_path(path)
+            if cache == "cold":
+                cache_path.unlink(missing_ok=True)
+            else:
+                compile_rule_file(path)
 
-    def time_load_rules(self):
+    def time_load_rules(self, cache):
         load_rules(
             result_collector=self.result_collector,
             validate_options=self.validate_options,
         )
+
+
+class AssertThroughput:
+    params = [False, True]
+    param_names = ["track_node_dict"]
+
+    def setup(self, track_node_dict):
+        self.result_collector = ResultCollector(
+            validate_options=ValidateOptions(track_node_dict=track_node_dict),
+            imas_uri="",
+        )
+        ids = imas.IDSFactory("3.40.1").core_profiles()
+        ids.ids_properties.homogeneous_time = 1
+        ids.time = [0.0]
+        rule = IDSValidationRule(Path("t/rules.py"), lambda ids: None, "*")
+        self.result_collector.set_context(rule, [(ids, "core_profiles", 0)])
+        self.test = IDSWrapper(ids).time[0] >= 0
+
+    def time_assert(self, track_node_dict):
+        assert_ = self.result_collector.assert_
+        test = self.test
+        for _ in range(10_000):
+            assert_(test)
+        self.result_collector.results.clear()
+
+
+class WrapperExpressions:
+    params = [100, 1000, 10_000]
+    param_names = ["length"]
+
+    def setup(self, length):
+        ids = benchmark_core_profiles(1, length)
+        self.profiles_1d = IDSWrapper(ids).profiles_1d[0]
+
+    def time_sum_over_ions(self, length):
+        profiles_1d = self.profiles_1d
+        sum(ion.density * ion.z_ion for ion in profiles_1d.ion)
+
+    def time_long_chain(self, length):
+        z_ion = self.profiles_1d.ion[0].z_ion
+        result = z_ion
+        for _ in range(length):
+            result = result + z_ion
@@ -87,12 +87,39 @@ def find_structure_by_index(list_of_aos, index):
     assert False, f"{list_of_aos} does not have an AoS with identifier index of {index}"
 
 
+def is_filled(node):
+    """Return whether a node, or any of the nodes in a structure, has a value.
+
+    Unlike `has_value`, this also works for structures of lazy loaded IDSs.
+    """
+    if node.metadata.data_type == IDSDataType.STRUCTURE:
+        return has_filled_children(node)
+    return node.has_value
+
+
+def has_filled_children(structure):
+    """Return whether any of the children of a structure, e.g. an element of an AoS,
+    has a value. This also works for lazy loaded IDSs."""
+    return any(is_filled(child) for child in structure)
+
+
+def iter_filled_children(structure):
+    """Iterate over the filled children of a structure.
+
+    Unlike `iter_nonempty_`, this also iterates over the children of lazy loaded IDSs
+    that have not been loaded yet.
+    """
+    for child in structure:
+        if is_filled(child):
+            yield child
+
+
 def recursive_ggd_path_search(quantity, scalar_list, vector_list):
     """Recursively searches through an IDS node for scalar GGD arrays
     (real & complex) and vector GGD arrays (regular and rphiz), and stores
     these in the scalar and vector lists, respectively.
     """
-    for subquantity in quantity.iter_nonempty_():
+    for subquantity in iter_filled_children(quantity):
         if subquantity.metadata.data_type == IDSDataType.STRUCT_ARRAY:
             # Get scalar and complex scalar array quantities
             if subquantity.metadata.structure_reference in [
@@ -301,7 +328,7 @@ def validate_obj_per_dim_geometry_size(ids):
     for grid_ggd in get_defined_grids(ids):
         for space in grid_ggd.space:
             for dim, obj_per_dim in enumerate(space.objects_per_dimension):
-                geometry_content = obj_per_dim.geometry_content
+                geometry_content = obj_per_dim.geometry_content.index
                 for obj in obj_per_dim.object:
                     geometry = obj.geometry
                     if geometry_content.has_value and geometry_content != 0:
@@ -530,7 +557,7 @@ def validate_ggd_arrays(ids):
             )
             grid_subset_index = sub_array.grid_subset_index
 
-            assert sub_array.has_value, (
+            assert has_filled_children(sub_array), (
                 "at least one quantity of a GGD array must be filled"
             )
 
@@ -550,7 +577,7 @@ def validate_ggd_arrays(ids):
             if grid_subset is None or grid_subset.identifier.index in [1, 2, 5, 43]:
                 continue
 
-            for quantity in sub_array.iter_nonempty_():
+            for quantity in iter_filled_children(sub_array):
                 if (
                     quantity.metadata.name != "grid_index"
                     and quantity.metadata.name != "grid_subset_index"
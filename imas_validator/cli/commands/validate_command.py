@@ -1,12 +1,14 @@
 import argparse
 import logging
 from pathlib import Path
+from typing import Optional
 
 from imas_validator.common.utils import (
     flatten_2d_list_or_return_empty,
     prepare_rule_filter_object,
 )
-from imas_validator.validate.validate import validate
+from imas_validator.validate.result import IDSValidationResultCollection
+from imas_validator.validate.validate import Validator
 from imas_validator.validate_options import ValidateOptions
 
 from .command_generic import GenericCommand
@@ -31,13 +33,45 @@ class ValidateCommand(GenericCommand):
             track_node_dict=args.node_coverage,
             rule_filter=prepare_rule_filter_object(args),
             explore=False,
+            jobs=args.jobs,
+            ids_cache_size=args.ids_cache_size,
+            prefetch=args.prefetch,
+            partial_load=args.partial_load,
+            lazy_load=args.lazy_load,
+            time_window=args.time_window,
+            aggregate_passes=args.aggregate_passes,
+            columnar_results=args.columnar_results,
+            results_dir=(
+                Path(args.resume or args.results_dir)
+                if args.resume or args.results_dir
+                else None
+            ),
+            resume=args.resume is not None,
+            cache_dir=Path(args.cache_dir) if args.cache_dir else None,
+            refresh_cache=args.refresh_cache,
+            profile=args.profile,
+            profile_rules=args.profile_rules,
+            node_report=not args.no_node_report,  # invert logic
         )
+        # Validator with loaded rules, which can be shared by multiple commands
+        self.validator: Optional[Validator] = None
+
+    @property
+    def uri(self) -> str:
+        return self._uri
+
+    def set_result(self, result: IDSValidationResultCollection) -> None:
+        """Store the result of a validation that was executed elsewhere, for example
+        in a batch of URIs that are validated concurrently.
+        """
+        super().execute()
+        self._result = result
 
     def execute(self) -> None:
         super().execute()
-        self._result = validate(
-            imas_uri=self._uri, validate_options=self.validate_options
-        )
+        if self.validator is None:
+            self.validator = Validator(validate_options=self.validate_options)
+        self._result = self.validator.validate(self._uri)
 
     def __str__(self) -> str:
         return f"VALIDATE URI={self._uri} VALIDATE_OPTIONS={self.validate_options}"
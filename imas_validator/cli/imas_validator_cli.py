@@ -4,6 +4,7 @@ import logging
 import os
 import sys
 from datetime import datetime
+from pathlib import Path
 from typing import List
 
 from junit2htmlreport.parser import Junit  # type: ignore
@@ -13,7 +14,15 @@ from imas_validator.cli.commands.command_interface import CommandNotRecognisedEx
 from imas_validator.cli.commands.validate_command import ValidateCommand
 from imas_validator.report.summaryReportGenerator import SummaryReportGenerator
 from imas_validator.report.validationReportGenerator import ValidationReportGenerator
+from imas_validator.validate.batch import validate_uris
 from imas_validator.validate.result import IDSValidationResultCollection
+from imas_validator.validate.result_cache import ResultCache
+from imas_validator.validate.result_store import all_successful
+from imas_validator.validate.rule_profile import (
+    save_rule_call_stats,
+    save_rule_profiles,
+)
+from imas_validator.validate.validate import Validator
 
 cli_logger = logging.getLogger(__name__)
 cli_logger.setLevel(logging.INFO)
@@ -88,10 +97,145 @@ def configure_argument_parser() -> argparse.ArgumentParser:
         help="Track the node coverage for a test",
     )
 
+    validate_group.add_argument(
+        "--no-node-report",
+        action="store_true",
+        default=False,
+        help="Do not record the IDS nodes used by every test, which are listed in "
+        "the reports. This speeds up validation.",
+    )
+
     validate_group.add_argument(
         "-o", "--output", help="""Specify report directory path"""
     )
 
+    validate_group.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes used to validate the IDSs of a data entry",
+    )
+
+    validate_group.add_argument(
+        "--ids-cache-size",
+        type=int,
+        default=100_000_000,
+        help="Memory budget in bytes for caching loaded IDSs that are used by "
+        "multi-IDS rules. Use 0 to disable the cache.",
+    )
+
+    validate_group.add_argument(
+        "--prefetch",
+        type=int,
+        default=1,
+        help="Number of IDSs that are loaded in the background while the rules are "
+        "executed. Use 0 to disable prefetching.",
+    )
+
+    validate_group.add_argument(
+        "--partial-load",
+        action="store_true",
+        help="Only load the IDS paths that the selected rules may read",
+    )
+
+    validate_group.add_argument(
+        "--lazy-load",
+        action="store_true",
+        help="Lazy load the IDSs, so only the data that the rules access is read",
+    )
+
+    validate_group.add_argument(
+        "--aggregate-passes",
+        action="store_true",
+        help="Count passing assertions per rule and source location instead of "
+        "storing a result for each of them, to reduce memory usage",
+    )
+
+    validate_group.add_argument(
+        "--columnar-results",
+        action="store_true",
+        help="Store the results in arrays instead of separate result objects, to "
+        "reduce memory usage and speed up reporting of runs with many results",
+    )
+
+    validate_group.add_argument(
+        "--results-dir",
+        type=str,
+        default=None,
+        help="Directory in which the results are written while they are produced, "
+        "one JSON Lines file per URI",
+    )
+
+    validate_group.add_argument(
+        "--resume",
+        type=str,
+        default=None,
+        metavar="RUN_DIR",
+        help="Resume an interrupted validation run of which the results were written "
+        "to RUN_DIR with --results-dir. Completed work is not validated again.",
+    )
+
+    validate_group.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Directory of a persistent result cache. Results of IDSs of which the "
+        "data and rules did not change are reused instead of validating them again.",
+    )
+
+    validate_group.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        help="Do not reuse cached results, but replace them with new results",
+    )
+
+    validate_group.add_argument(
+        "--prune-cache",
+        type=float,
+        default=None,
+        metavar="DAYS",
+        help="Remove results that were not used in the last DAYS days from the "
+        "result cache before validating. Use 0 to clear the cache.",
+    )
+
+    validate_group.add_argument(
+        "--profile",
+        action="store_true",
+        help="Measure the wall time, CPU time, peak memory and number of assertions "
+        "of every rule and the load time of the IDSs. The profile is added to the "
+        "reports and saved as JSON next to them.",
+    )
+
+    validate_group.add_argument(
+        "--profile-rules",
+        type=str,
+        nargs="?",
+        const="*",
+        default=None,
+        metavar="PATTERN",
+        help="Profile the function calls of the rules of which the name matches the "
+        "glob PATTERN (all rules if omitted) with cProfile. A .pstats file per rule "
+        "and IDS occurrence and a merged.pstats file are saved in the report "
+        "directory.",
+    )
+
+    validate_group.add_argument(
+        "--time-window",
+        type=int,
+        default=0,
+        help="Read IDSs with more time slices in windows of this many time slices, "
+        "when all rules that apply to them are slice safe. 0 disables streaming.",
+    )
+
+    validate_group.add_argument(
+        "--batch-workers",
+        type=int,
+        default=1,
+        help="Number of URIs that are validated concurrently when multiple URIs are "
+        "provided. Reports are saved as soon as the validation of a URI is done.",
+    )
+
     explore_parser = subparsers.add_parser("explore", help="explore existing rulesets")
 
     explore_group = explore_parser.add_argument_group("Explore arguments")
@@ -183,6 +327,53 @@ def configure_argument_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def save_validation_reports(
+    result: IDSValidationResultCollection, report_dir: str, verbose: bool
+) -> None:
+    """Save XML, TXT and HTML reports for the validation of a single URI.
+
+    Args:
+        result: Validation results of the URI
+        report_dir: Directory in which the reports are saved
+        verbose: Whether or not to display the txt report
+    """
+    report_generator = ValidationReportGenerator(result)
+    report_filename = f"{report_dir}/{result.imas_uri.replace('/', '|')}"
+
+    os.makedirs(os.path.dirname(report_filename), exist_ok=True)
+    report_generator.save_xml(f"{report_filename}.xml")
+    report_generator.save_txt(f"{report_filename}.txt")
+    if result.rule_profiles:
+        save_rule_profiles(result.rule_profiles, f"{report_filename}.profile.json")
+    if result.rule_call_stats:
+        save_rule_call_stats(result.rule_call_stats, f"{report_filename}.pstats")
+
+    # generate detailed html report
+    junit_report_parser = Junit(f"{report_filename}.xml")
+    html = junit_report_parser.html(show_toc=True)
+    with open(f"{report_filename}.html", "wb") as outfile:
+        outfile.write(html.encode("utf-8"))
+
+    # print output
+    validation_passed = all_successful(result.results)
+    color_red = "[red]"
+    color_green = "[green]"
+    color_end = "[/]"
+    PASSED_FAILED_KEYWORD: str = (
+        f"{color_green}PASSED{color_end}"
+        if validation_passed
+        else f"{color_red}FAILED{color_end}"
+    )
+
+    cli_logger.info(f"URI {result.imas_uri} has {PASSED_FAILED_KEYWORD} validation.")
+
+    # display txt report if set to verbose output
+    if verbose:
+        cli_logger.info("See detailed report below:")
+        cli_logger.info(f"{color_red}{'-'*50}\n{report_generator.txt}")  # noqa: E226
+        cli_logger.info(f"{color_red}{'-'*50}")  # noqa: E226
+
+
 def main(argv: List) -> None:
 
     parser = configure_argument_parser()
@@ -197,60 +388,47 @@ def main(argv: List) -> None:
         # command specific actions
         if isinstance(command_objects[0], ValidateCommand):
             reports_path = args.output or "./validate_reports"
-
-        for command in command_objects:
-            command.execute()
-
-        # 'common' means it contains results for all executed commands
-        common_result_list: List[IDSValidationResultCollection] = []
-
-        for command in command_objects:
-            if isinstance(command, ValidateCommand) and command.result is not None:
-
-                common_result_list.append(command.result)
-
-                # save result for this URI
-                report_generator = ValidationReportGenerator(command.result)
-                report_filename = (
-                    f"{reports_path}/{today}/"
-                    f"{command.result.imas_uri.replace('/', '|')}"
-                )
-
-                os.makedirs(os.path.dirname(report_filename), exist_ok=True)
-                report_generator.save_xml(f"{report_filename}.xml")
-                report_generator.save_txt(f"{report_filename}.txt")
-
-                # generate detailed html report
-                junit_report_parser = Junit(f"{report_filename}.xml")
-                html = junit_report_parser.html(show_toc=True)
-                with open(f"{report_filename}.html", "wb") as outfile:
-                    outfile.write(html.encode("utf-8"))
-
-                # print output
-                validation_passed = all(
-                    [result.success for result in command.result.results]
-                )
-                color_red = "[red]"
-                color_green = "[green]"
-                color_end = "[/]"
-                PASSED_FAILED_KEYWORD: str = (
-                    f"{color_green}PASSED{color_end}"
-                    if validation_passed
-                    else f"{color_red}FAILED{color_end}"
+            report_dir = f"{reports_path}/{today}"
+            if args.prune_cache is not None:
+                if args.cache_dir is None:
+                    parser.error("--prune-cache requires --cache-dir")
+                ResultCache(Path(args.cache_dir)).prune(args.prune_cache * 86400)
+
+        validate_commands = [
+            command
+            for command in command_objects
+            if isinstance(command, ValidateCommand)
+        ]
+        if validate_commands and args.batch_workers > 1 and len(validate_commands) > 1:
+            # validate URIs concurrently, reports are saved as soon as a URI is done
+            batch_results = validate_uris(
+                [command.uri for command in validate_commands],
+                validate_commands[0].validate_options,
+                args.batch_workers,
+            )
+            for index, result in batch_results:
+                validate_commands[index].set_result(result)
+                save_validation_reports(result, report_dir, args.verbose)
+        else:
+            if validate_commands:
+                # load the rules once for all URIs
+                validator = Validator(
+                    validate_options=validate_commands[0].validate_options
                 )
-
-                cli_logger.info(
-                    f"URI {command.result.imas_uri} has"
-                    f" {PASSED_FAILED_KEYWORD} validation."
-                )
-
-                # display txt report if set to verbose output
-                if args.verbose:
-                    cli_logger.info("See detailed report below:")
-                    cli_logger.info(
-                        f"{color_red}{'-'*50}\n{report_generator.txt}"  # noqa: E226
-                    )
-                    cli_logger.info(f"{color_red}{'-'*50}")  # noqa: E226
+                for validate_command in validate_commands:
+                    validate_command.validator = validator
+            for command in command_objects:
+                command.execute()
+                if isinstance(command, ValidateCommand) and command.result is not None:
+                    save_validation_reports(command.result, report_dir, args.verbose)
+
+        # 'common' means it contains results for all executed commands, in the same
+        # order as the URIs were provided
+        common_result_list: List[IDSValidationResultCollection] = [
+            command.result
+            for command in validate_commands
+            if command.result is not None
+        ]
 
         if not common_result_list:
             return
@@ -266,7 +444,7 @@ def main(argv: List) -> None:
             failed_test_uris = [
                 result_collection.imas_uri
                 for result_collection in common_result_list
-                if not all([result.success for result in result_collection.results])
+                if not all_successful(result_collection.results)
             ]
             if failed_test_uris:
                 sys.stdout.write(" ".join(failed_test_uris) + "\n")
@@ -3,6 +3,7 @@ import os
 from typing import List
 
 from imas_validator.validate.result import IDSValidationResultCollection
+from imas_validator.validate.result_store import all_successful
 
 
 class SummaryReportGenerator:
@@ -35,7 +36,7 @@ class SummaryReportGenerator:
         failed_tests_list = []
         passed_tests_list = []
         for result_collection in self._validation_results:
-            if not all([result.success for result in result_collection.results]):
+            if not all_successful(result_collection.results):
                 failed_tests_list.append(result_collection)
                 num_failed_tests += 1
             else:
@@ -131,9 +132,7 @@ class SummaryReportGenerator:
             <a href="./test_report.txt">TXT report</a></li>
 
         """
-        validation_successful: bool = all(
-            [result.success for result in validation_results.results]
-        )
+        validation_successful: bool = all_successful(validation_results.results)
         PASSED_FAILED_KEYWORD: str = "PASSED" if validation_successful else "FAILED"
 
         # process filename not to contain slashes, colon or question marks.
@@ -1,10 +1,15 @@
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+import numpy
 
 from imas_validator.validate.result import (
+    ElementFailures,
     IDSValidationResult,
     IDSValidationResultCollection,
+    RuleProfile,
 )
+from imas_validator.validate.result_store import ColumnarResultStore, ResultRow
 
 
 @dataclass
@@ -19,6 +24,10 @@ class CustomRuleObject:
     traceback: str
     passed_nodes: List[str]
     failed_nodes: List[str]
+    cached: bool = False
+    """Whether all results of the rule were reused from the result cache"""
+    failed_elements: List[str] = field(default_factory=list)
+    """Descriptions of the failed elements of the failed array-valued assertions"""
 
 
 @dataclass
@@ -30,7 +39,7 @@ class CustomResultCollection:
 
     ids: str
     occurrence: int
-    result_list: List[IDSValidationResult]
+    result_list: Sequence[Union[IDSValidationResult, ResultRow]]
     rules: List[CustomRuleObject]
 
 
@@ -55,32 +64,23 @@ def convert_result_into_custom_collection(
     # 2. Extract rules that failed from List[IDSValidationResult]
     # and also put them in CustomResultCollection
 
-    result_collection: List[CustomResultCollection] = []
+    results = validation_result.results
+    if isinstance(results, ColumnarResultStore):
+        return _convert_columnar_results(results)
 
     # Step 1:
-    for single_validation_result in validation_result.results:
+    result_lists: Dict[Tuple[str, int], List[IDSValidationResult]] = {}
+    for single_validation_result in results:
         for ids, occurrence in single_validation_result.idss:
-            if (ids, occurrence) not in [
-                (x.ids, x.occurrence) for x in result_collection
-            ]:
-                # If object representing (ids, occurrence) doesn't exists
-                result_collection.append(
-                    CustomResultCollection(
-                        ids=ids,
-                        occurrence=occurrence,
-                        result_list=[single_validation_result],
-                        rules=[],
-                    )
-                )
-            else:
-                # If it already exists, find element and
-                # append IDSValidationResult into it's result list
-                target_element = next(
-                    x
-                    for x in result_collection
-                    if x.ids == ids and x.occurrence == occurrence
-                )
-                target_element.result_list.append(single_validation_result)
+            result_lists.setdefault((ids, occurrence), []).append(
+                single_validation_result
+            )
+    result_collection = [
+        CustomResultCollection(
+            ids=ids, occurrence=occurrence, result_list=result_list, rules=[]
+        )
+        for (ids, occurrence), result_list in result_lists.items()
+    ]
 
     # Step 2:
     # For every ids:occurrence
@@ -108,12 +108,14 @@ def convert_result_into_custom_collection(
                     .replace(">", ""),
                     passed_nodes=[],
                     failed_nodes=[],
+                    cached=result_object.cached,
                 )
                 if result_object.success:
                     new_custom_rule_object.passed_nodes += affected_nodes
                 else:
                     new_custom_rule_object.failed_nodes += affected_nodes
                 custom_result_collection.rules.append(new_custom_rule_object)
+                target_custom_rule_object = new_custom_rule_object
 
             else:
                 # If CustomRuleObject already exists, just append list of affected nodes
@@ -123,6 +125,7 @@ def convert_result_into_custom_collection(
                     if rule_object.rule_name == result_object.rule.name
                     and rule_object.message == result_object.msg
                 )
+                target_custom_rule_object.cached &= result_object.cached
                 if result_object.success:
                     target_custom_rule_object.passed_nodes += affected_nodes
                 else:
@@ -131,6 +134,19 @@ def convert_result_into_custom_collection(
                     else:  # if rule failed, but no node is affected, add empty string
                         target_custom_rule_object.failed_nodes.append("")
 
+            if result_object.element_failures is not None:
+                target_custom_rule_object.failed_elements.append(
+                    format_element_failures(
+                        affected_nodes, result_object.element_failures
+                    )
+                )
+
+    return _sort_result_collection(result_collection)
+
+
+def _sort_result_collection(
+    result_collection: List[CustomResultCollection],
+) -> List[CustomResultCollection]:
     # sort result collection alphabetically
     result_collection = sorted(result_collection, key=lambda x: (x.ids, x.occurrence))
 
@@ -143,5 +159,235 @@ def convert_result_into_custom_collection(
         for rule_object in custom_result_collection.rules:
             rule_object.passed_nodes.sort()
             rule_object.failed_nodes.sort()
+            rule_object.failed_elements.sort()
 
     return result_collection
+
+
+def _convert_columnar_results(
+    store: ColumnarResultStore,
+) -> List[CustomResultCollection]:
+    """
+    Converts a ColumnarResultStore into List[CustomResultCollection]. The results
+    are grouped with NumPy instead of one by one, the output is the same as for a
+    list of the same results.
+
+    Args:
+        store: ColumnarResultStore - validation results
+
+    Returns:
+        List[CustomResultCollection]
+    """
+    if not len(store):
+        return []
+    success = store.success()
+    rule_ids = store.rule_ids()
+    idss_ids = store.idss_ids()
+    message_ids = store.message_ids()
+    location_ids = store.location_ids()
+    offsets = store.node_offsets()
+    node_ids = store.node_ids()
+    overrides = store.nodes_overrides
+
+    # Number the (ids, occurrence) pairs of all results and nodes
+    pair_indices: Dict[Tuple[str, int], int] = {}
+    for idss in store.idss_table:
+        for pair in idss:
+            pair_indices.setdefault(pair, len(pair_indices))
+    node_pairs = numpy.array(
+        [
+            pair_indices.setdefault((ids, occ), len(pair_indices))
+            for ids, occ, _ in store.node_table
+        ],
+        dtype=numpy.intp,
+    )
+    node_paths = numpy.array([path for _, _, path in store.node_table], dtype=object)
+
+    # Group the results by IDSs, rule name and message
+    keys = numpy.stack([idss_ids, store.rule_name_ids(), message_ids], axis=1)
+    _, first_rows, group_ids = numpy.unique(
+        keys, axis=0, return_index=True, return_inverse=True
+    )
+    group_ids = group_ids.reshape(-1)
+    failures = numpy.bincount(group_ids[~success], minlength=len(first_rows))
+    cached_groups = (
+        numpy.bincount(group_ids[~store.cached()], minlength=len(first_rows)) == 0
+    )
+
+    # Node paths per group, (ids, occurrence) pair and success
+    node_rows = numpy.repeat(numpy.arange(len(store)), numpy.diff(offsets))
+    entry_pairs = node_pairs[node_ids]
+    entry_keys = numpy.stack(
+        [group_ids[node_rows], entry_pairs, success[node_rows]], axis=1
+    )
+    paths: Dict[Tuple[int, int, int], List[str]] = {}
+    # Number of failed results per group and pair that have nodes of that pair
+    failures_with_nodes: Dict[Tuple[int, int], int] = {}
+    if len(entry_keys):
+        order = numpy.lexsort(entry_keys.T[::-1])
+        unique_keys, starts = numpy.unique(entry_keys[order], axis=0, return_index=True)
+        sorted_paths = node_paths[node_ids[order]]
+        stops = numpy.append(starts[1:], len(order))
+        for key, start, stop in zip(unique_keys.tolist(), starts, stops):
+            paths[tuple(key)] = sorted_paths[start:stop].tolist()
+        failed = ~success[node_rows]
+        failed_row_pairs = numpy.unique(
+            numpy.stack([node_rows[failed], entry_pairs[failed]], axis=1), axis=0
+        )
+        group_pairs, counts = numpy.unique(
+            numpy.stack(
+                [group_ids[failed_row_pairs[:, 0]], failed_row_pairs[:, 1]], axis=1
+            ),
+            axis=0,
+            return_counts=True,
+        )
+        for (group, pair_index), count in zip(group_pairs.tolist(), counts.tolist()):
+            failures_with_nodes[(group, pair_index)] = count
+
+    # Results whose nodes are not stored in the node columns
+    for row, nodes_dict in overrides.items():
+        group = int(group_ids[row])
+        for pair in store.idss_table[idss_ids[row]]:
+            nodes = nodes_dict.get(pair)
+            if not nodes:
+                continue
+            key = (group, pair_indices[pair], int(success[row]))
+            paths.setdefault(key, []).extend(nodes)
+            if not success[row]:
+                group_pair = (group, pair_indices[pair])
+                failures_with_nodes[group_pair] = (
+                    failures_with_nodes.get(group_pair, 0) + 1
+                )
+
+    def has_nodes(row: int, pair: Tuple[str, int]) -> bool:
+        if row in overrides:
+            return bool(overrides[row].get(pair))
+        row_pairs = node_pairs[node_ids[offsets[row] : offsets[row + 1]]]
+        return bool((row_pairs == pair_indices[pair]).any())
+
+    # Combine the groups per (ids, occurrence), rule name and message. Results that
+    # fail without affected nodes are listed as an empty string, except when it is
+    # the first result of the rule
+    rule_objects: Dict[Tuple[Tuple[str, int], str, str], CustomRuleObject] = {}
+    first_results: Dict[Tuple[Tuple[str, int], str, str], Tuple[int, bool]] = {}
+    empty_failures: Dict[Tuple[Tuple[str, int], str, str], int] = {}
+    for group, first_row in enumerate(first_rows.tolist()):
+        rule_name = store.rules[rule_ids[first_row]].name
+        message = store.messages[message_ids[first_row]]
+        for pair in store.idss_table[idss_ids[first_row]]:
+            pair_index = pair_indices[pair]
+            key = (pair, rule_name, message)
+            first_is_empty_failure = not success[first_row] and not has_nodes(
+                first_row, pair
+            )
+            rule_object = rule_objects.get(key)
+            if rule_object is None:
+                rule_object = CustomRuleObject(
+                    rule_name=rule_name,
+                    message=message,
+                    traceback="",
+                    passed_nodes=[],
+                    failed_nodes=[],
+                    cached=True,
+                )
+                rule_objects[key] = rule_object
+                empty_failures[key] = 0
+            if key not in first_results or first_row < first_results[key][0]:
+                tb = store.locations[location_ids[first_row]]
+                rule_object.traceback = str(tb[-1]).replace("<", "").replace(">", "")
+                first_results[key] = (first_row, first_is_empty_failure)
+            rule_object.cached &= bool(cached_groups[group])
+            rule_object.passed_nodes += paths.get((group, pair_index, 1), [])
+            rule_object.failed_nodes += paths.get((group, pair_index, 0), [])
+            empty_failures[key] += int(failures[group]) - failures_with_nodes.get(
+                (group, pair_index), 0
+            )
+
+    # Failed elements of array-valued assertions
+    for row, element_failures in store.element_failures.items():
+        rule_name = store.rules[rule_ids[row]].name
+        message = store.messages[message_ids[row]]
+        nodes_dict = store.row(row).nodes_dict
+        for pair in store.idss_table[idss_ids[row]]:
+            rule_objects[(pair, rule_name, message)].failed_elements.append(
+                format_element_failures(nodes_dict.get(pair, ()), element_failures)
+            )
+
+    result_collection: Dict[Tuple[str, int], CustomResultCollection] = {}
+    for key in sorted(rule_objects, key=lambda key: first_results[key][0]):
+        pair = key[0]
+        rule_object = rule_objects[key]
+        num_empty = empty_failures[key] - first_results[key][1]
+        rule_object.failed_nodes += [""] * num_empty
+        if pair not in result_collection:
+            pair_idss_ids = [
+                i for i, idss in enumerate(store.idss_table) if pair in idss
+            ]
+            result_collection[pair] = CustomResultCollection(
+                ids=pair[0],
+                occurrence=pair[1],
+                result_list=store.select(numpy.isin(idss_ids, pair_idss_ids)),
+                rules=[],
+            )
+        result_collection[pair].rules.append(rule_object)
+
+    return _sort_result_collection(list(result_collection.values()))
+
+
+def format_element_failures(
+    nodes: Iterable[str], element_failures: ElementFailures
+) -> str:
+    """
+    Describes the failed elements of an array-valued assertion in a single line
+
+    Args:
+        nodes: Iterable[str] - paths of the nodes of the assertion
+        element_failures: ElementFailures - failed elements of the assertion
+
+    Returns:
+        str
+    """
+    size = int(numpy.prod(element_failures.shape))
+    indices = ", ".join(
+        str(index[0]) if len(index) == 1 else str(tuple(index))
+        for index in element_failures.indices
+    )
+    description = f"{element_failures.count} of {size} elements failed at {indices}"
+    num_more = element_failures.count - len(element_failures.indices)
+    if num_more > 0:
+        description += f" and {num_more} more"
+    paths = " ".join(sorted(nodes))
+    return f"{paths}: {description}" if paths else description
+
+
+def format_rule_profile(profile: RuleProfile) -> str:
+    """
+    Describes the resources used by a rule on its IDS occurrences in a single line
+
+    Args:
+        profile: RuleProfile - resources used by the rule
+
+    Returns:
+        str
+    """
+    idss = ", ".join(f"{ids}:{occurrence}" for ids, occurrence in profile.idss)
+    return (
+        f"{profile.rule_name} on {idss}: wall time = {profile.wall_time:.3f} s,"
+        f" CPU time = {profile.cpu_time:.3f} s,"
+        f" peak memory = {profile.peak_memory / 1024:.1f} KiB,"
+        f" assertions = {profile.num_assertions},"
+        f" IDS load time = {profile.load_time:.3f} s"
+    )
+
+
+def sort_rule_profiles(rule_profiles: List[RuleProfile]) -> List[RuleProfile]:
+    """
+    Sorts rule profiles by wall time, slowest rules first
+
+    Args:
+        rule_profiles: List[RuleProfile] - resources used per rule
+
+    Returns:
+        List[RuleProfile]
+    """
+    return sorted(rule_profiles, key=lambda profile: -profile.wall_time)
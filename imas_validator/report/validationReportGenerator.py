@@ -3,14 +3,22 @@ import operator
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Tuple
 from xml.dom import minidom
 
 from imas_validator.report.utils import (
     CustomResultCollection,
     convert_result_into_custom_collection,
+    format_rule_profile,
+    sort_rule_profiles,
 )
 from imas_validator.validate.result import IDSValidationResultCollection
+from imas_validator.validate.result_store import (
+    all_successful,
+    count_assertions,
+    count_cached,
+    count_failures,
+)
 
 
 class ValidationReportGenerator:
@@ -64,8 +72,8 @@ class ValidationReportGenerator:
             convert_result_into_custom_collection(validation_result)
         )
 
-        cpt_test = len(validation_result.results)
-        cpt_failure = sum(not item.success for item in validation_result.results)
+        cpt_test = count_assertions(validation_result.results)
+        cpt_failure = count_failures(validation_result.results)
 
         # Create minidom Document in JUnit xml format
         xml = minidom.Document()
@@ -80,6 +88,14 @@ class ValidationReportGenerator:
         # Remember to add tag to document after initializing it
         xml.appendChild(testsuites)
 
+        # Wall time per (ids, occurrence) and rule name, when rules were profiled
+        rule_profiles = sort_rule_profiles(validation_result.rule_profiles)
+        rule_times: Dict[Tuple[str, int, str], float] = {}
+        for profile in rule_profiles:
+            for ids, occurrence in profile.idss:
+                key = (ids, occurrence, profile.rule_name)
+                rule_times[key] = rule_times.get(key, 0.0) + profile.wall_time
+
         test_suite_counter = 1
         for custom_result_collection in sorted(
             custom_result_collection_list, key=operator.attrgetter("ids", "occurrence")
@@ -96,6 +112,10 @@ class ValidationReportGenerator:
                 f"{custom_result_collection.ids}:{custom_result_collection.occurrence}",
             )
 
+            ids_key = (
+                custom_result_collection.ids,
+                custom_result_collection.occurrence,
+            )
             test_case_counter = 1
             for custom_rule_object in custom_result_collection.rules:
                 testcase = xml.createElement("testcase")
@@ -104,6 +124,20 @@ class ValidationReportGenerator:
                 )
                 testcase.setAttribute("name", f"{custom_rule_object.rule_name}")
                 testcase.setAttribute("classname", testsuite.getAttribute("name"))
+                if rule_profiles:
+                    rule_time = rule_times.get(
+                        (*ids_key, custom_rule_object.rule_name), 0.0
+                    )
+                    testcase.setAttribute("time", f"{rule_time:.6f}")
+
+                # mark results that were reused from the result cache
+                if custom_rule_object.cached:
+                    properties = xml.createElement("properties")
+                    cached_property = xml.createElement("property")
+                    cached_property.setAttribute("name", "cached")
+                    cached_property.setAttribute("value", "true")
+                    properties.appendChild(cached_property)
+                    testcase.appendChild(properties)
 
                 # if rule failed
                 if len(custom_rule_object.failed_nodes) > 0:
@@ -134,6 +168,14 @@ class ValidationReportGenerator:
                         custom_traceback_message += " ".join(
                             custom_rule_object.failed_nodes
                         )
+                    failed_elements = custom_rule_object.failed_elements
+                    if failed_elements:
+                        custom_traceback_message += "\n\nFailed elements:\n"
+                        custom_traceback_message += "\n".join(failed_elements[:10])
+                        if len(failed_elements) > 10:
+                            custom_traceback_message += (
+                                f"\nand {len(failed_elements) - 10} more..."
+                            )
 
                     failure.appendChild(xml.createTextNode(custom_traceback_message))
                     testcase.appendChild(failure)
@@ -141,6 +183,26 @@ class ValidationReportGenerator:
                 testsuite.appendChild(testcase)
                 test_case_counter += 1
 
+            # list the resources used by the rules on this (ids, occurrence)
+            ids_profiles = [
+                profile for profile in rule_profiles if ids_key in profile.idss
+            ]
+            if ids_profiles:
+                testsuite.setAttribute(
+                    "time",
+                    f"{sum(profile.wall_time for profile in ids_profiles):.6f}",
+                )
+                system_out = xml.createElement("system-out")
+                system_out.appendChild(
+                    xml.createTextNode(
+                        "Rule profile (slowest first):\n"
+                        + "\n".join(
+                            format_rule_profile(profile) for profile in ids_profiles
+                        )
+                    )
+                )
+                testsuite.appendChild(system_out)
+
             testsuites.appendChild(testsuite)
             test_suite_counter += 1
 
@@ -159,10 +221,11 @@ class ValidationReportGenerator:
         Returns:
             None
         """
-        # This function is split into 3 parts:
+        # This function is split into 4 parts:
         # - generate txt report header
         # - generate report body (list od ids-occurrence and result)
         # - generate coverage map
+        # - generate rule profile, when rules were profiled
 
         # --- init variables ---
         self._junit_txt = ""
@@ -176,8 +239,8 @@ class ValidationReportGenerator:
         )
 
         # --------- generate report header ---------
-        cpt_test = len(validation_result.results)
-        cpt_failure = sum(not item.success for item in validation_result.results)
+        cpt_test = count_assertions(validation_result.results)
+        cpt_failure = count_failures(validation_result.results)
         cpt_succesful = cpt_test - cpt_failure
 
         txt_report_header += (
@@ -185,14 +248,18 @@ class ValidationReportGenerator:
             f"Tested URI : {validation_result.imas_uri}\n"
             f"Number of tests carried out : {cpt_test}\n"
             f"Number of successful tests : {cpt_succesful}\n"
-            f"Number of failed tests : {cpt_failure}\n\n"
+            f"Number of failed tests : {cpt_failure}\n"
         )
+        cpt_cached = count_cached(validation_result.results)
+        if cpt_cached:
+            txt_report_header += f"Number of tests reused from cache : {cpt_cached}\n"
+        txt_report_header += "\n"
 
         # fill txt report body
         # PASSED tests
         txt_report_body += "PASSED IDSs:\n"
         for custom_result_object in custom_result_collection:
-            if all([result.success for result in custom_result_object.result_list]):
+            if all_successful(custom_result_object.result_list):
                 txt_report_body += (
                     f"+ IDS {custom_result_object.ids}"
                     f" occurrence {custom_result_object.occurrence}\n"
@@ -205,7 +272,7 @@ class ValidationReportGenerator:
         for custom_result_object in custom_result_collection:
 
             # This time we print only failed tests
-            if all([result.success for result in custom_result_object.result_list]):
+            if all_successful(custom_result_object.result_list):
                 continue
 
             txt_report_body += (
@@ -221,7 +288,10 @@ class ValidationReportGenerator:
                     node for node in custom_rule_object.failed_nodes if node
                 ]  # node can be empty string if rule does not affect any nodes
 
-                txt_report_body += f"\tRULE: {custom_rule_object.rule_name}\n"
+                cached_marker = " (cached)" if custom_rule_object.cached else ""
+                txt_report_body += (
+                    f"\tRULE: {custom_rule_object.rule_name}{cached_marker}\n"
+                )
                 txt_report_body += f"\t\tMESSAGE: {custom_rule_object.message}\n"
                 txt_report_body += (
                     f"\t\tTRACEBACK: " f"{custom_rule_object.traceback}\n"
@@ -230,8 +300,11 @@ class ValidationReportGenerator:
                     f"\t\tNODES COUNT: " f"{len(non_empty_failed_nodes)}\n"
                 )
                 txt_report_body += (
-                    f"\t\tNODES: " f"{custom_rule_object.failed_nodes}" f"\n\n"
+                    f"\t\tNODES: " f"{custom_rule_object.failed_nodes}" f"\n"
                 )
+                for failed_elements in custom_rule_object.failed_elements:
+                    txt_report_body += f"\t\tFAILED ELEMENTS: {failed_elements}\n"
+                txt_report_body += "\n"
 
         # --------- generate coverage map ---------
         if validation_result.coverage_dict.items():
@@ -242,9 +315,19 @@ class ValidationReportGenerator:
                     f" visited = {v.visited}, overlap = {v.overlap}\n"
                 )
 
+        # --------- generate rule profile ---------
+        txt_report_rule_profile = ""
+        if validation_result.rule_profiles:
+            txt_report_rule_profile += "\n\nRule profile (slowest first):\n"
+            for profile in sort_rule_profiles(validation_result.rule_profiles):
+                txt_report_rule_profile += f"\t{format_rule_profile(profile)}\n"
+
         # --------- put everything into single txt variable ---------
         self._junit_txt = (
-            f"{txt_report_header}" f"{txt_report_body}" f"{txt_report_coverage_map}"
+            f"{txt_report_header}"
+            f"{txt_report_body}"
+            f"{txt_report_coverage_map}"
+            f"{txt_report_rule_profile}"
         )
 
     def save_xml(self, file_name: str) -> None:
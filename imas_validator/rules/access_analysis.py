@@ -0,0 +1,429 @@
+"""
+This file describes the static analysis of validation rule functions, which determines
+the IDS paths that a rule may read
+"""
+
+import ast
+import inspect
+import logging
+import textwrap
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Functions that may be called with IDS nodes: they only use the value of the node
+SAFE_FUNCTIONS = {
+    "abs",
+    "all",
+    "any",
+    "bool",
+    "enumerate",
+    "float",
+    "int",
+    "isinstance",
+    "len",
+    "list",
+    "max",
+    "min",
+    "print",
+    "range",
+    "repr",
+    "reversed",
+    "round",
+    "set",
+    "sorted",
+    "str",
+    "sum",
+    "tuple",
+    "type",
+    "zip",
+    "Approx",
+    "Decreasing",
+    "Increasing",
+}
+# Modules whose functions only use the value of IDS nodes
+SAFE_MODULES = {"math", "np", "numpy"}
+# Attributes of IDS nodes that give access to other parts of the IDS
+NAVIGATING_ATTRIBUTES = {"coordinates", "_parent", "_toplevel", "_dd_parent"}
+# Maximum number of passes over a rule function to find all bindings of IDS nodes
+MAX_PASSES = 10
+
+# IDS node value of an expression: index of the rule argument and path in the IDS.
+# The path is None for nodes that are selected with a Select query.
+NodeRef = Tuple[int, Optional[str]]
+
+
+@dataclass
+class ArgumentAccess:
+    """IDS paths that a rule may read from one of its IDS arguments"""
+
+    subtrees: Set[str] = field(default_factory=set)
+    """Paths of which all data may be read, including all descendants"""
+    navigations: Set[str] = field(default_factory=set)
+    """Paths that are only navigated through, e.g. arrays of structures that are
+    iterated over"""
+    queries: Set[Tuple[str, str]] = field(default_factory=set)
+    """Path and regular expression of Select calls, all matching paths may be read"""
+
+    def update(self, other: "ArgumentAccess") -> None:
+        """Add the paths of another ArgumentAccess to this one"""
+        self.subtrees |= other.subtrees
+        self.navigations |= other.navigations
+        self.queries |= other.queries
+
+
+def analyze_rule(func: Callable, n_args: int) -> List[Optional[ArgumentAccess]]:
+    """Determine which IDS paths a rule function may read from its arguments.
+
+    Args:
+        func: Validation rule function
+        n_args: Number of IDS arguments of the rule
+
+    Returns:
+        For each IDS argument the paths that may be read, or None when the accesses
+        of the rule cannot be determined statically.
+    """
+    try:
+        return _analyze_rule(func, n_args)
+    except Exception as exc:
+        logger.debug(f"Could not analyze rule {func.__name__}: {exc}")
+        return [None] * n_args
+
+
+@lru_cache(maxsize=None)
+def _analyze_rule(func: Callable, n_args: int) -> List[Optional[ArgumentAccess]]:
+    source = textwrap.dedent(inspect.getsource(func))
+    tree = ast.parse(source)
+    func_def = next(
+        node
+        for node in ast.walk(tree)
+        if isinstance(node, ast.FunctionDef) and node.name == func.__name__
+    )
+    args = func_def.args
+    params = [arg.arg for arg in args.posonlyargs + args.args]
+    if args.vararg is not None or len(params) < n_args:
+        return [None] * n_args
+    analyzer = RuleAnalyzer(params[:n_args])
+    analyzer.analyze(func_def.body)
+    return [
+        None if i in analyzer.unresolved else analyzer.accesses[i]
+        for i in range(n_args)
+    ]
+
+
+def join_path(path: str, name: str) -> str:
+    """Append a child name to an IDS path"""
+    return f"{path}/{name}" if path else name
+
+
+class RuleAnalyzer:
+    """Flow-insensitive analysis of the IDS accesses in the body of a rule function.
+
+    Every name that is ever bound to an IDS node is tracked with all nodes it may
+    refer to. The analysis is repeated until no new bindings are found, so bindings
+    made later in a loop are taken into account.
+    """
+
+    def __init__(self, params: List[str]) -> None:
+        """Initialize RuleAnalyzer
+
+        Args:
+            params: Names of the rule function parameters for the IDS arguments
+        """
+        self.env: Dict[str, Set[NodeRef]] = {
+            param: {(i, "")} for i, param in enumerate(params)
+        }
+        self.accesses = [ArgumentAccess() for _ in params]
+        self.unresolved: Set[int] = set()
+
+    def analyze(self, body: List[ast.stmt]) -> None:
+        """Analyze the statements of a rule function body"""
+        for _ in range(MAX_PASSES):
+            env = {name: refs.copy() for name, refs in self.env.items()}
+            self.visit_body(body)
+            if env == self.env:
+                return
+        self.unresolve_all()
+
+    def unresolve(self, refs: Set[NodeRef]) -> None:
+        """Mark the arguments of the given nodes as not statically resolvable"""
+        self.unresolved.update(i for i, _ in refs)
+
+    def unresolve_all(self) -> None:
+        """Mark all arguments as not statically resolvable"""
+        self.unresolved.update(range(len(self.accesses)))
+
+    def bind(self, target: ast.expr, refs: Set[NodeRef]) -> None:
+        """Bind the target of an assignment or loop to the given nodes"""
+        if isinstance(target, ast.Name):
+            if refs:
+                self.env.setdefault(target.id, set()).update(refs)
+        elif isinstance(target, (ast.Tuple, ast.List)):
+            if refs:
+                # Unpacking IDS nodes is not tracked
+                self.unresolve(refs)
+            for element in target.elts:
+                self.bind(element, set())
+        elif isinstance(target, ast.Starred):
+            self.bind(target.value, refs)
+        else:
+            # Attribute or subscript targets: the node escapes into another object
+            self.use(target)
+            self.use_refs(refs)
+
+    def use_refs(self, refs: Set[NodeRef]) -> None:
+        """Record that all data of the given nodes may be read"""
+        for i, path in refs:
+            if path is not None:
+                self.accesses[i].subtrees.add(path)
+
+    # Statements
+
+    def visit_body(self, body: List[ast.stmt]) -> None:
+        for stmt in body:
+            self.visit_stmt(stmt)
+
+    def visit_stmt(self, stmt: ast.stmt) -> None:
+        if isinstance(stmt, ast.Assign):
+            refs = self.node(stmt.value)
+            if not refs:
+                self.use(stmt.value)
+            for target in stmt.targets:
+                self.bind(target, refs)
+        elif isinstance(stmt, (ast.AugAssign, ast.AnnAssign)):
+            if stmt.value is not None:
+                self.use(stmt.value)
+            self.bind(stmt.target, set())
+        elif isinstance(stmt, (ast.For, ast.AsyncFor)):
+            self.visit_loop(stmt.target, stmt.iter)
+            self.visit_body(stmt.body)
+            self.visit_body(stmt.orelse)
+        elif isinstance(stmt, (ast.While, ast.If)):
+            self.use(stmt.test)
+            self.visit_body(stmt.body)
+            self.visit_body(stmt.orelse)
+        elif isinstance(stmt, (ast.With, ast.AsyncWith)):
+            for item in stmt.items:
+                self.use(item.context_expr)
+                if item.optional_vars is not None:
+                    self.bind(item.optional_vars, set())
+            self.visit_body(stmt.body)
+        elif isinstance(stmt, ast.Try):
+            self.visit_body(stmt.body)
+            for handler in stmt.handlers:
+                if handler.type is not None:
+                    self.use(handler.type)
+                self.visit_body(handler.body)
+            self.visit_body(stmt.orelse)
+            self.visit_body(stmt.finalbody)
+        elif isinstance(stmt, ast.Assert):
+            self.use(stmt.test)
+            if stmt.msg is not None:
+                self.use(stmt.msg)
+        elif isinstance(stmt, (ast.Expr, ast.Return)):
+            if stmt.value is not None:
+                self.use(stmt.value)
+        elif isinstance(stmt, ast.Raise):
+            for expr in (stmt.exc, stmt.cause):
+                if expr is not None:
+                    self.use(expr)
+        elif isinstance(
+            stmt,
+            (
+                ast.Pass,
+                ast.Break,
+                ast.Continue,
+                ast.Import,
+                ast.ImportFrom,
+                ast.Global,
+                ast.Nonlocal,
+                ast.Delete,
+            ),
+        ):
+            pass
+        else:
+            # Nested functions, classes, match statements, ...
+            self.unresolve_all()
+
+    def visit_loop(self, target: ast.expr, iterable: ast.expr) -> None:
+        """Bind the target of a loop over an iterable"""
+        refs = self.node(iterable)
+        if refs:
+            self.navigate(refs)
+            self.bind(target, refs)
+            return
+        if isinstance(iterable, ast.Call) and isinstance(iterable.func, ast.Name):
+            name = iterable.func.id
+            targets = target.elts if isinstance(target, ast.Tuple) else None
+            if name == "enumerate" and len(iterable.args) == 1 and targets:
+                refs = self.node(iterable.args[0])
+                if refs and len(targets) == 2:
+                    self.navigate(refs)
+                    self.bind(targets[0], set())
+                    self.bind(targets[1], refs)
+                    return
+            if name == "zip" and targets and len(targets) == len(iterable.args):
+                all_refs = [self.node(arg) for arg in iterable.args]
+                if any(all_refs) and not iterable.keywords:
+                    for element, arg, element_refs in zip(
+                        targets, iterable.args, all_refs
+                    ):
+                        if element_refs:
+                            self.navigate(element_refs)
+                        else:
+                            self.use(arg)
+                        self.bind(element, element_refs)
+                    return
+        self.use(iterable)
+        self.bind(target, set())
+
+    def navigate(self, refs: Set[NodeRef]) -> None:
+        """Record that the given nodes are navigated through"""
+        for i, path in refs:
+            if path is not None:
+                self.accesses[i].navigations.add(path)
+
+    # Expressions
+
+    def node(self, expr: ast.expr) -> Set[NodeRef]:
+        """Return the IDS nodes that an expression may evaluate to, without recording
+        that their data is read.
+        """
+        if isinstance(expr, ast.Name):
+            return self.env.get(expr.id, set())
+        if isinstance(expr, ast.Attribute):
+            return self.attribute(self.node(expr.value), expr.attr)
+        if isinstance(expr, ast.Subscript):
+            refs = self.node(expr.value)
+            if refs:
+                self.use(expr.slice)
+            return refs
+        if isinstance(expr, ast.Call) and isinstance(expr.func, ast.Name):
+            name = expr.func.id
+            if name == "getattr" and len(expr.args) >= 2:
+                attr = expr.args[1]
+                refs = self.node(expr.args[0])
+                if refs and isinstance(attr, ast.Constant):
+                    for default in expr.args[2:]:
+                        self.use(default)
+                    return self.attribute(refs, str(attr.value))
+            elif name == "Select" and expr.args:
+                return self.select(expr)
+        if isinstance(expr, ast.NamedExpr):
+            refs = self.node(expr.value)
+            self.bind(expr.target, refs)
+            return refs
+        return set()
+
+    def attribute(self, refs: Set[NodeRef], attr: str) -> Set[NodeRef]:
+        """Return the nodes after getting an attribute of the given nodes"""
+        if attr in NAVIGATING_ATTRIBUTES and refs:
+            self.unresolve(refs)
+            return set()
+        return {
+            (i, None if path is None else join_path(path, attr)) for i, path in refs
+        }
+
+    def select(self, call: ast.Call) -> Set[NodeRef]:
+        """Record the query of a Select call and return the selected nodes"""
+        refs = self.node(call.args[0])
+        query = call.args[1] if len(call.args) > 1 else None
+        for keyword in call.keywords:
+            if keyword.arg == "query":
+                query = keyword.value
+            else:
+                self.use(keyword.value)
+        if not isinstance(query, ast.Constant) or not isinstance(query.value, str):
+            self.unresolve(refs)
+            return set()
+        for i, path in refs:
+            if path is None:
+                # Select on selected nodes: these are fully loaded already
+                continue
+            self.accesses[i].queries.add((path, query.value))
+        return {(i, None) for i, _ in refs}
+
+    def use(self, expr: ast.expr) -> None:
+        """Record the IDS data that may be read when evaluating an expression"""
+        refs = self.node(expr)
+        if refs:
+            self.use_refs(refs)
+            return
+        if isinstance(expr, ast.Attribute):
+            if expr.attr in NAVIGATING_ATTRIBUTES:
+                # Navigating from a node that is not tracked
+                self.unresolve_all()
+            self.use(expr.value)
+        elif isinstance(expr, ast.Call):
+            self.call(expr)
+        elif isinstance(expr, ast.Lambda):
+            self.unresolve_all()
+        elif isinstance(expr, ast.Compare) and all(
+            isinstance(op, (ast.Is, ast.IsNot)) for op in expr.ops
+        ):
+            # Identity checks do not read any IDS data
+            for operand in [expr.left, *expr.comparators]:
+                if not self.node(operand):
+                    self.use(operand)
+        elif isinstance(expr, (ast.ListComp, ast.SetComp, ast.GeneratorExp)):
+            self.comprehension(expr.generators, [expr.elt])
+        elif isinstance(expr, ast.DictComp):
+            self.comprehension(expr.generators, [expr.key, expr.value])
+        else:
+            for child in ast.iter_child_nodes(expr):
+                if isinstance(child, ast.expr):
+                    self.use(child)
+                elif isinstance(child, ast.keyword):
+                    self.use(child.value)
+
+    def comprehension(
+        self, generators: List[ast.comprehension], elements: List[ast.expr]
+    ) -> None:
+        for generator in generators:
+            self.visit_loop(generator.target, generator.iter)
+            for condition in generator.ifs:
+                self.use(condition)
+        for element in elements:
+            self.use(element)
+
+    def call(self, call: ast.Call) -> None:
+        """Record the IDS data that may be read by a function call"""
+        func = call.func
+        safe = False
+        if isinstance(func, ast.Name):
+            if func.id == "Parent":
+                # The parent of a node cannot be determined statically
+                self.unresolve_all()
+                return
+            safe = func.id in SAFE_FUNCTIONS or func.id == "hasattr"
+            if func.id == "hasattr":
+                # Checks the data dictionary only
+                return
+        elif isinstance(func, ast.Attribute):
+            base_refs = self.node(func.value)
+            if base_refs:
+                # Method of an IDS node, e.g. node.metadata.path.startswith()
+                self.use_refs(base_refs)
+                safe = True
+            elif isinstance(func.value, ast.Name) and func.value.id in SAFE_MODULES:
+                safe = True
+            else:
+                # Method of another object, e.g. list.append(node)
+                self.use(func.value)
+                safe = True
+        else:
+            self.use(func)
+        args = list(call.args) + [keyword.value for keyword in call.keywords]
+        for arg in args:
+            if isinstance(arg, ast.Starred):
+                arg = arg.value
+            refs = self.node(arg)
+            if refs and not safe:
+                # Unknown functions may navigate anywhere from the node
+                self.unresolve(refs)
+            elif refs:
+                self.use_refs(refs)
+            else:
+                self.use(arg)
@@ -3,14 +3,27 @@ This file describes the functions for ast rewriting
 """
 
 import ast
+import hashlib
+import importlib.util
+import logging
+import marshal
+import os
+import sys
 from pathlib import Path
 from types import CodeType
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
+import imas_validator
 from imas_validator.rules.data import ValidatorRegistry
 from imas_validator.rules.helpers import HELPER_DICT
 from imas_validator.validate.result_collector import ResultCollector
 
+logger = logging.getLogger(__name__)
+
+# Key that identifies the source and tooling a cached code object was compiled from:
+# (path, mtime_ns, size, content hash, imas_validator version)
+CacheKey = Tuple[str, int, int, str, str]
+
 
 def rewrite_assert(old_code: str, filename: str) -> CodeType:
     """
@@ -83,8 +96,7 @@ def run_path(
     Returns:
         globals() object of given file
     """
-    file_content = rule_path.read_text()
-    new_code = rewrite_assert(file_content, str(rule_path))
+    new_code = compile_rule_file(rule_path)
     glob = {
         "validator": val_registry.validator,
         "assert": result_collector.assert_,
@@ -92,3 +104,78 @@ def run_path(
     }
     exec(new_code, glob)
     return glob
+
+
+def compile_rule_file(rule_path: Path) -> CodeType:
+    """
+    Return the rewritten code of a rule file, using an on-disk cache in the
+    ``__pycache__`` directory next to the rule file when possible.
+
+    Args:
+        rule_path: Path to file that contains IMAS-Validator tests
+
+    Returns:
+        Rewritten block of code
+    """
+    source = rule_path.read_bytes()
+    stat = rule_path.stat()
+    key: CacheKey = (
+        str(rule_path),
+        stat.st_mtime_ns,
+        stat.st_size,
+        hashlib.sha256(source).hexdigest(),
+        imas_validator.__version__,
+    )
+    cache_path = _get_cache_path(rule_path)
+    code = _read_cache(cache_path, key)
+    if code is None:
+        code = rewrite_assert(source.decode("utf-8"), str(rule_path))
+        _write_cache(cache_path, key, code)
+    return code
+
+
+def _get_cache_path(rule_path: Path) -> Path:
+    """Return path of the cache file for the given rule file."""
+    cache_tag = sys.implementation.cache_tag
+    name = f"{rule_path.stem}.{cache_tag}-imas-validator.pyc"
+    return rule_path.parent / "__pycache__" / name
+
+
+def _read_cache(cache_path: Path, key: CacheKey) -> Optional[CodeType]:
+    """Load a cached code object, return None if it is missing or out of date."""
+    try:
+        data = cache_path.read_bytes()
+    except OSError:
+        return None
+    magic = importlib.util.MAGIC_NUMBER
+    if not data.startswith(magic):
+        return None
+    try:
+        cached_key, code = marshal.loads(data[len(magic) :])
+    except (EOFError, ValueError, TypeError):
+        logger.debug(f"Ignoring corrupt rule cache file {cache_path}")
+        return None
+    if cached_key != key or not isinstance(code, CodeType):
+        return None
+    return code
+
+
+def _write_cache(cache_path: Path, key: CacheKey, code: CodeType) -> None:
+    """Store a code object in the cache, skip silently when this is not possible."""
+    if sys.dont_write_bytecode:
+        return
+    data = importlib.util.MAGIC_NUMBER + marshal.dumps((key, code))
+    # Write to a temporary file first, so concurrent processes never read a
+    # partially written cache file
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}")
+    try:
+        cache_path.parent.mkdir(exist_ok=True)
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        # e.g. rule files in a read-only directory
+        logger.debug(f"Could not write rule cache file {cache_path}: {e}")
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
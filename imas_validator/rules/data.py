@@ -22,6 +22,7 @@ class IDSValidationRule:
         func: Callable,
         *ids_names: str,
         version: str = "",
+        slice_safe: bool = False,
         **kwfields: Dict[str, Any],
     ):
         """Initialize IDSValidationRule
@@ -30,6 +31,9 @@ class IDSValidationRule:
             rule_path: Path to file where the rule is defined
             func: Function that defines validation rules
             ids_names: Names of ids instances to be validated
+            version: Specifier of the DD versions that the rule applies to
+            slice_safe: Whether the rule gives the same results when it is applied to
+                windows of time slices of an IDS instead of the full IDS
             kwfields: keyword arguments to be inputted in the validation function
         """
         self.func = func
@@ -37,6 +41,7 @@ class IDSValidationRule:
         self.name = f"{rule_path.parts[-2]}/{rule_path.parts[-1]}:{self.func.__name__}"
         self.ids_names, self.ids_occs = self.parse_ids_names(*ids_names)
         self.version = version
+        self.slice_safe = slice_safe
         self.kwfields = kwfields
         # kwfields explicitly parsed
 
@@ -99,7 +104,9 @@ class ValidatorRegistry:
         self.validators: List[IDSValidationRule] = []
         self.rule_path: Path = rule_path
 
-    def validator(self, *ids_names: str, version: str = "") -> Callable:
+    def validator(
+        self, *ids_names: str, version: str = "", slice_safe: bool = False
+    ) -> Callable:
         """Decorator to register functions as validation rules
 
         The validation rule function will be called with the requested IDSs as
@@ -111,6 +118,10 @@ class ValidatorRegistry:
                 any IDS. Add the occurrence number by appending the ids name with
                 an integer `>=0` like ``"summary:2"``. Occurrence number is required
                 for multi-IDS validation.
+            version: Specifier of the DD versions that the rule applies to.
+            slice_safe: Set to True when the rule only checks individual time slices,
+                so it can be applied to windows of time slices of an IDS. See
+                :py:attr:`~imas_validator.validate_options.ValidateOptions.time_window`.
 
         Example:
             .. code-block:: python
@@ -128,7 +139,13 @@ class ValidatorRegistry:
 
         # explicit kwfields
         def decorator(func: Callable) -> Callable:
-            rule = IDSValidationRule(self.rule_path, func, *ids_names, version=version)
+            rule = IDSValidationRule(
+                self.rule_path,
+                func,
+                *ids_names,
+                version=version,
+                slice_safe=slice_safe,
+            )
             self.validators.append(rule)
             return func
 
@@ -3,12 +3,26 @@ This file describes the helper functions for the validation rules
 """
 
 import operator
-from typing import Any, Callable, Iterator, List
+import re
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 import imas  # type: ignore
 import numpy as np
+from imas.ids_data_type import IDSDataType  # type: ignore
 
-from imas_validator.validate.ids_wrapper import IDSWrapper
+from imas_validator.validate.ids_wrapper import IDSWrapper, concat_provenance
+from imas_validator.validate.traversal_cache import active_traversal_cache
 
 # Make the following helpers available for rule developers:
 __all__ = ["Select", "Increasing", "Decreasing", "Approx", "Parent"]
@@ -59,26 +73,135 @@ class Select:
             raise TypeError("First argument of Select must be an IDS node")
 
         self._matches: List[IDSWrapper] = []
-        self._matching_paths = set(imas.util.find_paths(self._node, self._query))
-
-        # Loop over all elements in self._node, and append matches to self._matches.
-        # Note: this is not very efficient when a lot of nodes are filled and only a
-        # small number match the query. We can improve performance later if it is a
-        # bottleneck.
-        imas.util.visit_children(
-            self._visitor, self._node, leaf_only=leaf_only, visit_empty=not has_value
-        )
-
-    def _visitor(self, node: imas.ids_base.IDSBase) -> None:
-        """Visitor function used in imas.util.visit_children."""
-        if node.metadata.path_string in self._matching_paths:
-            self._matches.append(IDSWrapper(node))
+        # Queries on an IDS are memoized while rules are executed
+        cache = None
+        if isinstance(self._node, imas.ids_toplevel.IDSToplevel):
+            cache = active_traversal_cache()
+        key = (query, has_value, leaf_only)
+        if cache is not None:
+            matches = cache.get_selection(self._node, key)
+            if matches is not None:
+                self._matches = list(matches)
+                return
+
+        metadata = self._node.metadata
+        if cache is not None and has_value and leaf_only and not self._node._lazy:
+            # Filter the filled data nodes that are shared by all queries on the IDS
+            nodes = cache.filled_nodes_matching(
+                self._node, _matching_leaf_paths(metadata, query)
+            )
+            self._matches = [IDSWrapper(node) for node in nodes]
+        else:
+            # Only the children that lead to matching paths are visited, which also
+            # avoids loading the other subtrees of a lazy loaded IDS
+            is_leaf = isinstance(self._node, imas.ids_primitive.IDSPrimitive)
+            if (not leaf_only or is_leaf) and re.search(query, metadata.path_string):
+                self._matches.append(IDSWrapper(self._node))
+            if not is_leaf:
+                self._visit(self._node, _select_trie(metadata, query))
+        if cache is not None:
+            cache.put_selection(self._node, key, self._matches)
+
+    def _visit(self, node: imas.ids_base.IDSBase, trie: "_SelectTrie") -> None:
+        """Visit the children of a node in the same order as
+        imas.util.visit_children, descending only into children that contain
+        matching paths according to the trie."""
+        lazy = node._lazy
+        if self._has_value and not lazy:
+            # Only the filled children, like imas.util.visit_children
+            children: Iterable[Tuple[imas.ids_base.IDSBase, _TrieEntry]] = (
+                (child, trie[child.metadata.name])
+                for child in node.iter_nonempty_()
+                if child.metadata.name in trie
+            )
+        else:
+            children = ((getattr(node, name), entry) for name, entry in trie.items())
+        for child, (matches, child_trie) in children:
+            if child_trie is None:
+                if matches and (child.has_value or not self._has_value):
+                    self._matches.append(IDSWrapper(child))
+                continue
+            include = matches and not self._leaf_only
+            if isinstance(child, imas.ids_struct_array.IDSStructArray):
+                if self._has_value and not len(child):
+                    continue
+                if include:
+                    self._matches.append(IDSWrapper(child))
+                for element in child:
+                    if include:
+                        self._matches.append(IDSWrapper(element))
+                    self._visit(element, child_trie)
+                continue
+            position = len(self._matches)
+            self._visit(child, child_trie)
+            # Filled children of fully loaded IDSs have a value. has_value is not
+            # implemented for lazy loaded structures: consider them filled when they
+            # contain a match
+            if include and (
+                not self._has_value or not lazy or len(self._matches) > position
+            ):
+                self._matches.insert(position, IDSWrapper(child))
 
     def __iter__(self) -> Iterator[IDSWrapper]:
         """Iterate over all children matching the criteria of this Select class."""
         return iter(self._matches)
 
 
+_SelectTrie = Dict[str, "_TrieEntry"]
+_TrieEntry = Tuple[bool, Optional[_SelectTrie]]
+
+# Number of queries of which the tries are cached, rules use a few queries per IDS
+_TRIE_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=_TRIE_CACHE_SIZE)
+def _select_trie(metadata: imas.ids_metadata.IDSMetadata, query: str) -> _SelectTrie:
+    """Return the children of a node that match a Select query or lead to matches
+
+    Every entry maps the name of a child to whether its path matches the query and the
+    trie of its own children, which is None for data nodes. Children without matches
+    in their subtree are left out. The metadata of a data dictionary version is shared
+    between IDSs, so the trie is built once per DD version and query.
+    """
+    return _build_trie(metadata, re.compile(query))
+
+
+def _build_trie(
+    metadata: imas.ids_metadata.IDSMetadata, pattern: "re.Pattern[str]"
+) -> _SelectTrie:
+    trie: _SelectTrie = {}
+    for child in metadata:
+        matches = pattern.search(child.path_string) is not None
+        child_trie = None
+        if child.data_type in (IDSDataType.STRUCTURE, IDSDataType.STRUCT_ARRAY):
+            child_trie = _build_trie(child, pattern)
+            if not matches and not child_trie:
+                continue
+        elif not matches:
+            continue
+        trie[child.name] = (matches, child_trie)
+    return trie
+
+
+@lru_cache(maxsize=_TRIE_CACHE_SIZE)
+def _matching_leaf_paths(
+    metadata: imas.ids_metadata.IDSMetadata, query: str
+) -> FrozenSet[str]:
+    """Return the path strings of the data nodes below a node that match a query"""
+    paths = set()
+    todo = [(metadata.path_string, _select_trie(metadata, query))]
+    while todo:
+        prefix, trie = todo.pop()
+        for name, (matches, child_trie) in trie.items():
+            path = f"{prefix}/{name}" if prefix else name
+            if child_trie is None:
+                if matches:
+                    paths.add(path)
+            else:
+                todo.append((path, child_trie))
+    return frozenset(paths)
+
+
 def Increasing(wrapped: IDSWrapper) -> IDSWrapper:
     """Return whether a given array is strictly increasing
 
@@ -106,9 +229,12 @@ def _check_order(wrapped: IDSWrapper, op: Callable) -> IDSWrapper:
             f"Expected a 1D array, but {wrapped._obj!r} has {node_arr.ndim} dimensions"
         )
 
-    diff = np.diff(node_arr)
-    res = bool(np.all(op(diff, 0)))
-    return IDSWrapper(res, ids_nodes=wrapped._ids_nodes.copy())
+    # Keep the elementwise result, so failing elements can be reported: an element
+    # fails when it is not in order with the previous element
+    in_order = np.ones(node_arr.shape, dtype=bool)
+    in_order[1:] = op(np.diff(node_arr), 0)
+    res = bool(np.all(in_order))
+    return IDSWrapper(res, provenance=wrapped._provenance, element_results=in_order)
 
 
 def Approx(a: Any, b: Any, rtol: float = 1e-5, atol: float = 1e-8) -> IDSWrapper:
@@ -122,19 +248,21 @@ def Approx(a: Any, b: Any, rtol: float = 1e-5, atol: float = 1e-8) -> IDSWrapper
         rtol: Relative tolerance parameter
         atol: Absolute tolerance parameter
     """
-    ids_nodes = []
+    provenance = None
     if isinstance(a, IDSWrapper):
         a_val = a._obj
-        ids_nodes += a._ids_nodes
+        provenance = a._provenance
     else:
         a_val = a
     if isinstance(b, IDSWrapper):
         b_val = b._obj
-        ids_nodes += b._ids_nodes
+        provenance = concat_provenance(provenance, b._provenance)
     else:
         b_val = b
-    res = np.allclose(a_val, b_val, rtol=rtol, atol=atol)
-    return IDSWrapper(res, ids_nodes=ids_nodes)
+    # Keep the elementwise result, so failing elements can be reported
+    close = np.isclose(a_val, b_val, rtol=rtol, atol=atol)
+    res = bool(np.all(close))
+    return IDSWrapper(res, provenance=provenance, element_results=close)
 
 
 def Parent(wrapped: IDSWrapper, level: int = 1) -> IDSWrapper:
@@ -0,0 +1,140 @@
+"""
+This file describes the dispatch index that finds the rules which apply to an IDS
+occurrence without scanning all loaded rules
+"""
+
+from typing import Dict, List, Optional, Set, Tuple
+
+from packaging.specifiers import SpecifierSet
+from packaging.version import Version
+
+from imas_validator.rules.data import IDSValidationRule
+
+# IDS name (or "*") and occurrence (or None for any occurrence)
+RuleKey = Tuple[str, Optional[int]]
+
+
+class RuleIndex:
+    """Index of rules by the first IDS name and occurrence they apply to.
+
+    Multi-IDS rules are indexed by their first IDS only, to prevent matching the same
+    rule multiple times.
+    """
+
+    def __init__(self, rules: List[IDSValidationRule]) -> None:
+        """Build the index
+
+        Args:
+            rules: Loaded validation rules
+        """
+        self.rules = rules
+        self._positions: Dict[RuleKey, List[int]] = {}
+        for position, rule in enumerate(rules):
+            key = (rule.ids_names[0], rule.ids_occs[0])
+            self._positions.setdefault(key, []).append(position)
+        self._specifiers = [SpecifierSet(rule.version) for rule in rules]
+        # Memoized positions of rules that accept a DD version
+        self._version_matches: Dict[str, Set[int]] = {}
+        # Memoized matching rules per IDS name, occurrence and DD version
+        self._matches: Dict[Tuple[str, int, str], List[IDSValidationRule]] = {}
+        # Memoized rules and argument positions per IDS name and occurrence
+        self._arguments: Dict[Tuple[str, int], List[Tuple[IDSValidationRule, int]]] = {}
+
+    def applies_to_ids(self, ids_name: str) -> bool:
+        """Return whether any rule may apply to an occurrence of the given IDS
+
+        Args:
+            ids_name: Name of the IDS
+        """
+        return any(name in (ids_name, "*") for name, _ in self._positions)
+
+    def applies_to(self, ids_name: str, occurrence: int) -> bool:
+        """Return whether any rule may apply to an IDS occurrence, before loading it.
+
+        The DD version of the IDS is not known yet, so version specifiers are not
+        taken into account.
+
+        Args:
+            ids_name: Name of the IDS
+            occurrence: Occurrence number of the IDS
+        """
+        return any(
+            key in self._positions
+            for key in [
+                (ids_name, occurrence),
+                (ids_name, None),
+                ("*", occurrence),
+                ("*", None),
+            ]
+        )
+
+    def find_arguments(
+        self, ids_name: str, occurrence: int
+    ) -> List[Tuple[IDSValidationRule, int]]:
+        """Return the rules that may receive an IDS occurrence as any of their
+        arguments, together with the position of that argument.
+
+        Version specifiers are not taken into account.
+
+        Args:
+            ids_name: Name of the IDS
+            occurrence: Occurrence number of the IDS
+        """
+        key = (ids_name, occurrence)
+        arguments = self._arguments.get(key)
+        if arguments is None:
+            arguments = [
+                (rule, position)
+                for rule in self.rules
+                for position, (name, occ) in enumerate(
+                    zip(rule.ids_names, rule.ids_occs)
+                )
+                if name in (ids_name, "*") and occ in (occurrence, None)
+            ]
+            self._arguments[key] = arguments
+        return arguments
+
+    def find(
+        self, ids_name: str, occurrence: int, dd_version: str
+    ) -> List[IDSValidationRule]:
+        """Return the rules that apply to an IDS occurrence, in loading order
+
+        Args:
+            ids_name: Name of the IDS
+            occurrence: Occurrence number of the IDS
+            dd_version: Data dictionary version of the IDS
+
+        Returns:
+            Rules for which the IDS occurrence is the first IDS argument
+        """
+        match_key = (ids_name, occurrence, dd_version)
+        matches = self._matches.get(match_key)
+        if matches is None:
+            version_matches = self._get_version_matches(dd_version)
+            positions = sorted(
+                position
+                for key in [
+                    (ids_name, occurrence),
+                    (ids_name, None),
+                    ("*", occurrence),
+                    ("*", None),
+                ]
+                for position in self._positions.get(key, [])
+                if position in version_matches
+            )
+            matches = [self.rules[position] for position in positions]
+            self._matches[match_key] = matches
+        return matches
+
+    def _get_version_matches(self, dd_version: str) -> Set[int]:
+        """Return the positions of rules that accept the given DD version"""
+        version_matches = self._version_matches.get(dd_version)
+        if version_matches is None:
+            version = Version(dd_version)
+            version_matches = {
+                position
+                for position, specifier in enumerate(self._specifiers)
+                if version in specifier
+            }
+            self._version_matches[dd_version] = version_matches
+        return version_matches
@@ -166,6 +166,23 @@ def load_rules(
     return rules
 
 
+def bind_rules(
+    rules: List[IDSValidationRule], result_collector: ResultCollector
+) -> None:
+    """
+    Let already loaded rules deposit their results in another ResultCollector, without
+    executing the rule files again
+
+    Args:
+        rules: Loaded validation rules
+        result_collector: ResultCollector where the rules will deposit their results
+            after being run
+    """
+    for rule in rules:
+        # The rewritten assert statements look up 'assert' in the rule file globals
+        rule.func.__globals__["assert"] = result_collector.assert_
+
+
 def discover_rulesets(validate_options: ValidateOptions) -> List[Path]:
     """
     Make a list of directories and child directories which might contain rules.
@@ -264,7 +281,8 @@ def discover_rule_modules(ruleset_dirs: List[Path]) -> List[Path]:
         for path in ruleset_dir.iterdir():
             if path.is_file() and path.parts[-1] not in ["__init__.py"]:
                 rule_modules.append(path)
-    rule_modules = list(set(rule_modules))
+    # Sort to get the same rule order in every process (e.g. parallel workers)
+    rule_modules = sorted(set(rule_modules))
     return rule_modules
 
 
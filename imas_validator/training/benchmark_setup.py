@@ -0,0 +1,173 @@
+"""
+This file describes the functions that generate synthetic data entries of a given size
+for the benchmarks
+"""
+
+from pathlib import Path
+from typing import Union
+
+import imas  # type: ignore
+import numpy
+from imas.backends.imas_core.imas_interface import has_imas  # type: ignore
+
+BENCHMARK_DD_VERSION = "3.40.1"
+
+
+def benchmark_core_profiles(
+    n_times: int, n_ions: int, dd_version: str = BENCHMARK_DD_VERSION
+) -> imas.ids_toplevel.IDSToplevel:
+    """Return a core_profiles IDS with homogeneous time
+
+    Args:
+        n_times: Number of time slices
+        n_ions: Number of ions in every time slice
+        dd_version: Data dictionary version of the IDS
+    """
+    cp = imas.IDSFactory(dd_version).core_profiles()
+    cp.ids_properties.homogeneous_time = 1
+    cp.ids_properties.comment = "Synthetic benchmark data"
+    cp.time = numpy.linspace(0.0, 1.0, n_times)
+    rho_tor_norm = numpy.linspace(0.0, 1.0, 16)
+    cp.profiles_1d.resize(n_times)
+    for i, p1d in enumerate(cp.profiles_1d):
+        p1d.time = cp.time[i]
+        p1d.grid.rho_tor_norm = rho_tor_norm
+        p1d.electrons.density = numpy.full(16, 1e19)
+        p1d.electrons.temperature = 1e3 * (1.0 - rho_tor_norm**2) + 10.0
+        p1d.ion.resize(n_ions)
+        for j, ion in enumerate(p1d.ion):
+            ion.label = f"ion_{j + 1}"
+            ion.z_ion = 1.0
+            ion.element.resize(1)
+            ion.element[0].a = 2.0
+            ion.element[0].z_n = 1.0
+            ion.element[0].atoms_n = 1
+            ion.density = numpy.full(16, 1e19 / n_ions)
+            ion.temperature = p1d.electrons.temperature.value
+    return cp
+
+
+def _fill_grid_ggd(grid_ggd: imas.ids_structure.IDSStructure, n_objects: int) -> None:
+    """Fill a GGD grid with a line of nodes and the edges between them"""
+    grid_ggd.identifier.name = "linear"
+    grid_ggd.identifier.index = 1
+    grid_ggd.identifier.description = "Linear"
+    grid_ggd.space.resize(1)
+    space = grid_ggd.space[0]
+    space.identifier.name = "primary_standard"
+    space.identifier.index = 1
+    space.identifier.description = "Primary space defining the standard grid"
+    space.geometry_type.index = 0
+    space.coordinates_type = numpy.array([4, 3], dtype=numpy.int32)  # r, z
+    space.objects_per_dimension.resize(2)
+    nodes = space.objects_per_dimension[0].object
+    nodes.resize(n_objects)
+    for i, node in enumerate(nodes):
+        node.geometry = [5.0 + i / n_objects, 0.0]
+        node.nodes = [i + 1]
+    edges = space.objects_per_dimension[1].object
+    edges.resize(n_objects - 1)
+    for i, edge in enumerate(edges):
+        edge.nodes = [i + 1, i + 2]
+        edge.measure = 1.0 / n_objects
+    grid_ggd.grid_subset.resize(1)
+    grid_subset = grid_ggd.grid_subset[0]
+    grid_subset.identifier.name = "nodes"
+    grid_subset.identifier.index = 1
+    grid_subset.identifier.description = "All nodes (0D) belonging to the grid"
+    grid_subset.dimension = 1
+    grid_subset.element.resize(n_objects)
+    for i, element in enumerate(grid_subset.element):
+        element.object.resize(1)
+        element.object[0].space = 1
+        element.object[0].dimension = 1
+        element.object[0].index = i + 1
+
+
+def benchmark_edge_profiles(
+    n_times: int,
+    n_ions: int,
+    n_objects: int,
+    dd_version: str = BENCHMARK_DD_VERSION,
+) -> imas.ids_toplevel.IDSToplevel:
+    """Return an edge_profiles IDS with homogeneous time and a GGD grid per time slice
+
+    Args:
+        n_times: Number of time slices
+        n_ions: Number of ions in every time slice
+        n_objects: Number of nodes of the grids, the grids also have the edges
+            between consecutive nodes
+        dd_version: Data dictionary version of the IDS
+    """
+    ep = imas.IDSFactory(dd_version).edge_profiles()
+    ep.ids_properties.homogeneous_time = 1
+    ep.ids_properties.comment = "Synthetic benchmark data"
+    ep.time = numpy.linspace(0.0, 1.0, n_times)
+    ep.grid_ggd.resize(n_times)
+    ep.ggd.resize(n_times)
+    ep.ggd_fast.resize(n_times)
+    density = numpy.full(n_objects, 1e19)
+    for i in range(n_times):
+        ep.grid_ggd[i].time = ep.time[i]
+        _fill_grid_ggd(ep.grid_ggd[i], n_objects)
+        ep.ggd_fast[i].time = ep.time[i]
+        ggd = ep.ggd[i]
+        ggd.time = ep.time[i]
+        ggd.electrons.density.resize(1)
+        ggd.electrons.density[0].grid_index = 1
+        ggd.electrons.density[0].grid_subset_index = 1
+        ggd.electrons.density[0].values = density
+        ggd.ion.resize(n_ions)
+        for j, ion in enumerate(ggd.ion):
+            ion.label = f"ion_{j + 1}"
+            ion.z_ion = 1.0
+            ion.element.resize(1)
+            ion.element[0].a = 2.0
+            ion.element[0].z_n = 1.0
+            ion.element[0].atoms_n = 1
+            ion.density.resize(1)
+            ion.density[0].grid_index = 1
+            ion.density[0].grid_subset_index = 1
+            ion.density[0].values = density / n_ions
+    return ep
+
+
+def benchmark_uri(directory: Union[str, Path], name: str) -> str:
+    """Return the URI of a data entry in a directory
+
+    The HDF5 backend is used when imas_core is available, otherwise the data entry is
+    a netCDF file.
+
+    Args:
+        directory: Directory in which the data entry is stored
+        name: Name of the data entry
+    """
+    path = Path(directory).resolve() / name
+    if has_imas:
+        return f"imas:hdf5?path={path}"
+    return f"{path}.nc"
+
+
+def create_benchmark_db_entry(
+    uri: str,
+    n_times: int,
+    n_ions: int,
+    n_objects: int,
+    dd_version: str = BENCHMARK_DD_VERSION,
+) -> str:
+    """Write a synthetic core_profiles and edge_profiles IDS to a data entry
+
+    Args:
+        uri: URI of the data entry, e.g. from :py:func:`benchmark_uri`
+        n_times: Number of time slices
+        n_ions: Number of ions in every time slice
+        n_objects: Number of nodes of the GGD grids
+        dd_version: Data dictionary version of the data entry
+
+    Returns:
+        The URI of the data entry
+    """
+    with imas.DBEntry(uri, "w", dd_version=dd_version) as entry:
+        entry.put(benchmark_core_profiles(n_times, n_ions, dd_version))
+        entry.put(benchmark_edge_profiles(n_times, n_ions, n_objects, dd_version))
+    return uri
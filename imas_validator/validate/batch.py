@@ -0,0 +1,112 @@
+"""
+This file describes the batch validation of multiple data entries, which are spread
+over a pool of worker processes
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import replace
+from typing import Iterator, List, Optional, Tuple
+
+from imas_validator.validate.parallel import (
+    SerializedResultCollection,
+    cancel_futures,
+    deserialize_result,
+    serialize_result,
+)
+from imas_validator.validate.result import IDSValidationResultCollection
+from imas_validator.validate.validate import Validator
+from imas_validator.validate_options import ValidateOptions
+
+logger = logging.getLogger(__name__)
+
+# Validator of the current worker process, see _init_worker
+_worker_validator: Optional[Validator] = None
+
+
+def validate_uris(
+    imas_uris: List[str], validate_options: ValidateOptions, workers: int
+) -> Iterator[Tuple[int, IDSValidationResultCollection]]:
+    """Validate multiple data entries concurrently on a pool of worker processes.
+
+    Every worker process loads the rules once and reuses them for all data entries
+    that it validates.
+
+    Args:
+        imas_uris: urls for DBEntry objects
+        validate_options: dataclass with options for validate function
+        workers: Maximum number of data entries that are validated concurrently
+
+    Yields:
+        Index of the URI in imas_uris and its results, as soon as the validation of
+        a data entry has finished.
+    """
+    # Every data entry is validated by a single process
+    worker_options = replace(validate_options, jobs=1)
+    # Rules of the results are mapped to rules loaded in this process
+    rules = Validator(validate_options=validate_options).rules
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(worker_options,),
+    ) as executor:
+        futures = {
+            executor.submit(_validate_uri, imas_uri): index
+            for index, imas_uri in enumerate(imas_uris)
+        }
+        try:
+            for future in as_completed(futures):
+                serialized = future.result()
+                yield futures[future], IDSValidationResultCollection(
+                    results=[
+                        deserialize_result(result, rules)
+                        for result in serialized.results
+                    ],
+                    coverage_dict=serialized.coverage_dict,
+                    validate_options=validate_options,
+                    imas_uri=serialized.imas_uri,
+                    rule_profiles=serialized.rule_profiles,
+                    rule_call_stats=serialized.rule_call_stats,
+                )
+        except BaseException:
+            cancel_futures(list(futures))
+            raise
+
+
+def _init_worker(validate_options: ValidateOptions) -> None:
+    """Load the rules in a new worker process.
+
+    Args:
+        validate_options: dataclass with options for validate function
+    """
+    global _worker_validator
+    _worker_validator = Validator(validate_options=validate_options)
+    # Progress bars of concurrent workers would overwrite each other
+    _worker_validator.show_progress = False
+
+
+def _validate_uri(imas_uri: str) -> SerializedResultCollection:
+    """Validate a data entry in a worker process.
+
+    Args:
+        imas_uri: url for DBEntry object
+
+    Returns:
+        Picklable results of the validation
+    """
+    assert _worker_validator is not None, "Worker process was not initialized"
+    results_collection = _worker_validator.validate(imas_uri)
+    rule_indices = {id(rule): i for i, rule in enumerate(_worker_validator.rules)}
+    return SerializedResultCollection(
+        results=[
+            serialize_result(result, rule_indices[id(result.rule)])
+            for result in results_collection.results
+        ],
+        coverage_dict=results_collection.coverage_dict,
+        imas_uri=imas_uri,
+        rule_profiles=results_collection.rule_profiles,
+        rule_call_stats=results_collection.rule_call_stats,
+    )
@@ -0,0 +1,114 @@
+"""
+This file describes the cache of loaded IDS instances that is used by the rule executor
+to avoid loading the same IDS multiple times for multi-IDS rules
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+import imas  # type: ignore
+import numpy
+
+logger = logging.getLogger(__name__)
+
+IDSKey = Tuple[str, int]
+"""IDS name and occurrence"""
+
+# Estimated size of scalar values, strings are counted by their length
+_SCALAR_NBYTES = 8
+
+
+class IDSCache:
+    """Least recently used cache of IDS toplevels with a memory budget.
+
+    The memory usage of an IDS is estimated from the sizes of the filled data nodes.
+    IDSs that exceed the budget by themselves are not cached.
+    """
+
+    def __init__(self, max_nbytes: int) -> None:
+        """Initialize IDSCache
+
+        Args:
+            max_nbytes: Memory budget of the cache in bytes
+        """
+        self.max_nbytes = max_nbytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[IDSKey, Tuple[Any, int]]" = OrderedDict()
+
+    def get(self, key: IDSKey) -> Optional[imas.ids_toplevel.IDSToplevel]:
+        """Return the cached IDS or None if it is not in the cache
+
+        Args:
+            key: IDS name and occurrence
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._cache.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: IDSKey, ids: imas.ids_toplevel.IDSToplevel) -> None:
+        """Add an IDS to the cache, evicting the least recently used IDSs if needed
+
+        Args:
+            key: IDS name and occurrence
+            ids: Loaded IDS toplevel
+        """
+        nbytes = estimate_nbytes(ids)
+        if nbytes > self.max_nbytes or key in self._cache:
+            return
+        while self._cache and self.nbytes + nbytes > self.max_nbytes:
+            evicted_key, (_, evicted_nbytes) = self._cache.popitem(last=False)
+            self.nbytes -= evicted_nbytes
+            logger.debug(f"Evicted IDS {evicted_key[0]}:{evicted_key[1]} from cache")
+        self._cache[key] = (ids, nbytes)
+        self.nbytes += nbytes
+
+    def nbytes_of(self, key: IDSKey) -> Optional[int]:
+        """Return the estimated size of a cached IDS, or None if it is not cached
+
+        Args:
+            key: IDS name and occurrence
+        """
+        entry = self._cache.get(key)
+        return None if entry is None else entry[1]
+
+    def log_statistics(self) -> None:
+        """Log the number of cache hits and misses"""
+        logger.info(
+            f"IDS cache: {self.hits} hits, {self.misses} misses, "
+            f"{len(self._cache)} IDSs ({self.nbytes} bytes) cached"
+        )
+
+
+def estimate_nbytes(ids: imas.ids_toplevel.IDSToplevel) -> int:
+    """Estimate the memory usage of an IDS from the sizes of its filled data nodes
+
+    Args:
+        ids: IDS toplevel
+
+    Returns:
+        Estimated number of bytes
+    """
+    nbytes = 0
+
+    def add_nbytes(node: imas.ids_primitive.IDSPrimitive) -> None:
+        nonlocal nbytes
+        value = node.value
+        if isinstance(value, numpy.ndarray):
+            nbytes += value.nbytes
+        elif isinstance(value, str):
+            nbytes += len(value)
+        else:
+            nbytes += _SCALAR_NBYTES
+
+    # Only the loaded data of lazy loaded IDSs takes up memory
+    imas.util.visit_children(
+        add_nbytes, ids, leaf_only=True, visit_empty=False, accept_lazy=True
+    )
+    return nbytes
@@ -3,20 +3,69 @@ This file describes the overload class for the operators
 """
 
 import operator
-from typing import Any, Callable, Collection, Iterator, List, Optional, Tuple
+from typing import Any, Callable, Collection, Iterator, List, Optional, Sequence, Tuple
 
 import imas  # type: ignore
 import numpy as np
 
 
+class _Concat:
+    """Concatenation of the provenance of two wrapped values
+
+    Provenance is immutable, so the provenance of the operands is shared instead of
+    copied when the wrapped values are combined.
+    """
+
+    __slots__ = ("left", "right")
+
+    def __init__(self, left: Any, right: Any) -> None:
+        self.left = left
+        self.right = right
+
+
+# Provenance is either None when no nodes contributed to a wrapped value, a single
+# IDS node or a _Concat of provenances
+Provenance = Any
+
+
+def concat_provenance(first: Provenance, second: Provenance) -> Provenance:
+    """Combine two provenances without copying them
+
+    Args:
+        first: Provenance of which the nodes are reported first
+        second: Provenance of which the nodes are reported next
+    """
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return _Concat(first, second)
+
+
+def iter_provenance(provenance: Provenance) -> Iterator[Any]:
+    """Iterate over the IDS nodes of a provenance
+
+    Args:
+        provenance: Provenance of a wrapped value
+    """
+    stack = [provenance]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, _Concat):
+            stack.append(item.right)
+            stack.append(item.left)
+        elif item is not None:
+            yield item
+
+
 def _binary_wrapper(op: Callable, name: str) -> Callable:
     def func(self: "IDSWrapper", other: Any) -> "IDSWrapper":
         if isinstance(other, IDSWrapper):
-            new_nodes = other._ids_nodes
+            provenance = concat_provenance(self._provenance, other._provenance)
             other = other._obj
         else:
-            new_nodes = []
-        return IDSWrapper(op(self._obj, other), ids_nodes=self._ids_nodes + new_nodes)
+            provenance = self._provenance
+        return IDSWrapper(op(self._obj, other), provenance=provenance)
 
     func.__name__ = f"__{name}__"
     return func
@@ -25,11 +74,11 @@ def _binary_wrapper(op: Callable, name: str) -> Callable:
 def _reflected_binary_wrapper(op: Callable, name: str) -> Callable:
     def func(self: "IDSWrapper", other: Any) -> "IDSWrapper":
         if isinstance(other, IDSWrapper):
-            new_nodes = other._ids_nodes
+            provenance = concat_provenance(self._provenance, other._provenance)
             other = other._obj
         else:
-            new_nodes = []
-        return IDSWrapper(op(other, self._obj), ids_nodes=self._ids_nodes + new_nodes)
+            provenance = self._provenance
+        return IDSWrapper(op(other, self._obj), provenance=provenance)
 
     func.__name__ = f"__r{name}__"
     return func
@@ -41,7 +90,7 @@ def _numeric_wrapper(op: Callable, name: str) -> Tuple[Callable, Callable]:
 
 def _unary_wrapper(op: Callable, name: str) -> Callable:
     def func(self: "IDSWrapper") -> "IDSWrapper":
-        return IDSWrapper(op(self._obj), ids_nodes=self._ids_nodes)
+        return IDSWrapper(op(self._obj), provenance=self._provenance)
 
     func.__name__ = f"__{name}__"
     return func
@@ -52,11 +101,15 @@ class IDSWrapper:
     Wrapper objects with operator overloads for reporting validation test results
     """
 
+    __slots__ = ("_obj", "_provenance", "_element_results")
+
     def __init__(
         self,
         obj: Any,
         *,
-        ids_nodes: Optional[List[imas.ids_primitive.IDSPrimitive]] = None,
+        ids_nodes: Optional[Sequence[imas.ids_primitive.IDSPrimitive]] = None,
+        provenance: Provenance = None,
+        element_results: Optional[np.ndarray] = None,
     ) -> None:
         """Initialize IDSWrapper
 
@@ -65,13 +118,25 @@ class IDSWrapper:
 
         Keyword Args:
             ids_nodes: List of ids nodes the IDSWrapper has touched
+            provenance: Provenance of the ids nodes the IDSWrapper has touched, which
+                is shared with the wrapper it was derived from
+            element_results: Elementwise results of which the wrapped boolean is the
+                combined result, used to report the elements that failed
         """
         if isinstance(obj, IDSWrapper):
             raise ValueError("Cannot wrap already wrapped object")
         self._obj = obj
-        self._ids_nodes = ids_nodes or []
+        for node in ids_nodes or ():
+            provenance = concat_provenance(provenance, node)
         if isinstance(obj, imas.ids_primitive.IDSPrimitive):
-            self._ids_nodes = self._ids_nodes + [obj]
+            provenance = obj if provenance is None else _Concat(provenance, obj)
+        self._provenance = provenance
+        self._element_results = element_results
+
+    @property
+    def _ids_nodes(self) -> List[imas.ids_primitive.IDSPrimitive]:
+        """List of ids nodes the IDSWrapper has touched"""
+        return list(iter_provenance(self._provenance))
 
     def __array_ufunc__(
         self, ufunc: Any, method: Any, *args: Any, **kwargs: Any
@@ -92,30 +157,33 @@ class IDSWrapper:
         """
         # Unpack args:
         unpacked_args = []
-        ids_nodes = []
+        provenance = None
         for value in args:
             if isinstance(value, IDSWrapper):
-                ids_nodes.extend(value._ids_nodes)
+                provenance = concat_provenance(provenance, value._provenance)
                 value = value._obj
                 if isinstance(value, imas.ids_primitive.IDSPrimitive):
                     value = value.value
             unpacked_args.append(value)
         # Pass unpacked inputs to the function:
         result = func(*unpacked_args, **kwargs)
-        return None if result is None else IDSWrapper(result, ids_nodes=ids_nodes)
+        if result is None:
+            return None
+        return IDSWrapper(result, provenance=provenance)
 
     def __getattr__(self, attr: str) -> "IDSWrapper":
         if not attr.startswith("_"):
-            return IDSWrapper(getattr(self._obj, attr), ids_nodes=self._ids_nodes)
+            return IDSWrapper(getattr(self._obj, attr), provenance=self._provenance)
         raise AttributeError(f"{self.__class__} object has no attribute {attr}")
 
     def __call__(self, *args: Any, **kwargs: Any) -> "IDSWrapper":
-        return IDSWrapper(self._obj(*args, **kwargs), ids_nodes=self._ids_nodes)
+        return IDSWrapper(self._obj(*args, **kwargs), provenance=self._provenance)
 
     def __getitem__(self, item: Any) -> "IDSWrapper":
+        provenance = self._provenance
         if isinstance(item, IDSWrapper):
-            self._ids_nodes.extend(item._ids_nodes)
-        return IDSWrapper(self._obj[item], ids_nodes=self._ids_nodes)
+            provenance = concat_provenance(provenance, item._provenance)
+        return IDSWrapper(self._obj[item], provenance=provenance)
 
     def __index__(self) -> int:
         return int(self._obj)
@@ -125,7 +193,7 @@ class IDSWrapper:
 
     def __iter__(self) -> Iterator["IDSWrapper"]:
         for item in self._obj:
-            yield IDSWrapper(item, ids_nodes=self._ids_nodes)
+            yield IDSWrapper(item, provenance=self._provenance)
 
     def __str__(self) -> str:
         return str(self._obj)
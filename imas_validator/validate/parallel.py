@@ -0,0 +1,257 @@
+"""
+This file describes the parallel validation loop in which the IDS occurrences of a
+data entry are spread over a pool of worker processes
+"""
+
+import logging
+import multiprocessing
+import pickle
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import List, Optional, Tuple
+
+import imas  # type: ignore
+from rich.progress import Progress
+
+from imas_validator.rules.data import IDSValidationRule
+from imas_validator.rules.loading import load_rules
+from imas_validator.validate.result import (
+    CoverageDict,
+    IDSValidationResult,
+    NodesDict,
+    RuleCallStats,
+    RuleProfile,
+)
+from imas_validator.validate.result_collector import ResultCollector
+from imas_validator.validate.result_sink import JSONLinesResultSink
+from imas_validator.validate.rule_executor import RuleExecutor, ids_checkpoint_key
+from imas_validator.validate_options import ValidateOptions
+
+logger = logging.getLogger(__name__)
+
+# Rule executor of the current worker process, see _init_worker
+_worker_executor: Optional[RuleExecutor] = None
+
+
+@dataclass
+class SerializedResult:
+    """Picklable representation of an IDSValidationResult.
+
+    Rules cannot be pickled, so they are identified by their position in the list of
+    loaded rules, which is the same in every process.
+    """
+
+    rule_index: int
+    """Index of the rule in the list of loaded rules"""
+    rule_name: str
+    """Name of the rule, used to verify that the rule lists are the same"""
+    result: IDSValidationResult
+    """Result object with its rule attribute set to None"""
+
+
+@dataclass
+class WorkerOutput:
+    """Output of validating a single IDS occurrence in a worker process"""
+
+    results: List[SerializedResult]
+    """Results in the order in which they were produced"""
+    visited_nodes_dict: NodesDict
+    """Visited nodes per IDS occurrence"""
+    filled_nodes_dict: NodesDict
+    """Filled nodes per IDS occurrence"""
+    rule_profiles: List[RuleProfile]
+    """Resources used per rule and IDS occurrences, when profiling is enabled"""
+    rule_call_stats: RuleCallStats
+    """cProfile statistics per rule and IDS occurrences of the profiled rules"""
+
+
+@dataclass
+class SerializedResultCollection:
+    """Picklable representation of an IDSValidationResultCollection"""
+
+    results: List[SerializedResult]
+    """Results in the order in which they were produced"""
+    coverage_dict: CoverageDict
+    """Dict with number of filled, visited and overlapping nodes per ids/occ"""
+    imas_uri: str
+    """URI of dbentry being tested"""
+    rule_profiles: List[RuleProfile]
+    """Resources used per rule and IDS occurrences, when profiling is enabled"""
+    rule_call_stats: RuleCallStats
+    """cProfile statistics per rule and IDS occurrences of the profiled rules"""
+
+
+class ParallelRuleExecutor(RuleExecutor):
+    """Rule executor that spreads the IDS occurrences over worker processes.
+
+    Every worker process opens its own DBEntry and loads its own rules. The results
+    of the workers are merged into the ResultCollector of this executor in the order
+    of the IDS occurrences, so the outcome does not depend on the scheduling of the
+    workers.
+    """
+
+    def apply_rules_to_data(
+        self, ids_list: Optional[List[Tuple[str, int]]] = None
+    ) -> None:
+        """Apply set of rules to the Data Entry using a pool of worker processes.
+
+        Args:
+            ids_list: IDS names and occurrences to validate. When not provided, all
+                IDS occurrences in the Data Entry are validated.
+        """
+        logger.info(
+            f"Started executing rules with {self.validate_options.jobs} processes"
+        )
+        if ids_list is None:
+            ids_list = self._get_ids_list()
+        # IDS occurrences that were completed by a resumed run are not validated again
+        ids_list = [
+            (ids_name, occurrence)
+            for ids_name, occurrence in ids_list
+            if not self.result_collector.is_completed(
+                ids_checkpoint_key(ids_name, occurrence)
+            )
+        ]
+        # Results are written to the results file by this process
+        worker_options = replace(self.validate_options, jobs=1, results_dir=None)
+        # Use spawn: forking a process with an opened (HDF5) backend is not safe
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=self.validate_options.jobs,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.result_collector.imas_uri, worker_options),
+        ) as executor:
+            futures = [
+                executor.submit(_validate_ids_occurrence, ids_name, occurrence)
+                for ids_name, occurrence in ids_list
+            ]
+            self.progress_start()
+            task = self.progress.add_task("[red]Processing...", total=len(futures))
+            try:
+                # Merge in submission order for a deterministic result order
+                for (ids_name, occurrence), future in zip(ids_list, futures):
+                    self._merge_output(future.result())
+                    self.result_collector.mark_completed(
+                        ids_checkpoint_key(ids_name, occurrence)
+                    )
+                    self.progress.update(task, advance=1)
+            except BaseException:
+                cancel_futures(futures)
+                raise
+            finally:
+                self.progress_stop()
+
+    def _merge_output(self, output: WorkerOutput) -> None:
+        """Merge the output of a worker into the ResultCollector of this executor.
+
+        Args:
+            output: Results and node dicts of a single IDS occurrence
+        """
+        self.result_collector.results.extend(
+            deserialize_result(serialized, self.rules) for serialized in output.results
+        )
+        self.result_collector.merge_coverage(
+            output.visited_nodes_dict, output.filled_nodes_dict
+        )
+        if self.result_collector.rule_profiler is not None:
+            self.result_collector.rule_profiler.merge(output.rule_profiles)
+        if self.result_collector.rule_call_profiler is not None:
+            self.result_collector.rule_call_profiler.merge(output.rule_call_stats)
+
+
+def _init_worker(imas_uri: str, validate_options: ValidateOptions) -> None:
+    """Open the DBEntry and load the rules in a new worker process.
+
+    Args:
+        imas_uri: url for DBEntry object
+        validate_options: Dataclass for validate options
+    """
+    global _worker_executor
+    db_entry = imas.DBEntry(imas_uri, "r")
+    result_collector = ResultCollector(
+        validate_options=validate_options, imas_uri=imas_uri
+    )
+    rules = load_rules(
+        result_collector=result_collector, validate_options=validate_options
+    )
+    _worker_executor = RuleExecutor(
+        db_entry, rules, result_collector, validate_options=validate_options
+    )
+    # The parent process displays the progress
+    _worker_executor.progress = Progress(disable=True)
+
+
+def _validate_ids_occurrence(ids_name: str, occurrence: int) -> WorkerOutput:
+    """Apply the rules of this worker process to a single IDS occurrence.
+
+    Args:
+        ids_name: Name of the IDS
+        occurrence: Occurrence number of the IDS
+
+    Returns:
+        Picklable results of the validation
+    """
+    assert _worker_executor is not None, "Worker process was not initialized"
+    result_collector = _worker_executor.result_collector
+    result_collector.reset()
+    _worker_executor.apply_rules_to_data([(ids_name, occurrence)])
+    result_collector.collect_filled_nodes()
+    result_collector.store_aggregates()
+    results = result_collector.results
+    assert not isinstance(results, JSONLinesResultSink), "Written by main process"
+    rule_indices = {id(rule): i for i, rule in enumerate(_worker_executor.rules)}
+    return WorkerOutput(
+        results=[
+            serialize_result(result, rule_indices[id(result.rule)])
+            for result in results
+        ],
+        visited_nodes_dict=result_collector.visited_nodes_dict,
+        filled_nodes_dict=result_collector.filled_nodes_dict,
+        rule_profiles=result_collector.rule_profiles(),
+        rule_call_stats=result_collector.rule_call_stats(),
+    )
+
+
+def serialize_result(result: IDSValidationResult, index: int) -> SerializedResult:
+    """Convert a result into a picklable object.
+
+    Args:
+        result: Result produced by a worker process
+        index: Index of the result's rule in the rules loaded by the worker process
+    """
+    exc = result.exc
+    if exc is not None:
+        try:
+            pickle.dumps(exc)
+        except Exception:
+            exc = RuntimeError(f"{type(exc).__name__}: {exc}")
+    return SerializedResult(
+        rule_index=index,
+        rule_name=result.rule.name,
+        result=replace(result, rule=None, exc=exc),  # type: ignore[arg-type]
+    )
+
+
+def deserialize_result(
+    serialized: SerializedResult, rules: List[IDSValidationRule]
+) -> IDSValidationResult:
+    """Convert a serialized result back into a result with a rule of this process.
+
+    Args:
+        serialized: Result produced by a worker process
+        rules: Rules loaded in this process
+    """
+    rule = rules[serialized.rule_index]
+    if rule.name != serialized.rule_name:
+        raise RuntimeError(
+            f"Rule {serialized.rule_name!r} of worker process does not match "
+            f"rule {rule.name!r}. Were the rules modified during validation?"
+        )
+    return replace(serialized.result, rule=rule)
+
+
+def cancel_futures(futures: List[Future]) -> None:
+    """Cancel all futures that did not start running yet."""
+    for future in futures:
+        future.cancel()
@@ -0,0 +1,133 @@
+"""
+This file describes the partial loading of IDSs, in which only the paths that the
+rules may read are copied from a lazy loaded IDS
+"""
+
+import re
+from typing import Dict, Iterator, Optional, Tuple
+
+import imas  # type: ignore
+
+from imas_validator.rules.access_analysis import ArgumentAccess
+
+# Child name -> (whether all descendants are needed, required children)
+RequirementTree = Dict[str, Tuple[bool, "RequirementTree"]]
+
+
+def resolve_requirements(
+    metadata: imas.ids_metadata.IDSMetadata, access: ArgumentAccess
+) -> Optional[RequirementTree]:
+    """Resolve the accessed paths of the rules against the data dictionary.
+
+    Attribute names that are not part of the data dictionary (e.g. ``has_value`` or
+    ``metadata``) are stripped from the paths.
+
+    Args:
+        metadata: Metadata of the IDS toplevel
+        access: Paths that the rules may read
+
+    Returns:
+        Tree of paths to load, or None when the full IDS should be loaded
+    """
+    subtrees = {_valid_prefix(metadata, path) for path in access.subtrees}
+    for prefix, query in access.queries:
+        subtrees.update(_find_paths(metadata, _valid_prefix(metadata, prefix), query))
+    if "" in subtrees:
+        return None
+    tree: RequirementTree = {}
+    for path in access.navigations:
+        path = _valid_prefix(metadata, path)
+        if path:
+            _add_path(tree, path.split("/"), subtree=False)
+    for path in subtrees:
+        _add_path(tree, path.split("/"), subtree=True)
+    return tree
+
+
+def copy_requirements(
+    source: imas.ids_base.IDSBase,
+    target: imas.ids_base.IDSBase,
+    tree: RequirementTree,
+) -> None:
+    """Copy the required paths of an IDS (e.g. a lazy loaded IDS) to another IDS
+
+    Args:
+        source: IDS toplevel or structure to copy from
+        target: Empty IDS toplevel or structure of the same type to copy to
+        tree: Paths to copy
+    """
+    for name, (subtree, children) in tree.items():
+        source_child = getattr(source, name)
+        target_child = getattr(target, name)
+        if subtree:
+            _copy_all(source_child, target_child)
+        elif isinstance(source_child, imas.ids_struct_array.IDSStructArray):
+            target_child.resize(len(source_child))
+            for source_element, target_element in zip(source_child, target_child):
+                copy_requirements(source_element, target_element, children)
+        elif isinstance(source_child, imas.ids_structure.IDSStructure):
+            copy_requirements(source_child, target_child, children)
+        else:
+            _copy_all(source_child, target_child)
+
+
+def _copy_all(source: imas.ids_base.IDSBase, target: imas.ids_base.IDSBase) -> None:
+    """Copy a node and all its descendants"""
+    if isinstance(source, imas.ids_struct_array.IDSStructArray):
+        target.resize(len(source))
+        for source_element, target_element in zip(source, target):
+            _copy_all(source_element, target_element)
+    elif isinstance(source, imas.ids_structure.IDSStructure):
+        for source_child in source:
+            _copy_all(source_child, getattr(target, source_child.metadata.name))
+    elif source.has_value:
+        target.value = source.value
+
+
+def _add_path(tree: RequirementTree, parts: list, subtree: bool) -> None:
+    """Add a path to the requirement tree"""
+    name = parts[0]
+    child_subtree, children = tree.get(name, (False, {}))
+    if len(parts) == 1:
+        child_subtree = child_subtree or subtree
+    else:
+        _add_path(children, parts[1:], subtree)
+    tree[name] = (child_subtree, children)
+
+
+def _valid_prefix(metadata: imas.ids_metadata.IDSMetadata, path: str) -> str:
+    """Return the longest prefix of the path that exists in the data dictionary"""
+    valid = []
+    for part in path.split("/") if path else []:
+        try:
+            metadata = metadata[part]
+        except KeyError:
+            break
+        valid.append(part)
+    return "/".join(valid)
+
+
+def _find_paths(
+    metadata: imas.ids_metadata.IDSMetadata, prefix: str, query: str
+) -> Iterator[str]:
+    """Find the paths below prefix matching the query, like imas.util.find_paths"""
+    prefix_metadata = metadata[prefix] if prefix else metadata
+    pattern = re.compile(query)
+    descendants = list(_iter_descendants(prefix_metadata))
+    matches = [
+        child.path_string
+        for child in descendants
+        if pattern.search(child.path_string) is not None
+    ]
+    if len(matches) == len(descendants):
+        # Everything is selected
+        return iter([prefix])
+    return iter(matches)
+
+
+def _iter_descendants(
+    metadata: imas.ids_metadata.IDSMetadata,
+) -> Iterator[imas.ids_metadata.IDSMetadata]:
+    for child in metadata:
+        yield child
+        yield from _iter_descendants(child)
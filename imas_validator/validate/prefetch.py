@@ -0,0 +1,78 @@
+"""
+This file describes the background prefetching of IDS occurrences, which overlaps
+loading the next IDSs with executing the rules on the current IDS
+"""
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+Key = Tuple[str, int]
+
+
+def prefetch(
+    load: Callable[[str, int], Tuple[Optional[T], int]],
+    ids_list: List[Key],
+    depth: int,
+    max_nbytes: int,
+) -> Iterator[Tuple[Key, Optional[T]]]:
+    """Load IDS occurrences in a background thread, ahead of their consumer.
+
+    Args:
+        load: Function that loads an IDS occurrence and returns it together with its
+            estimated size in bytes
+        ids_list: IDS names and occurrences to load, in order
+        depth: Maximum number of IDS occurrences that are loaded ahead
+        max_nbytes: No new IDS occurrences are loaded ahead while the loaded but not
+            yet consumed IDSs exceed this number of bytes. IDSs that are still loading
+            count as the largest IDS loaded so far, or as max_nbytes before any IDS
+            has been loaded.
+
+    Yields:
+        IDS name and occurrence with the loaded IDS, in the order of ids_list
+    """
+    if depth < 1:
+        for ids_name, occurrence in ids_list:
+            yield (ids_name, occurrence), load(ids_name, occurrence)[0]
+        return
+
+    pending: Deque[Tuple[Key, Future]] = deque()
+    todo = iter(ids_list)
+    # Size of the largest IDS loaded so far, or None while no IDS has been loaded
+    largest_nbytes: Optional[int] = None
+
+    def nbytes(future: Future) -> int:
+        nonlocal largest_nbytes
+        if not future.done():
+            # The size of an IDS that is still loading is not known yet, assume it
+            # is as large as the largest IDS so far (or the whole budget)
+            return max_nbytes if largest_nbytes is None else largest_nbytes
+        if future.exception() is not None:
+            return 0
+        size = future.result()[1]
+        largest_nbytes = max(size, largest_nbytes or 0)
+        return size
+
+    def in_flight_nbytes() -> int:
+        return sum(nbytes(future) for _, future in pending)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        try:
+            while True:
+                while len(pending) <= depth and (
+                    not pending or in_flight_nbytes() < max_nbytes
+                ):
+                    key = next(todo, None)
+                    if key is None:
+                        break
+                    pending.append((key, executor.submit(load, *key)))
+                if not pending:
+                    return
+                key, future = pending.popleft()
+                ids, size = future.result()
+                largest_nbytes = max(size, largest_nbytes or 0)
+                yield key, ids
+        finally:
+            for _, future in pending:
+                future.cancel()
@@ -4,8 +4,9 @@ validation tool
 """
 
 import traceback
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
+from types import CodeType
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union, overload
 
 from imas_validator.rules.data import IDSValidationRule
 from imas_validator.validate_options import ValidateOptions
@@ -13,6 +14,103 @@ from imas_validator.validate_options import ValidateOptions
 NodesDict = Dict[Tuple[str, int], Set[str]]
 
 
+class LazyStackSummary(Sequence[traceback.FrameSummary]):
+    """Stack of traceback frames that is captured as code objects and line numbers.
+
+    The :py:class:`traceback.StackSummary` is only created when the frames are
+    accessed, e.g. when a report is generated, and source lines are only read when
+    the ``line`` of a frame is requested.
+    """
+
+    __slots__ = ("_frames", "_summary")
+
+    def __init__(self, frames: Sequence[Tuple[CodeType, int]]) -> None:
+        """Initialize LazyStackSummary
+
+        Args:
+            frames: Code objects and line numbers of the frames, outermost first
+        """
+        self._frames = frames
+        self._summary: Optional[traceback.StackSummary] = None
+
+    @property
+    def frames(self) -> Tuple[Tuple[CodeType, int], ...]:
+        """Code objects and line numbers of the frames, outermost first"""
+        return tuple(self._frames)
+
+    @property
+    def summary(self) -> traceback.StackSummary:
+        """StackSummary of the captured frames"""
+        if self._summary is None:
+            self._summary = traceback.StackSummary.from_list(
+                [
+                    traceback.FrameSummary(
+                        code.co_filename, lineno, code.co_name, lookup_line=False
+                    )
+                    for code, lineno in self._frames
+                ]
+            )
+        return self._summary
+
+    @overload
+    def __getitem__(self, index: int) -> traceback.FrameSummary: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[traceback.FrameSummary]: ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[traceback.FrameSummary, Sequence[traceback.FrameSummary]]:
+        return self.summary[index]
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def format(self) -> List[str]:
+        """Format the frames for printing, see
+        :py:meth:`traceback.StackSummary.format`"""
+        return self.summary.format()
+
+    def __getattr__(self, name: str) -> Any:
+        # Other attributes of StackSummary, e.g. format_frame_summary
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.summary, name)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyStackSummary):
+            other = other.summary
+        return self.summary == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __str__(self) -> str:
+        return str(self.summary)
+
+    def __repr__(self) -> str:
+        return repr(self.summary)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Code objects cannot be pickled, e.g. for parallel validation
+        return traceback.StackSummary.from_list, (list(self.summary),)
+
+
+Traceback = Union[traceback.StackSummary, LazyStackSummary]
+"""Stack of traceback frames of a result"""
+
+
+@dataclass
+class ElementFailures:
+    """Class for the elements of an array-valued assertion that failed"""
+
+    indices: List[Tuple[int, ...]]
+    """Indices of the first failed elements, in row-major order"""
+    count: int
+    """Number of failed elements"""
+    shape: Tuple[int, ...]
+    """Shape of the asserted array"""
+
+
 @dataclass
 class IDSValidationResult:
     """Class for storing data regarding IDS validation test results"""
@@ -25,8 +123,9 @@ class IDSValidationResult:
     """Rule to apply to IDS data"""
     idss: List[Tuple[str, int]]
     """Tuple of ids_names and occurrences"""
-    tb: traceback.StackSummary
-    """A stack of traceback frames"""
+    tb: Traceback
+    """A stack of traceback frames, LazyStackSummary provides the same interface as
+    traceback.StackSummary"""
     nodes_dict: NodesDict
     """
     Set of nodes that have contributed in this result, identified by a combination of
@@ -34,6 +133,18 @@ class IDSValidationResult:
     """
     exc: Optional[Exception] = None
     """Exception that was encountered while running validation test"""
+    count: int = 1
+    """Number of assertions represented by this result. Passing assertions of the
+    same rule, source location and IDSs are counted in a single result when
+    :py:attr:`~imas_validator.validate_options.ValidateOptions.aggregate_passes` is
+    enabled."""
+    cached: bool = False
+    """Whether or not this result was reused from the result cache instead of
+    executing the rule, see
+    :py:attr:`~imas_validator.validate_options.ValidateOptions.cache_dir`"""
+    element_failures: Optional[ElementFailures] = None
+    """Elements that failed when the asserted expression is an array, e.g. a
+    comparison of array nodes, ``Approx`` or ``Increasing``"""
 
 
 @dataclass
@@ -49,17 +160,51 @@ class CoverageMap:
 
 
 CoverageDict = Dict[Tuple[str, int], CoverageMap]
+# cProfile statistics per rule name and IDS occurrences, in the format of
+# pstats.Stats.stats
+RuleCallStats = Dict[Tuple[str, Tuple[Tuple[str, int], ...]], Dict[Any, Any]]
+
+
+@dataclass
+class RuleProfile:
+    """Class for the resources used by a rule on its IDS occurrences"""
+
+    rule_name: str
+    """Name of the rule"""
+    idss: List[Tuple[str, int]]
+    """Tuple of ids_names and occurrences"""
+    wall_time: float = 0.0
+    """Wall time in seconds of executing the rule"""
+    cpu_time: float = 0.0
+    """CPU time in seconds of executing the rule"""
+    peak_memory: int = 0
+    """Peak in bytes of the memory allocated while executing the rule, as traced by
+    :py:mod:`tracemalloc`"""
+    num_assertions: int = 0
+    """Number of assertions of the rule"""
+    load_time: float = 0.0
+    """Time in seconds of loading the IDSs, which are shared by all rules that
+    apply to them"""
 
 
 @dataclass
 class IDSValidationResultCollection:
     """Class for collection of all results of validation run"""
 
-    results: List[IDSValidationResult]
-    """List of result objects"""
+    results: Sequence[IDSValidationResult]
+    """List of result objects, or a
+    :py:class:`~imas_validator.validate.result_store.ColumnarResultStore` when
+    :py:attr:`~imas_validator.validate_options.ValidateOptions.columnar_results` is
+    enabled"""
     coverage_dict: CoverageDict
     """Dict with number of filled, visited and overlapping nodes per ids/occ"""
     validate_options: ValidateOptions
     """Options which with validation run was started"""
     imas_uri: str
     """URI of dbentry being tested"""
+    rule_profiles: List[RuleProfile] = field(default_factory=list)
+    """Resources used per rule and IDS occurrences, when
+    :py:attr:`~imas_validator.validate_options.ValidateOptions.profile` is enabled"""
+    rule_call_stats: RuleCallStats = field(default_factory=dict)
+    """cProfile statistics per rule and IDS occurrences of the rules that match
+    :py:attr:`~imas_validator.validate_options.ValidateOptions.profile_rules`"""
@@ -0,0 +1,238 @@
+"""
+This file describes the persistent result cache, which stores the results of IDS
+occurrences so they are reused when neither the data nor the rules have changed
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from types import CodeType
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import imas  # type: ignore
+import numpy
+
+import imas_validator
+from imas_validator.rules.data import IDSValidationRule
+from imas_validator.validate.result import IDSValidationResult
+from imas_validator.validate.result_sink import decode_result, encode_result
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """Directory of cached results, addressed by a hash of everything that determines
+    them.
+
+    Every entry is a JSON Lines file with the results of an IDS occurrence, in the
+    same format as a results file. The modification time of an entry is updated when
+    it is used, so entries that were not used for a while can be pruned.
+    """
+
+    def __init__(self, cache_dir: Path) -> None:
+        """Initialize ResultCache
+
+        Args:
+            cache_dir: Directory of the cache, created when the first entry is stored
+        """
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.jsonl"
+
+    def get(
+        self, key: str, rules: Dict[str, IDSValidationRule]
+    ) -> Optional[List[IDSValidationResult]]:
+        """Return the cached results of a key
+
+        Args:
+            key: Key of the entry
+            rules: Rules of the results by name
+
+        Returns:
+            Results marked as cached, or None when the key is not in the cache
+        """
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as file:
+                records = [json.loads(line) for line in file]
+            results = [decode_result(record, rules) for record in records]
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            logger.warning(f"Ignoring invalid result cache entry {path}: {e}")
+            return None
+        os.utime(path)
+        for result in results:
+            result.cached = True
+        return results
+
+    def put(self, key: str, results: Iterable[IDSValidationResult]) -> None:
+        """Store results under a key
+
+        The entry is written to a temporary file that replaces the entry when it is
+        complete, so concurrent validation runs never read partial entries.
+
+        Args:
+            key: Key of the entry
+            results: Results to store
+        """
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                for index, result in enumerate(results):
+                    file.write(encode_result(index, result) + "\n")
+            os.replace(tmp_name, path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+    def prune(self, max_age: float = 0.0) -> int:
+        """Remove entries that were not used recently
+
+        Args:
+            max_age: Entries that were not used in this many seconds are removed, all
+                entries are removed when 0
+
+        Returns:
+            Number of removed entries
+        """
+        if not self.cache_dir.is_dir():
+            return 0
+        threshold = time.time() - max_age
+        removed = 0
+        for path in self.cache_dir.glob("*/*.jsonl"):
+            if max_age <= 0 or path.stat().st_mtime < threshold:
+                path.unlink()
+                removed += 1
+        logger.info(f"Removed {removed} entries from result cache {self.cache_dir}")
+        return removed
+
+
+def cache_key(*parts: Any) -> str:
+    """Combine the validator version and JSON serializable parts into a cache key"""
+    data = json.dumps([imas_validator.__version__, *parts])
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def rule_fingerprint(rule: IDSValidationRule) -> str:
+    """Return a hash of the source file and rewritten bytecode of a rule
+
+    The source file also covers helper functions that are defined next to the rule,
+    and the line numbers that end up in the tracebacks of the results.
+
+    Args:
+        rule: Rule to hash
+    """
+    fingerprint = hashlib.sha256()
+    code = rule.func.__code__
+    try:
+        fingerprint.update(Path(code.co_filename).read_bytes())
+    except OSError:
+        fingerprint.update(code.co_filename.encode("utf-8"))
+    _update_code_hash(fingerprint, code)
+    fingerprint.update(
+        repr(
+            (rule.name, rule.ids_names, rule.ids_occs, rule.version, rule.kwfields)
+        ).encode("utf-8")
+    )
+    return fingerprint.hexdigest()
+
+
+def _update_code_hash(fingerprint: Any, code: CodeType) -> None:
+    fingerprint.update(code.co_code)
+    fingerprint.update(
+        repr(
+            (
+                code.co_name,
+                code.co_names,
+                code.co_varnames,
+                code.co_freevars,
+                code.co_cellvars,
+                code.co_firstlineno,
+            )
+        ).encode("utf-8")
+    )
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            _update_code_hash(fingerprint, const)
+        else:
+            fingerprint.update(repr(const).encode("utf-8"))
+
+
+def ids_file_fingerprint(uri: str, ids_name: str) -> Optional[str]:
+    """Return a hash of the metadata of the backend files that store an IDS
+
+    The size and modification time of the files are hashed, so the IDS does not need
+    to be read. This only works for backends that store data entries in local files,
+    e.g. HDF5 or netCDF.
+
+    Args:
+        uri: URI of the data entry
+        ids_name: Name of the IDS
+
+    Returns:
+        The hash, or None when the files of the data entry cannot be determined
+    """
+    path = _entry_path(uri)
+    if path is None:
+        return None
+    if path.is_file():
+        files = [path]
+    elif path.is_dir():
+        files = sorted({*path.glob(f"{ids_name}*"), *path.glob("master*")})
+        if not files:
+            files = sorted(file for file in path.iterdir() if file.is_file())
+    else:
+        return None
+    if not files:
+        return None
+    fingerprint = hashlib.sha256()
+    for file in files:
+        stat = file.stat()
+        fingerprint.update(
+            repr((str(file.resolve()), stat.st_size, stat.st_mtime_ns)).encode("utf-8")
+        )
+    return fingerprint.hexdigest()
+
+
+def _entry_path(uri: str) -> Optional[Path]:
+    """Return the local path of a data entry, or None if it is not stored locally"""
+    if not uri.startswith("imas:"):
+        # Plain file paths, e.g. of netCDF files
+        return Path(uri)
+    query = urlsplit(uri).query
+    for option in query.replace("&", ";").split(";"):
+        name, _, value = option.partition("=")
+        if name == "path":
+            return Path(value)
+    return None
+
+
+def ids_content_fingerprint(ids: imas.ids_toplevel.IDSToplevel) -> str:
+    """Return a hash of the DD version and all filled nodes of an IDS
+
+    Args:
+        ids: Loaded IDS
+    """
+    fingerprint = hashlib.sha256()
+    fingerprint.update(ids._dd_version.encode("utf-8"))
+
+    def update(node: Any) -> None:
+        fingerprint.update(node._path.encode("utf-8"))
+        value = node.value
+        if isinstance(value, numpy.ndarray):
+            fingerprint.update(repr((value.dtype.str, value.shape)).encode("utf-8"))
+            fingerprint.update(numpy.ascontiguousarray(value).tobytes())
+        else:
+            fingerprint.update(repr(value).encode("utf-8"))
+
+    imas.util.visit_children(update, ids, leaf_only=True, visit_empty=False)
+    return fingerprint.hexdigest()
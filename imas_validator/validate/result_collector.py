@@ -4,25 +4,45 @@ validation tool
 """
 
 import logging
+import sys
 import traceback
-from typing import Any, List, Tuple
+from types import FrameType
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 import imas  # type: ignore
+import numpy
 
 from imas_validator.exceptions import InternalValidateDebugException
 from imas_validator.rules.data import IDSValidationRule
-from imas_validator.validate.ids_wrapper import IDSWrapper
+from imas_validator.validate.ids_wrapper import IDSWrapper, iter_provenance
 from imas_validator.validate.result import (
     CoverageDict,
     CoverageMap,
+    ElementFailures,
     IDSValidationResult,
     IDSValidationResultCollection,
+    LazyStackSummary,
     NodesDict,
+    RuleCallStats,
+    RuleProfile,
 )
+from imas_validator.validate.result_sink import (
+    CheckpointKey,
+    JSONLinesResultSink,
+    results_file_path,
+)
+from imas_validator.validate.result_store import ColumnarResultStore
+from imas_validator.validate.rule_profile import RuleCallProfiler, RuleProfiler
+from imas_validator.validate.time_windows import remap_path
+from imas_validator.validate.traversal_cache import active_traversal_cache
 from imas_validator.validate_options import ValidateOptions
 
 logger = logging.getLogger(__name__)
 
+MAX_ELEMENT_FAILURES = 10
+"""Number of failed elements of an array-valued assertion of which the indices are
+stored in the result"""
+
 
 class ResultCollector:
     """Class for storing IDSValidationResult objects"""
@@ -38,11 +58,41 @@ class ResultCollector:
         Args:
             validate_options: Dataclass for validate options
         """
-        self.results: List[IDSValidationResult] = []
         self.validate_options = validate_options
         self.imas_uri = imas_uri
+        self.results = self._new_results()
+        self.num_results = 0
+        """Number of results, including aggregated passing assertions"""
+        # Index and aggregated passing result per rule, source location and IDSs
+        self._aggregates: Dict[Tuple[Any, ...], Tuple[int, IDSValidationResult]] = {}
+        # Aggregates that changed since they were stored, see store_aggregates
+        self._changed_aggregates: Set[Tuple[Any, ...]] = set()
         self.visited_nodes_dict: NodesDict = {}
         self.filled_nodes_dict: NodesDict = {}
+        # Lazy loaded IDSs of which the filled nodes are not collected yet
+        self._lazy_idss: Dict[Tuple[str, int], imas.ids_toplevel.IDSToplevel] = {}
+        self.time_slice_offset = 0
+        """Index of the first time slice when the current IDSs are a window of time
+        slices, node paths are converted to paths in the full IDS"""
+        # Time slice offsets of which the filled nodes are collected, per IDS
+        self._filled_offsets: Dict[Tuple[str, int], Set[int]] = {}
+        # Coverage changes since the last checkpoint, when results are written to a
+        # results file
+        self._visited_changes: Optional[NodesDict] = None
+        self._filled_changes: Optional[NodesDict] = None
+        # Results that are added while recording, see start_recording
+        self._recorded: Optional[List[IDSValidationResult]] = None
+        self.rule_profiler = self._new_rule_profiler()
+        """Profiler of the rules, when profiling is enabled"""
+        self.rule_call_profiler = self._new_rule_call_profiler()
+        """cProfile profiler of the rules that match the profile_rules pattern"""
+        if isinstance(self.results, JSONLinesResultSink):
+            checkpoint = self.results.checkpoint
+            self.visited_nodes_dict = checkpoint.visited_nodes_dict
+            self.filled_nodes_dict = checkpoint.filled_nodes_dict
+            self._filled_offsets = {key: set() for key in self.filled_nodes_dict}
+            self._visited_changes = {}
+            self._filled_changes = {}
 
     def set_context(
         self,
@@ -60,6 +110,7 @@ class ResultCollector:
             raise NotImplementedError(
                 "Two occurrence of one IDS in a single validation rule is not supported"
             )
+        self.store_aggregates()
         self._current_rule = rule
         self._current_idss = idss
 
@@ -84,7 +135,8 @@ class ResultCollector:
             {},
             exc=exc,
         )
-        self.results.append(result)
+        self._append_result(result)
+        self.num_results += 1
         self.append_nodes_dict({}, self._current_idss)
 
     def assert_(self, test: Any, msg: str = "") -> None:
@@ -96,38 +148,209 @@ class ResultCollector:
             test: Expression to evaluate in test
             msg: Given message for failed assertion
         """
-        tb = traceback.extract_stack()
-        # pop last stack frame so that new last frame is inside validation test
-        tb.pop()
-        if isinstance(test, IDSWrapper):
-            nodes_dict = self.create_nodes_dict(test._ids_nodes)
+        frame = sys._getframe(1)
+        res_bool = bool(test)
+        self.num_results += 1
+        aggregate = res_bool and self.validate_options.aggregate_passes
+        if isinstance(test, IDSWrapper) and (
+            self.validate_options.track_node_dict
+            or (self.validate_options.node_report and not aggregate)
+        ):
+            nodes_dict = self.create_nodes_dict(iter_provenance(test._provenance))
         else:
             nodes_dict = {}
-        res_bool = bool(test)
-        result = IDSValidationResult(
-            res_bool,
+        idss = [(x[1], x[2]) for x in self._current_idss]
+        if aggregate:
+            key = (self._current_rule, frame.f_code, frame.f_lineno, *idss)
+            aggregate_entry = self._aggregates.get(key)
+            if aggregate_entry is not None:
+                result = aggregate_entry[1]
+                result.count += 1
+                self._changed_aggregates.add(key)
+                for ids_key, nodes in nodes_dict.items():
+                    result.nodes_dict.setdefault(ids_key, set()).update(nodes)
+            else:
+                # Copy the sets, the nodes of later passes are added to them
+                nodes_copy = {
+                    ids_key: set(nodes) for ids_key, nodes in nodes_dict.items()
+                }
+                result = self._create_result(res_bool, msg, idss, frame, nodes_copy)
+                self._aggregates[key] = (len(self.results), result)
+                self._append_result(result)
+        else:
+            result = self._create_result(res_bool, msg, idss, frame, nodes_dict)
+            if not res_bool:
+                result.element_failures = find_element_failures(test)
+            self._append_result(result)
+        if self.validate_options.track_node_dict:
+            self.append_nodes_dict(nodes_dict, self._current_idss)
+        # raise exception for debugging traceback
+        if self.validate_options.use_pdb and not res_bool:
+            raise InternalValidateDebugException()
+
+    def _append_result(self, result: IDSValidationResult) -> None:
+        self.results.append(result)
+        if self._recorded is not None:
+            self._recorded.append(result)
+
+    def start_recording(self) -> None:
+        """Start keeping the results that are added, e.g. to store them in the
+        result cache when all rules are applied to an IDS occurrence"""
+        self._recorded = []
+
+    def stop_recording(self) -> List[IDSValidationResult]:
+        """Stop keeping the results that are added
+
+        Returns:
+            Results that were added since :py:meth:`start_recording`. Aggregated
+            results include the assertions that were counted after they were added.
+        """
+        recorded = self._recorded or []
+        self._recorded = None
+        return recorded
+
+    def add_cached_results(self, results: Iterable[IDSValidationResult]) -> None:
+        """Add results that were reused from the result cache
+
+        Args:
+            results: Results of earlier validation runs
+        """
+        for result in results:
+            self._append_result(result)
+            self.num_results += result.count
+
+    def _create_result(
+        self,
+        success: bool,
+        msg: str,
+        idss: List[Tuple[str, int]],
+        frame: FrameType,
+        nodes_dict: NodesDict,
+    ) -> IDSValidationResult:
+        # Only capture the frame inside the validation test, without reading the
+        # source: extracting the full stack is expensive for every assertion
+        tb = LazyStackSummary([(frame.f_code, frame.f_lineno)])
+        return IDSValidationResult(
+            success,
             msg,
             self._current_rule,
-            [(x[1], x[2]) for x in self._current_idss],
+            idss,
             tb,
             nodes_dict,
             exc=None,
         )
-        self.results.append(result)
-        if self.validate_options.track_node_dict:
-            self.append_nodes_dict(nodes_dict, self._current_idss)
-        # raise exception for debugging traceback
-        if self.validate_options.use_pdb and not res_bool:
-            raise InternalValidateDebugException()
+
+    def _new_results(
+        self,
+    ) -> Union[List[IDSValidationResult], ColumnarResultStore, JSONLinesResultSink]:
+        if self.validate_options.results_dir is not None:
+            return JSONLinesResultSink(
+                results_file_path(self.validate_options.results_dir, self.imas_uri),
+                resume=self.validate_options.resume,
+            )
+        if self.validate_options.columnar_results:
+            return ColumnarResultStore()
+        return []
+
+    def _new_rule_profiler(self) -> Optional[RuleProfiler]:
+        return RuleProfiler() if self.validate_options.profile else None
+
+    def _new_rule_call_profiler(self) -> Optional[RuleCallProfiler]:
+        pattern = self.validate_options.profile_rules
+        return None if pattern is None else RuleCallProfiler(pattern)
+
+    def rule_call_stats(self) -> RuleCallStats:
+        """Return the cProfile statistics per rule and IDS occurrences, or an empty
+        dict when no rules are profiled"""
+        if self.rule_call_profiler is None:
+            return {}
+        return self.rule_call_profiler.stats
+
+    def rule_profiles(self) -> List[RuleProfile]:
+        """Return the resources used per rule and IDS occurrences, or an empty list
+        when profiling is disabled"""
+        if self.rule_profiler is None:
+            return []
+        return self.rule_profiler.profiles
+
+    def store_aggregates(self) -> None:
+        """
+        Write the aggregated passing results that changed to the columnar result store
+        or results file, which keep a copy of the data of a result when it is added
+        """
+        if not isinstance(self.results, list):
+            for key in self._changed_aggregates:
+                index, result = self._aggregates[key]
+                self.results[index] = result
+        self._changed_aggregates = set()
+
+    def is_completed(self, key: CheckpointKey) -> bool:
+        """Return whether work was completed by the interrupted run that is resumed
+
+        Args:
+            key: Key of the work, e.g. a rule and the IDS occurrences it applies to
+        """
+        return (
+            isinstance(self.results, JSONLinesResultSink)
+            and key in self.results.checkpoint.completed
+        )
+
+    def mark_completed(self, key: CheckpointKey) -> None:
+        """Write a checkpoint to the results file after work is completed, so a run
+        that is interrupted later can be resumed from it
+
+        Args:
+            key: Key of the work, e.g. a rule and the IDS occurrences it applies to
+        """
+        if not isinstance(self.results, JSONLinesResultSink):
+            return
+        self.store_aggregates()
+        self.results.write_checkpoint(key, self._visited_changes, self._filled_changes)
+        self._visited_changes = {}
+        self._filled_changes = {}
+
+    def merge_coverage(
+        self, visited_nodes_dict: NodesDict, filled_nodes_dict: NodesDict
+    ) -> None:
+        """
+        Add visited and filled nodes that were collected elsewhere, e.g. by a worker
+        process
+
+        Args:
+            visited_nodes_dict: Visited nodes per IDS occurrence
+            filled_nodes_dict: Filled nodes per IDS occurrence
+        """
+        for target, changes, source in [
+            (self.visited_nodes_dict, self._visited_changes, visited_nodes_dict),
+            (self.filled_nodes_dict, self._filled_changes, filled_nodes_dict),
+        ]:
+            for key, nodes in source.items():
+                target.setdefault(key, set()).update(nodes)
+                if changes is not None:
+                    changes.setdefault(key, set()).update(nodes)
+
+    def reset(self) -> None:
+        """Remove all results and node dicts, e.g. to validate another IDS"""
+        self.results = self._new_results()
+        self.num_results = 0
+        self._aggregates = {}
+        self._changed_aggregates = set()
+        self.visited_nodes_dict = {}
+        self.filled_nodes_dict = {}
+        self._filled_offsets = {}
+        self._lazy_idss = {}
+        self._recorded = None
+        self.rule_profiler = self._new_rule_profiler()
+        self.rule_call_profiler = self._new_rule_call_profiler()
 
     def create_nodes_dict(
-        self, ids_nodes: List[imas.ids_primitive.IDSPrimitive]
+        self, ids_nodes: Iterable[imas.ids_primitive.IDSPrimitive]
     ) -> NodesDict:
         """
         Create dict with list of touched nodes for the IDSValidationResult object
 
         Args:
-            ids_nodes: List of IDSPrimitive nodes that have been touched in this test
+            ids_nodes: IDSPrimitive nodes that have been touched in this test
         """
         nodes_dict: NodesDict = {
             (name, occ): set() for _, name, occ in self._current_idss
@@ -136,7 +359,9 @@ class ResultCollector:
         for node in ids_nodes:
             ids_name = node._toplevel.metadata.name
             ids_result = nodes_dict[occ_dict[ids_name]]
-            ids_result.add(node._path)
+            ids_result.add(
+                remap_path(node._toplevel.metadata, node._path, self.time_slice_offset)
+            )
         return nodes_dict
 
     def append_nodes_dict(
@@ -155,22 +380,68 @@ class ResultCollector:
             if key not in self.visited_nodes_dict.keys():
                 self.visited_nodes_dict[key] = set()
             self.visited_nodes_dict[key] |= value
+            if self._visited_changes is not None:
+                self._visited_changes.setdefault(key, set()).update(value)
         for ids_instance, name, occ in idss:
             key = (name, occ)
             if key not in self.filled_nodes_dict.keys():
                 self.filled_nodes_dict[key] = set()
-                imas.util.visit_children(
-                    lambda node: self.filled_nodes_dict[key].add(node._path),
-                    ids_instance,
-                    leaf_only=True,
-                    visit_empty=False,
-                )
+                self._filled_offsets[key] = set()
+                if self._filled_changes is not None:
+                    self._filled_changes.setdefault(key, set())
+            if self.time_slice_offset in self._filled_offsets[key]:
+                continue
+            self._filled_offsets[key].add(self.time_slice_offset)
+            if ids_instance._lazy:
+                # Data is still loaded by later rules, collect it when done
+                self._lazy_idss[key] = ids_instance
+            else:
+                self._add_filled_nodes(key, ids_instance, self.time_slice_offset)
+
+    def collect_filled_nodes(self) -> None:
+        """
+        Add the filled nodes of lazy loaded IDSs to filled_nodes_dict. Only nodes that
+        have been loaded while executing the rules are taken into account, so the IDSs
+        are never fully loaded for node coverage.
+        """
+        for key, ids_instance in self._lazy_idss.items():
+            self._add_filled_nodes(key, ids_instance)
+            # Collect the nodes again when later rules use the IDS, e.g. when it is a
+            # cached argument of a multi-IDS rule
+            self._filled_offsets[key].discard(0)
+        self._lazy_idss = {}
+
+    def _add_filled_nodes(
+        self,
+        key: Tuple[str, int],
+        ids_instance: imas.ids_toplevel.IDSToplevel,
+        time_slice_offset: int = 0,
+    ) -> None:
+        metadata = ids_instance.metadata
+        cache = active_traversal_cache()
+        if cache is not None and not ids_instance._lazy:
+            # Share the traversal with the Select queries of the rules
+            nodes = cache.filled_nodes(ids_instance)
+        else:
+            nodes = []
+            imas.util.visit_children(
+                nodes.append,
+                ids_instance,
+                leaf_only=True,
+                visit_empty=False,
+                accept_lazy=True,
+            )
+        paths = {remap_path(metadata, node._path, time_slice_offset) for node in nodes}
+        self.filled_nodes_dict[key] |= paths
+        if self._filled_changes is not None:
+            self._filled_changes.setdefault(key, set()).update(paths)
 
     def coverage_dict(self) -> CoverageDict:
         """
         Return a dictionary of IDSs showing how many nodes per IDS are covered in
         different categories
         """
+        self.collect_filled_nodes()
         coverage_dict: CoverageDict = {}
         visited_nodes_dict = self.visited_nodes_dict
         filled_nodes_dict = self.filled_nodes_dict
@@ -186,13 +457,58 @@ class ResultCollector:
             )
         return coverage_dict
 
-    def result_collection(self) -> IDSValidationResultCollection:
+    def result_collection(
+        self, rules: Iterable[IDSValidationRule] = ()
+    ) -> IDSValidationResultCollection:
         """
         Return object detailing the final results of validation process
+
+        Args:
+            rules: Loaded rules, which are needed to read the results that a resumed
+                run has written to the results file
         """
+        self.store_aggregates()
+        results = self.results
+        if isinstance(results, JSONLinesResultSink):
+            results.close()
+            results = results.read(rules)
         return IDSValidationResultCollection(
-            results=self.results,
+            results=results,
             coverage_dict=self.coverage_dict(),
             validate_options=self.validate_options,
             imas_uri=self.imas_uri,
+            rule_profiles=self.rule_profiles(),
+            rule_call_stats=self.rule_call_stats(),
         )
+
+
+def find_element_failures(
+    test: Any, max_indices: int = MAX_ELEMENT_FAILURES
+) -> Optional[ElementFailures]:
+    """Return the elements that failed in an array-valued assertion
+
+    Args:
+        test: Expression of the assertion, which is an array or the result of a
+            helper that keeps its elementwise results
+        max_indices: Maximum number of indices of failed elements to return
+
+    Returns:
+        The failed elements, or None when the expression is not a numeric array
+    """
+    if isinstance(test, IDSWrapper):
+        # Helpers such as Approx return a boolean and keep their elementwise results
+        if test._element_results is not None:
+            test = test._element_results
+        else:
+            test = test._obj
+    if not isinstance(test, numpy.ndarray) or test.ndim == 0:
+        return None
+    if test.dtype.kind not in "biuf":
+        return None
+    failed = numpy.flatnonzero(numpy.logical_not(test))
+    indices = numpy.unravel_index(failed[:max_indices], test.shape)
+    return ElementFailures(
+        indices=list(zip(*(axis.tolist() for axis in indices))),
+        count=len(failed),
+        shape=test.shape,
+    )
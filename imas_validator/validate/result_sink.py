@@ -0,0 +1,368 @@
+"""
+This file describes the result sink, which writes the results of a validation run to
+a JSON Lines file while they are produced
+"""
+
+import json
+import logging
+import traceback
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from imas_validator.rules.data import IDSValidationRule
+from imas_validator.validate.result import (
+    ElementFailures,
+    IDSValidationResult,
+    NodesDict,
+)
+from imas_validator.validate.result_store import ColumnarResultStore
+
+logger = logging.getLogger(__name__)
+
+# Identifies completed work, e.g. a rule that was applied to IDS occurrences
+CheckpointKey = Tuple[Any, ...]
+
+
+def results_file_path(results_dir: Path, imas_uri: str) -> Path:
+    """Return the path of the results file of a data entry
+
+    Args:
+        results_dir: Directory with results files
+        imas_uri: url of the data entry
+    """
+    return Path(results_dir) / f"{imas_uri.replace('/', '|')}.jsonl"
+
+
+@dataclass
+class Checkpoint:
+    """State of an interrupted validation run at its last checkpoint"""
+
+    completed: Set[CheckpointKey] = field(default_factory=set)
+    """Keys of the completed work"""
+    num_results: int = 0
+    """Number of results that were produced by the completed work"""
+    visited_nodes_dict: NodesDict = field(default_factory=dict)
+    """Visited nodes of the completed work"""
+    filled_nodes_dict: NodesDict = field(default_factory=dict)
+    """Filled nodes of the completed work"""
+    position: int = 0
+    """Position in bytes in the results file after the last checkpoint"""
+
+
+class JSONLinesResultSink:
+    """Append-only JSON Lines file to which results are written as they are produced.
+
+    Every line holds a result and its index in the order in which the results were
+    produced. A result that changes after it was written, e.g. an aggregated result
+    of passing assertions, is written again with the same index: the last line of an
+    index takes precedence. Lines are buffered and written in batches, the file is
+    created when the first batch is written.
+
+    Checkpoint lines record which work is completed, together with the coverage of
+    that work. A validation run that was interrupted is resumed from the last
+    checkpoint: the lines after it are removed, and new lines are appended.
+    """
+
+    def __init__(
+        self, path: Path, batch_size: int = 1000, resume: bool = False
+    ) -> None:
+        """Initialize JSONLinesResultSink
+
+        Args:
+            path: Path of the JSON Lines file
+            batch_size: Number of lines that are buffered before writing them
+            resume: Whether to continue an existing file from its last checkpoint,
+                instead of overwriting it
+        """
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self._file: Optional[IO[str]] = None
+        self._buffer: List[str] = []
+        self._num_results = 0
+        # Rules of the written results, to convert them back into result objects
+        self._rules: Dict[str, IDSValidationRule] = {}
+        self.checkpoint = Checkpoint()
+        """State at the last checkpoint of the resumed file"""
+        self._append = resume and self.path.exists()
+        if self._append:
+            self.checkpoint = read_checkpoint(self.path)
+            self._num_results = self.checkpoint.num_results
+            with open(self.path, "r+b") as file:
+                file.truncate(self.checkpoint.position)
+            logger.info(
+                f"Resuming from {self.path}: {len(self.checkpoint.completed)} "
+                f"completed steps, {self._num_results} results"
+            )
+
+    def __len__(self) -> int:
+        return self._num_results
+
+    def append(self, result: IDSValidationResult) -> None:
+        """Write a result
+
+        Args:
+            result: Result to write
+        """
+        self._write(self._num_results, result)
+        self._num_results += 1
+
+    def extend(self, results: Iterable[IDSValidationResult]) -> None:
+        """Write results
+
+        Args:
+            results: Results to write
+        """
+        for result in results:
+            self.append(result)
+
+    def __setitem__(self, index: int, result: IDSValidationResult) -> None:
+        """Write a new version of a result that was written before
+
+        Args:
+            index: Index of the result
+            result: New version of the result
+        """
+        self._write(range(self._num_results)[index], result)
+
+    def _write(self, index: int, result: IDSValidationResult) -> None:
+        self._rules.setdefault(result.rule.name, result.rule)
+        self._buffer.append(encode_result(index, result) + "\n")
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered lines to the file"""
+        if self._file is not None and not self._buffer:
+            return
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            mode = "a" if self._append else "w"
+            self._file = open(self.path, mode, encoding="utf-8")
+        self._file.write("".join(self._buffer))
+        self._file.flush()
+        self._buffer = []
+
+    def write_checkpoint(
+        self,
+        key: CheckpointKey,
+        visited_nodes_dict: Optional[NodesDict] = None,
+        filled_nodes_dict: Optional[NodesDict] = None,
+    ) -> None:
+        """Record that work is completed, and write all buffered lines
+
+        Args:
+            key: Key of the completed work
+            visited_nodes_dict: Nodes visited by the work
+            filled_nodes_dict: Filled nodes found by the work
+        """
+        if visited_nodes_dict or filled_nodes_dict:
+            coverage = {
+                "visited": _encode_nodes_dict(visited_nodes_dict or {}),
+                "filled": _encode_nodes_dict(filled_nodes_dict or {}),
+            }
+            self._buffer.append(json.dumps({"coverage": coverage}) + "\n")
+        checkpoint = {"checkpoint": key, "num_results": self._num_results}
+        self._buffer.append(json.dumps(checkpoint) + "\n")
+        self.flush()
+
+    def close(self) -> None:
+        """Write the buffered lines and close the file"""
+        self.flush()
+        assert self._file is not None
+        self._file.close()
+
+    def read(self, rules: Iterable[IDSValidationRule] = ()) -> ColumnarResultStore:
+        """Write the buffered lines and read all results from the file
+
+        Args:
+            rules: Rules of results that were not written by this sink
+        """
+        self.flush()
+        return read_results(self.path, [*self._rules.values(), *rules])
+
+
+def encode_result(index: int, result: IDSValidationResult) -> str:
+    """Convert a result into a line of a results file
+
+    Args:
+        index: Index of the result
+        result: Result to convert
+    """
+    exc = result.exc
+    return json.dumps(
+        {
+            "index": index,
+            "rule": result.rule.name,
+            "success": result.success,
+            "msg": result.msg,
+            "idss": result.idss,
+            "tb": [[frame.filename, frame.lineno, frame.name] for frame in result.tb],
+            "nodes": _encode_nodes_dict(result.nodes_dict),
+            "exc": None if exc is None else f"{type(exc).__name__}: {exc}",
+            "count": result.count,
+            "cached": result.cached,
+            "element_failures": _encode_element_failures(result.element_failures),
+        }
+    )
+
+
+def _encode_nodes_dict(nodes_dict: NodesDict) -> List[Any]:
+    return [
+        [ids_name, occurrence, sorted(paths)]
+        for (ids_name, occurrence), paths in nodes_dict.items()
+    ]
+
+
+def _decode_nodes_dict(encoded: List[Any]) -> NodesDict:
+    return {
+        (ids_name, occurrence): set(paths) for ids_name, occurrence, paths in encoded
+    }
+
+
+def _encode_element_failures(
+    element_failures: Optional[ElementFailures],
+) -> Optional[Dict[str, Any]]:
+    if element_failures is None:
+        return None
+    return {
+        "indices": element_failures.indices,
+        "count": element_failures.count,
+        "shape": element_failures.shape,
+    }
+
+
+def _decode_element_failures(
+    encoded: Optional[Dict[str, Any]],
+) -> Optional[ElementFailures]:
+    if encoded is None:
+        return None
+    return ElementFailures(
+        indices=[tuple(index) for index in encoded["indices"]],
+        count=encoded["count"],
+        shape=tuple(encoded["shape"]),
+    )
+
+
+def decode_result(
+    record: Dict[str, Any], rules: Dict[str, IDSValidationRule]
+) -> IDSValidationResult:
+    """Convert a line of a results file back into a result
+
+    Args:
+        record: Decoded JSON of the line
+        rules: Rules by name
+
+    Returns:
+        Result, of which a stored exception is represented by a RuntimeError
+    """
+    rule = rules.get(record["rule"])
+    if rule is None:
+        raise ValueError(f"Rule {record['rule']!r} of stored result was not loaded")
+    nodes_dict = _decode_nodes_dict(record["nodes"])
+    tb = traceback.StackSummary.from_list(
+        [
+            traceback.FrameSummary(filename, lineno, name, lookup_line=False)
+            for filename, lineno, name in record["tb"]
+        ]
+    )
+    exc = record["exc"]
+    return IDSValidationResult(
+        record["success"],
+        record["msg"],
+        rule,
+        [(ids_name, occurrence) for ids_name, occurrence in record["idss"]],
+        tb,
+        nodes_dict,
+        exc=None if exc is None else RuntimeError(exc),
+        count=record["count"],
+        cached=record.get("cached", False),
+        element_failures=_decode_element_failures(record.get("element_failures")),
+    )
+
+
+def iter_results(
+    path: Path, rules: Iterable[IDSValidationRule]
+) -> Iterator[Tuple[int, IDSValidationResult]]:
+    """Read the lines of a results file one by one
+
+    A last line that was not completely written, e.g. because validation was
+    interrupted, is skipped.
+
+    Args:
+        path: Path of the JSON Lines file
+        rules: Rules of the stored results
+
+    Yields:
+        Index and result of every line
+    """
+    rules_by_name: Dict[str, IDSValidationRule] = {}
+    for rule in rules:
+        rules_by_name.setdefault(rule.name, rule)
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if not line.endswith("\n"):
+                logger.warning(f"Skipping incomplete last line of {path}")
+                break
+            record = json.loads(line)
+            if "index" in record:
+                yield record["index"], decode_result(record, rules_by_name)
+
+
+def read_results(path: Path, rules: Iterable[IDSValidationRule]) -> ColumnarResultStore:
+    """Read the results of a results file into a columnar result store
+
+    Results are added to the store line by line, so the results file is never loaded
+    as a whole.
+
+    Args:
+        path: Path of the JSON Lines file
+        rules: Rules of the stored results
+    """
+    store = ColumnarResultStore()
+    for index, result in iter_results(path, rules):
+        if index < len(store):
+            store[index] = result
+        else:
+            store.append(result)
+    return store
+
+
+def read_checkpoint(path: Path) -> Checkpoint:
+    """Read the state at the last checkpoint of a results file
+
+    Args:
+        path: Path of the JSON Lines file
+    """
+    checkpoint = Checkpoint()
+    # Coverage lines belong to the next checkpoint
+    pending_coverage: List[Dict[str, Any]] = []
+    position = 0
+    with open(path, "rb") as file:
+        for line in file:
+            position += len(line)
+            if not line.endswith(b"\n"):
+                break
+            record = json.loads(line)
+            if "coverage" in record:
+                pending_coverage.append(record["coverage"])
+            elif "checkpoint" in record:
+                checkpoint.completed.add(_to_tuple(record["checkpoint"]))
+                checkpoint.num_results = record["num_results"]
+                checkpoint.position = position
+                for coverage in pending_coverage:
+                    for name, target in [
+                        ("visited", checkpoint.visited_nodes_dict),
+                        ("filled", checkpoint.filled_nodes_dict),
+                    ]:
+                        for key, paths in _decode_nodes_dict(coverage[name]).items():
+                            target.setdefault(key, set()).update(paths)
+                pending_coverage = []
+    return checkpoint
+
+
+def _to_tuple(value: Any) -> Any:
+    """Convert the nested lists of a decoded checkpoint key into tuples"""
+    if isinstance(value, list):
+        return tuple(_to_tuple(item) for item in value)
+    return value
@@ -0,0 +1,489 @@
+"""
+This file describes the columnar result store, which stores the results of a
+validation run in parallel arrays instead of separate result objects
+"""
+
+import traceback
+from array import array
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
+
+import numpy
+
+from imas_validator.rules.data import IDSValidationRule
+from imas_validator.validate.result import (
+    ElementFailures,
+    IDSValidationResult,
+    LazyStackSummary,
+    NodesDict,
+    Traceback,
+)
+
+T = TypeVar("T")
+
+# Name and occurrence of the IDSs of a result
+IDSs = Tuple[Tuple[str, int], ...]
+# IDS name, occurrence and path of a node
+NodePath = Tuple[str, int, str]
+
+
+class _InternTable(Generic[T]):
+    """Table of unique values, which are referred to by their index"""
+
+    def __init__(self) -> None:
+        self.values: List[T] = []
+        self._indices: Dict[Hashable, int] = {}
+
+    def intern(self, value: T, key: Optional[Hashable] = None) -> int:
+        """Return the index of a value, adding it to the table when it is new.
+
+        Args:
+            value: Value to look up
+            key: Key identifying the value, defaults to the value itself
+        """
+        if key is None:
+            key = value  # type: ignore[assignment]
+        index = self._indices.get(key)
+        if index is None:
+            index = len(self.values)
+            self._indices[key] = index
+            self.values.append(value)
+        return index
+
+
+def _traceback_key(tb: Sequence[traceback.FrameSummary]) -> Hashable:
+    """Return a key identifying the source locations of a traceback"""
+    if isinstance(tb, LazyStackSummary):
+        return tb.frames
+    return tuple((frame.filename, frame.lineno, frame.name) for frame in tb)
+
+
+class ResultRow:
+    """View on a single row of a :py:class:`ColumnarResultStore`.
+
+    The row has the same attributes as :py:class:`IDSValidationResult`, which are
+    read from the store when they are accessed.
+    """
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: "ColumnarResultStore", index: int) -> None:
+        self._store = store
+        self._index = index
+
+    @property
+    def success(self) -> bool:
+        return bool(self._store._success[self._index])
+
+    @property
+    def msg(self) -> str:
+        return self._store.messages[self._store._message_ids[self._index]]
+
+    @property
+    def rule(self) -> IDSValidationRule:
+        return self._store.rules[self._store._rule_ids[self._index]]
+
+    @property
+    def idss(self) -> List[Tuple[str, int]]:
+        return list(self._store.idss_table[self._store._idss_ids[self._index]])
+
+    @property
+    def tb(self) -> Traceback:
+        return self._store.locations[self._store._location_ids[self._index]]
+
+    @property
+    def nodes_dict(self) -> NodesDict:
+        return self._store._nodes_dict(self._index)
+
+    @property
+    def exc(self) -> Optional[Exception]:
+        return self._store._exceptions.get(self._index)
+
+    @property
+    def count(self) -> int:
+        return self._store._counts[self._index]
+
+    @property
+    def cached(self) -> bool:
+        return bool(self._store._cached[self._index])
+
+    @property
+    def element_failures(self) -> Optional[ElementFailures]:
+        return self._store._element_failures.get(self._index)
+
+    def to_result(self) -> IDSValidationResult:
+        """Create a separate result object with the data of this row"""
+        return IDSValidationResult(
+            self.success,
+            self.msg,
+            self.rule,
+            self.idss,
+            self.tb,
+            self.nodes_dict,
+            exc=self.exc,
+            count=self.count,
+            cached=self.cached,
+            element_failures=self.element_failures,
+        )
+
+
+class ResultRows(Sequence[ResultRow]):
+    """Selection of rows of a :py:class:`ColumnarResultStore`"""
+
+    def __init__(self, store: "ColumnarResultStore", indices: numpy.ndarray) -> None:
+        self.store = store
+        self.indices = indices
+        """Indices of the selected rows in the store"""
+
+    @overload
+    def __getitem__(self, index: int) -> ResultRow: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "ResultRows": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[ResultRow, "ResultRows"]:
+        if isinstance(index, slice):
+            return ResultRows(self.store, self.indices[index])
+        return ResultRow(self.store, int(self.indices[index]))
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+
+class ColumnarResultStore(Sequence[IDSValidationResult]):
+    """Store for validation results with a column per result attribute.
+
+    Rules, messages, tracebacks, IDSs and node paths are interned in tables and every
+    result only stores their integer ids. The node paths of a result are stored
+    CSR-style: ``node_ids[node_offsets[i]:node_offsets[i + 1]]`` are the nodes of the
+    ``i``-th result. Results are converted to :py:class:`IDSValidationResult` objects
+    when they are accessed by index or iteration, while :py:meth:`row` and
+    :py:meth:`select` return views that read the store directly.
+    """
+
+    def __init__(self, results: Iterable[IDSValidationResult] = ()) -> None:
+        """Initialize ColumnarResultStore
+
+        Args:
+            results: Results to add to the store
+        """
+        self._success = array("b")
+        self._counts = array("q")
+        self._cached = array("b")
+        self._rule_ids = array("l")
+        self._message_ids = array("l")
+        self._location_ids = array("l")
+        self._idss_ids = array("l")
+        # Whether the nodes dict of a result has an entry for each of its IDSs
+        self._has_nodes = array("b")
+        self._node_offsets = array("q", [0])
+        self._node_ids = array("l")
+        self._exceptions: Dict[int, Exception] = {}
+        self._element_failures: Dict[int, ElementFailures] = {}
+        # Nodes dicts that cannot be represented by the node columns
+        self._nodes_overrides: Dict[int, NodesDict] = {}
+        self._rules: _InternTable[IDSValidationRule] = _InternTable()
+        self._messages: _InternTable[str] = _InternTable()
+        self._locations: _InternTable[Traceback] = _InternTable()
+        self._idss: _InternTable[IDSs] = _InternTable()
+        self._nodes: _InternTable[NodePath] = _InternTable()
+        self.extend(results)
+
+    @property
+    def rules(self) -> List[IDSValidationRule]:
+        """Table of rules, indexed by :py:meth:`rule_ids`"""
+        return self._rules.values
+
+    @property
+    def messages(self) -> List[str]:
+        """Table of messages, indexed by :py:meth:`message_ids`"""
+        return self._messages.values
+
+    @property
+    def locations(self) -> List[Traceback]:
+        """Table of tracebacks, indexed by :py:meth:`location_ids`"""
+        return self._locations.values
+
+    @property
+    def idss_table(self) -> List[IDSs]:
+        """Table of IDS names and occurrences, indexed by :py:meth:`idss_ids`"""
+        return self._idss.values
+
+    @property
+    def node_table(self) -> List[NodePath]:
+        """Table of IDS names, occurrences and node paths, indexed by
+        :py:meth:`node_ids`"""
+        return self._nodes.values
+
+    def append(self, result: IDSValidationResult) -> None:
+        """Add a result to the store
+
+        Args:
+            result: Result to add
+        """
+        index = len(self._success)
+        self._success.append(result.success)
+        self._counts.append(result.count)
+        self._cached.append(result.cached)
+        self._rule_ids.append(self._rules.intern(result.rule, id(result.rule)))
+        self._message_ids.append(self._messages.intern(result.msg))
+        self._location_ids.append(
+            self._locations.intern(result.tb, _traceback_key(result.tb))
+        )
+        idss = tuple(result.idss)
+        self._idss_ids.append(self._idss.intern(idss))
+        if result.exc is not None:
+            self._exceptions[index] = result.exc
+        if result.element_failures is not None:
+            self._element_failures[index] = result.element_failures
+        self._append_nodes(index, idss, result.nodes_dict)
+
+    def extend(self, results: Iterable[IDSValidationResult]) -> None:
+        """Add results to the store
+
+        Args:
+            results: Results to add
+        """
+        for result in results:
+            self.append(result)
+
+    def _append_nodes(self, index: int, idss: IDSs, nodes_dict: NodesDict) -> None:
+        has_nodes = bool(nodes_dict)
+        if has_nodes and (len(nodes_dict) != len(idss) or set(nodes_dict) != set(idss)):
+            self._nodes_overrides[index] = nodes_dict
+            has_nodes = False
+        elif has_nodes:
+            intern = self._nodes.intern
+            self._node_ids.extend(
+                intern((ids_name, occurrence, path))
+                for (ids_name, occurrence), paths in nodes_dict.items()
+                for path in paths
+            )
+        self._has_nodes.append(has_nodes)
+        self._node_offsets.append(len(self._node_ids))
+
+    def __setitem__(self, index: int, result: IDSValidationResult) -> None:
+        """Replace a stored result, e.g. after updating an aggregated result
+
+        Args:
+            index: Index of the result
+            result: New result
+        """
+        index = range(len(self))[index]
+        self._success[index] = result.success
+        self._counts[index] = result.count
+        self._cached[index] = result.cached
+        self._rule_ids[index] = self._rules.intern(result.rule, id(result.rule))
+        self._message_ids[index] = self._messages.intern(result.msg)
+        self._location_ids[index] = self._locations.intern(
+            result.tb, _traceback_key(result.tb)
+        )
+        self._idss_ids[index] = self._idss.intern(tuple(result.idss))
+        if result.exc is not None:
+            self._exceptions[index] = result.exc
+        else:
+            self._exceptions.pop(index, None)
+        if result.element_failures is not None:
+            self._element_failures[index] = result.element_failures
+        else:
+            self._element_failures.pop(index, None)
+        # Node paths are stored contiguously, so changed nodes are kept separately
+        if result.nodes_dict != self._nodes_dict(index):
+            self._nodes_overrides[index] = result.nodes_dict
+
+    def _nodes_dict(self, index: int) -> NodesDict:
+        override = self._nodes_overrides.get(index)
+        if override is not None:
+            return {key: set(paths) for key, paths in override.items()}
+        if not self._has_nodes[index]:
+            return {}
+        nodes_dict: NodesDict = {
+            key: set() for key in self._idss.values[self._idss_ids[index]]
+        }
+        node_table = self._nodes.values
+        start, stop = self._node_offsets[index], self._node_offsets[index + 1]
+        for node_id in self._node_ids[start:stop]:
+            ids_name, occurrence, path = node_table[node_id]
+            nodes_dict[(ids_name, occurrence)].add(path)
+        return nodes_dict
+
+    def row(self, index: int) -> ResultRow:
+        """Return a view on a stored result
+
+        Args:
+            index: Index of the result
+        """
+        return ResultRow(self, range(len(self))[index])
+
+    def select(self, indices: numpy.ndarray) -> ResultRows:
+        """Return views on the stored results with the given indices or mask
+
+        Args:
+            indices: Integer indices or boolean mask of the results
+        """
+        indices = numpy.asarray(indices)
+        if indices.dtype == bool:
+            indices = numpy.flatnonzero(indices)
+        return ResultRows(self, indices)
+
+    @overload
+    def __getitem__(self, index: int) -> IDSValidationResult: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[IDSValidationResult]: ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[IDSValidationResult, List[IDSValidationResult]]:
+        if isinstance(index, slice):
+            return [self.row(i).to_result() for i in range(len(self))[index]]
+        return self.row(index).to_result()
+
+    def __iter__(self) -> Iterator[IDSValidationResult]:
+        for index in range(len(self)):
+            yield ResultRow(self, index).to_result()
+
+    def __len__(self) -> int:
+        return len(self._success)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return ColumnarResultStore, (list(self),)
+
+    # Columns as NumPy arrays, these are copies of the stored data
+
+    def success(self) -> numpy.ndarray:
+        """Whether each result was successful"""
+        return numpy.array(self._success, dtype=bool)
+
+    def counts(self) -> numpy.ndarray:
+        """Number of assertions represented by each result"""
+        return numpy.array(self._counts, dtype=numpy.int64)
+
+    def cached(self) -> numpy.ndarray:
+        """Whether each result was reused from the result cache"""
+        return numpy.array(self._cached, dtype=bool)
+
+    def rule_ids(self) -> numpy.ndarray:
+        """Index in :py:attr:`rules` of the rule of each result"""
+        return numpy.array(self._rule_ids, dtype=numpy.intp)
+
+    def rule_name_ids(self) -> numpy.ndarray:
+        """Index in the sorted unique rule names of the rule of each result"""
+        names = numpy.array([rule.name for rule in self.rules], dtype=object)
+        _, name_ids = numpy.unique(names, return_inverse=True)
+        return name_ids.reshape(-1)[self.rule_ids()]
+
+    def message_ids(self) -> numpy.ndarray:
+        """Index in :py:attr:`messages` of the message of each result"""
+        return numpy.array(self._message_ids, dtype=numpy.intp)
+
+    def location_ids(self) -> numpy.ndarray:
+        """Index in :py:attr:`locations` of the traceback of each result"""
+        return numpy.array(self._location_ids, dtype=numpy.intp)
+
+    def idss_ids(self) -> numpy.ndarray:
+        """Index in :py:attr:`idss_table` of the IDSs of each result"""
+        return numpy.array(self._idss_ids, dtype=numpy.intp)
+
+    def node_offsets(self) -> numpy.ndarray:
+        """Offsets in :py:meth:`node_ids` of the nodes of each result"""
+        return numpy.array(self._node_offsets, dtype=numpy.intp)
+
+    def node_ids(self) -> numpy.ndarray:
+        """Index in :py:attr:`node_table` of the nodes of all results"""
+        return numpy.array(self._node_ids, dtype=numpy.intp)
+
+    @property
+    def element_failures(self) -> Dict[int, ElementFailures]:
+        """Failed elements of the results of array-valued assertions, by index"""
+        return self._element_failures
+
+    @property
+    def nodes_overrides(self) -> Dict[int, NodesDict]:
+        """Nodes dicts of results that are not stored in the node columns"""
+        return self._nodes_overrides
+
+    # Vectorized aggregations
+
+    def num_assertions(self) -> int:
+        """Total number of assertions represented by the results"""
+        return int(self.counts().sum())
+
+    def num_failures(self) -> int:
+        """Number of failed assertions"""
+        return int(self.counts()[~self.success()].sum())
+
+    def all_successful(self) -> bool:
+        """Whether all results were successful"""
+        return bool(self.success().all())
+
+    def num_cached(self) -> int:
+        """Number of assertions that were reused from the result cache"""
+        return int(self.counts()[self.cached()].sum())
+
+
+def count_assertions(results: Iterable[Any]) -> int:
+    """Return the number of assertions represented by results
+
+    Args:
+        results: Result objects, a columnar result store or a selection of it
+    """
+    if isinstance(results, ColumnarResultStore):
+        return results.num_assertions()
+    if isinstance(results, ResultRows):
+        return int(results.store.counts()[results.indices].sum())
+    return sum(result.count for result in results)
+
+
+def count_failures(results: Iterable[Any]) -> int:
+    """Return the number of failed assertions of results
+
+    Args:
+        results: Result objects, a columnar result store or a selection of it
+    """
+    if isinstance(results, ColumnarResultStore):
+        return results.num_failures()
+    if isinstance(results, ResultRows):
+        store, indices = results.store, results.indices
+        return int(store.counts()[indices][~store.success()[indices]].sum())
+    return sum(result.count for result in results if not result.success)
+
+
+def all_successful(results: Iterable[Any]) -> bool:
+    """Return whether all results were successful
+
+    Args:
+        results: Result objects, a columnar result store or a selection of it
+    """
+    if isinstance(results, ColumnarResultStore):
+        return results.all_successful()
+    if isinstance(results, ResultRows):
+        return bool(results.store.success()[results.indices].all())
+    return all(result.success for result in results)
+
+
+def count_cached(results: Iterable[Any]) -> int:
+    """Return the number of assertions of results that were reused from the cache
+
+    Args:
+        results: Result objects, a columnar result store or a selection of it
+    """
+    if isinstance(results, ColumnarResultStore):
+        return results.num_cached()
+    if isinstance(results, ResultRows):
+        store, indices = results.store, results.indices
+        return int(store.counts()[indices][store.cached()[indices]].sum())
+    return sum(result.count for result in results if result.cached)
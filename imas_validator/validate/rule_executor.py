@@ -6,16 +6,43 @@ IDS data
 import logging
 import pdb
 import sys
-from typing import Iterator, List, Optional, Tuple
+import threading
+from contextlib import ExitStack, nullcontext
+from typing import (
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 import imas  # type: ignore
-from packaging.specifiers import SpecifierSet
-from packaging.version import Version
 from rich.progress import Progress
 
 from imas_validator.exceptions import InternalValidateDebugException
+from imas_validator.rules.access_analysis import ArgumentAccess, analyze_rule
 from imas_validator.rules.data import IDSValidationRule
+from imas_validator.rules.index import RuleIndex
+from imas_validator.validate.ids_cache import IDSCache, estimate_nbytes
+from imas_validator.validate.partial_load import (
+    copy_requirements,
+    resolve_requirements,
+)
+from imas_validator.validate.prefetch import prefetch
+from imas_validator.validate.result import IDSValidationResult
+from imas_validator.validate.result_cache import (
+    ResultCache,
+    cache_key,
+    ids_content_fingerprint,
+    ids_file_fingerprint,
+    rule_fingerprint,
+)
 from imas_validator.validate.result_collector import ResultCollector
+from imas_validator.validate.result_sink import CheckpointKey
+from imas_validator.validate.time_windows import TimeWindow, get_time_windows
+from imas_validator.validate.traversal_cache import TraversalCache
 from imas_validator.validate_options import ValidateOptions
 
 logger = logging.getLogger(__name__)
@@ -23,6 +50,11 @@ logger = logging.getLogger(__name__)
 IDSInstance = Tuple[imas.ids_toplevel.IDSToplevel, str, int]
 
 
+def ids_checkpoint_key(ids_name: str, occurrence: int) -> CheckpointKey:
+    """Return the checkpoint key of an IDS occurrence to which all rules are applied"""
+    return ("ids", ids_name, occurrence)
+
+
 class RuleExecutor:
     """Class for matching rules and idss and executing rules"""
 
@@ -49,11 +81,64 @@ class RuleExecutor:
         self.result_collector = result_collector
         self.validate_options = validate_options
         self.progress = Progress()
+        self.ids_cache = IDSCache(validate_options.ids_cache_size)
+        self._load_lock = threading.Lock()
+        self.result_cache: Optional[ResultCache] = None
+        if validate_options.cache_dir is not None:
+            if validate_options.track_node_dict or validate_options.use_pdb:
+                # Coverage and debugging require the rules to be executed
+                logger.info("Result cache is not used with node coverage or pdb")
+            else:
+                self.result_cache = ResultCache(validate_options.cache_dir)
+        # Content fingerprints of the loaded IDS occurrences
+        self._content_fingerprints: Dict[Tuple[str, int], Optional[str]] = {}
+        self.traversal_cache = TraversalCache()
+        """Filled nodes and Select results of the IDS that the rules are applied to"""
+
+    @property
+    def rules(self) -> List[IDSValidationRule]:
+        """List of rules to apply to the data."""
+        return self._rules
+
+    @rules.setter
+    def rules(self, rules: List[IDSValidationRule]) -> None:
+        self._rules = rules
+        self._rule_index: Optional[RuleIndex] = None
+        self._rule_positions = {id(rule): i for i, rule in enumerate(rules)}
+        self._rule_fingerprints: Dict[int, str] = {}
+        self._rules_by_name: Dict[str, IDSValidationRule] = {}
+        for rule in rules:
+            self._rules_by_name.setdefault(rule.name, rule)
+
+    @property
+    def rule_index(self) -> RuleIndex:
+        """Dispatch index of the rules, built when it is first needed."""
+        if self._rule_index is None:
+            self._rule_index = RuleIndex(self._rules)
+        return self._rule_index
 
-    def apply_rules_to_data(self) -> None:
-        """Apply set of rules to the Data Entry."""
+    @rule_index.setter
+    def rule_index(self, rule_index: RuleIndex) -> None:
+        self._rule_index = rule_index
+
+    def apply_rules_to_data(
+        self, ids_list: Optional[List[Tuple[str, int]]] = None
+    ) -> None:
+        """Apply set of rules to the Data Entry.
+
+        Args:
+            ids_list: IDS names and occurrences to validate. When not provided, all
+                IDS occurrences in the Data Entry are validated.
+        """
         logger.info("Started executing rules")
-        for ids_instances, rule in self.find_matching_rules():
+        try:
+            self._apply_rules(ids_list)
+        finally:
+            if self.result_collector.rule_profiler is not None:
+                self.result_collector.rule_profiler.stop()
+
+    def _apply_rules(self, ids_list: Optional[List[Tuple[str, int]]]) -> None:
+        for ids_instances, rule in self.find_matching_rules(ids_list):
             ids_toplevels = [ids[0] for ids in ids_instances]
             idss = [(ids[1], ids[2]) for ids in ids_instances]
             self.result_collector.set_context(rule, ids_instances)
@@ -61,16 +146,52 @@ class RuleExecutor:
                 sorted(f"{ids_name}:{ids_occ}" for ids_name, ids_occ in idss)
             )
             logger.info(f"Running {rule.name} on {idss_str}")
-            self.run(rule, ids_toplevels)
+            with self._measure_rule(rule, idss):
+                self.run(rule, ids_toplevels)
+            self.result_collector.mark_completed(self._checkpoint_key(rule, idss))
+
+    def _measure_rule(
+        self, rule: IDSValidationRule, idss: List[Tuple[str, int]]
+    ) -> ContextManager:
+        """Return a context manager that profiles a rule when profiling is enabled"""
+        rule_profiler = self.result_collector.rule_profiler
+        call_profiler = self.result_collector.rule_call_profiler
+        if call_profiler is not None and not call_profiler.matches(rule.name):
+            call_profiler = None
+        if rule_profiler is None and call_profiler is None:
+            return nullcontext()
+        stack = ExitStack()
+        if rule_profiler is not None:
+            stack.enter_context(
+                rule_profiler.measure_rule(
+                    rule.name, idss, lambda: self.result_collector.num_results
+                )
+            )
+        if call_profiler is not None:
+            stack.enter_context(call_profiler.profile_rule(rule.name, idss))
+        return stack
+
+    def _checkpoint_key(
+        self, rule: IDSValidationRule, idss: List[Tuple[str, int]]
+    ) -> CheckpointKey:
+        """Return the checkpoint key of a rule applied to IDS occurrences"""
+        return (
+            "rule",
+            self._rule_positions[id(rule)],
+            rule.name,
+            tuple(idss),
+            self.result_collector.time_slice_offset,
+        )
 
     def run(
         self,
         rule: IDSValidationRule,
         ids_toplevels: List[imas.ids_toplevel.IDSToplevel],
     ) -> None:
-        res_num = len(self.result_collector.results)
+        res_num = self.result_collector.num_results
         try:
-            rule.apply_func(ids_toplevels)
+            with self.traversal_cache.activate():
+                rule.apply_func(ids_toplevels)
         except Exception as exc:
             tb = exc.__traceback__
             if isinstance(exc, InternalValidateDebugException):
@@ -89,7 +210,7 @@ class RuleExecutor:
                 pdb.post_mortem(tb)
                 self.progress_start()
         finally:
-            if len(self.result_collector.results) == res_num:
+            if self.result_collector.num_results == res_num:
                 logger.info(
                     f"No assertions in {rule.name}. "
                     "Make sure the validation test is testing something "
@@ -97,36 +218,107 @@ class RuleExecutor:
                 )
 
     def find_matching_rules(
-        self,
+        self, ids_list: Optional[List[Tuple[str, int]]] = None
     ) -> Iterator[Tuple[List[IDSInstance], IDSValidationRule]]:
         """Find combinations of rules and their relevant ids instances
 
+        Args:
+            ids_list: IDS names and occurrences to match the rules with. When not
+                provided, all IDS occurrences in the Data Entry are used.
+
         Yields:
             tuple of ids_instances, ids_names, ids_occurrences, validation rule
         """
 
-        ids_list = self._get_ids_list()
+        if ids_list is None:
+            ids_list = self._get_ids_list()
         self.progress_start()
         t1 = self.progress.add_task("[red]Processing...", total=len(ids_list))
+        load_list = []
+        stream_list = []
+        # Cache keys from the backend files, and results found with them
+        file_keys: Dict[Tuple[str, int], Optional[str]] = {}
+        cached_results: Dict[Tuple[str, int], List[IDSValidationResult]] = {}
         for ids_name, occurrence in ids_list:
-            ids_instance = self._load_ids_instance(ids_name, occurrence)
+            if not self.rule_index.applies_to(
+                ids_name, occurrence
+            ) or self.result_collector.is_completed(
+                ids_checkpoint_key(ids_name, occurrence)
+            ):
+                self.progress.update(t1, advance=1)
+                continue
+            time_windows = self._get_time_windows(ids_name, occurrence)
+            if time_windows is None:
+                load_list.append((ids_name, occurrence))
+                if self.result_cache is not None:
+                    # Reuse results without loading when the files did not change
+                    file_key = self._result_cache_key(
+                        ids_name, occurrence, self._file_fingerprint
+                    )
+                    file_keys[(ids_name, occurrence)] = file_key
+                    results = self._get_cached_results(file_key)
+                    if results is not None:
+                        cached_results[(ids_name, occurrence)] = results
+            else:
+                stream_list.append((ids_name, occurrence, time_windows))
+
+        def load(ids_name: str, occurrence: int) -> Tuple[Optional[IDSInstance], int]:
+            if (ids_name, occurrence) in cached_results:
+                return None, 0
+            return self._prefetch_ids_instance(ids_name, occurrence)
+
+        # Load the next IDSs in the background while rules run on the current one
+        ids_instances = prefetch(
+            load,
+            load_list,
+            depth=self._prefetch_depth(),
+            max_nbytes=self.validate_options.prefetch_max_nbytes,
+        )
+        for (ids_name, occurrence), ids_instance in ids_instances:
+            results = cached_results.pop((ids_name, occurrence), None)
+            file_key = file_keys.get((ids_name, occurrence))
+            content_key = None
+            if results is None and ids_instance is not None and self.result_cache:
+                # Reuse results without executing the rules when the data did not
+                # change, e.g. when the files were only copied
+                self._content_fingerprints[(ids_name, occurrence)] = (
+                    self._ids_content_fingerprint(ids_instance[0])
+                )
+                content_key = self._result_cache_key(
+                    ids_name, occurrence, self._content_fingerprint
+                )
+                results = self._get_cached_results(content_key)
+                if results is not None and file_key is not None:
+                    self.result_cache.put(file_key, results)
+            if results is not None:
+                logger.info(f"Reusing cached results of {ids_name}:{occurrence}")
+                self.result_collector.add_cached_results(results)
+                self.progress.update(t1, advance=1)
+                self.result_collector.mark_completed(
+                    ids_checkpoint_key(ids_name, occurrence)
+                )
+                continue
             if ids_instance is None:
                 continue
-            ids_version = Version(ids_instance[0]._dd_version)
-            # match with first ids_name to prevent matching the same rule multiple
-            # times for multi-ids
-            filtered_rules = [
-                rule
-                for rule in self.rules
-                if (rule.ids_names[0] == ids_name or rule.ids_names[0] == "*")
-                and (rule.ids_occs[0] == occurrence or rule.ids_occs[0] is None)
-                and ids_version in SpecifierSet(rule.version)
-            ]
+            if self.result_cache is not None:
+                self.result_collector.start_recording()
+            # Whether all rules are applied, so the results can be cached
+            complete = True
+            filtered_rules = self.rule_index.find(
+                ids_name, occurrence, ids_instance[0]._dd_version
+            )
             for rule in filtered_rules:
                 self.progress.update(t1, advance=1 / len(filtered_rules))
+                ids_keys = [(ids_name, occurrence)]
+                for name, occ in zip(rule.ids_names[1:], rule.ids_occs[1:]):
+                    assert occ is not None
+                    ids_keys.append((name, occ))
+                key = self._checkpoint_key(rule, ids_keys)
+                if self.result_collector.is_completed(key):
+                    complete = False
+                    continue
                 idss = [ids_instance]
-                # get rest of idss for multi-validation rules.
-                # unoptimized algorithm, change if performance ever becomes problem.
+                # get rest of idss for multi-validation rules, loaded IDSs are cached
                 for name, occ in zip(rule.ids_names[1:], rule.ids_occs[1:]):
                     assert occ is not None
                     instance = self._load_ids_instance(name, occ)
@@ -137,20 +329,246 @@ class RuleExecutor:
                     if self.validate_options.stop_at_load_error:
                         raise ValueError("Number of inputs not the same as required")
                     else:
+                        complete = False
                         continue
                 yield idss, rule
+            if self.result_cache is not None:
+                results = self.result_collector.stop_recording()
+                if complete:
+                    for entry_key in (file_key, content_key):
+                        if entry_key is not None:
+                            self.result_cache.put(entry_key, results)
+            self._release_ids()
+            self.result_collector.mark_completed(
+                ids_checkpoint_key(ids_name, occurrence)
+            )
+        # Long IDSs of which all rules are slice safe are read window by window
+        for ids_name, occurrence, time_windows in stream_list:
+            windows = self._iter_time_windows(ids_name, occurrence, time_windows)
+            for ids_instance, time_slice_offset in windows:
+                filtered_rules = self.rule_index.find(
+                    ids_name, occurrence, ids_instance[0]._dd_version
+                )
+                self.result_collector.time_slice_offset = time_slice_offset
+                for rule in filtered_rules:
+                    key = self._checkpoint_key(rule, [(ids_name, occurrence)])
+                    if not self.result_collector.is_completed(key):
+                        yield [ids_instance], rule
+                self._release_ids()
+                self.result_collector.time_slice_offset = 0
+            self.result_collector.mark_completed(
+                ids_checkpoint_key(ids_name, occurrence)
+            )
+            self.progress.update(t1, advance=1)
         self.progress_stop()
+        self.ids_cache.log_statistics()
+
+    def _release_ids(self) -> None:
+        """Release the IDS that the rules were applied to before moving on to the next
+        one: its traversals are not used again, and the filled nodes of lazy loaded
+        IDSs are collected so that they are not kept alive for node coverage"""
+        self.traversal_cache.clear()
+        self.result_collector.collect_filled_nodes()
+
+    def _result_cache_key(
+        self,
+        ids_name: str,
+        occurrence: int,
+        fingerprint: Callable[[str, int], Optional[str]],
+    ) -> Optional[str]:
+        """Return the result cache key of an IDS occurrence.
+
+        The key covers the rules that apply to the IDS occurrence, the data of the
+        IDS occurrence and of the other IDSs that these rules use, the options that
+        change the results and the validator version.
+
+        Args:
+            ids_name: Name of the IDS
+            occurrence: Occurrence number of the IDS
+            fingerprint: Function that returns the fingerprint of the data of an IDS
+                occurrence, or None when it is not available
+
+        Returns:
+            The key, or None when the fingerprint of an IDS is not available
+        """
+        rule_fingerprints = []
+        ids_keys = {(ids_name, occurrence)}
+        for rule, position in self.rule_index.find_arguments(ids_name, occurrence):
+            if position != 0:
+                continue
+            rule_fingerprints.append(self._rule_fingerprint(rule))
+            for name, occ in zip(rule.ids_names[1:], rule.ids_occs[1:]):
+                assert occ is not None
+                ids_keys.add((name, occ))
+        ids_fingerprints = []
+        for name, occ in sorted(ids_keys):
+            ids_fingerprint = fingerprint(name, occ)
+            if ids_fingerprint is None:
+                return None
+            ids_fingerprints.append([name, occ, ids_fingerprint])
+        return cache_key(
+            ids_name,
+            occurrence,
+            rule_fingerprints,
+            ids_fingerprints,
+            self.validate_options.aggregate_passes,
+            self.validate_options.node_report,
+            # Rules that are not written for lazy loaded IDSs may have other results
+            self.validate_options.lazy_load,
+        )
+
+    def _rule_fingerprint(self, rule: IDSValidationRule) -> str:
+        fingerprint = self._rule_fingerprints.get(id(rule))
+        if fingerprint is None:
+            fingerprint = rule_fingerprint(rule)
+            self._rule_fingerprints[id(rule)] = fingerprint
+        return fingerprint
+
+    def _file_fingerprint(self, ids_name: str, occurrence: int) -> Optional[str]:
+        return ids_file_fingerprint(self.db_entry.uri, ids_name)
+
+    def _content_fingerprint(self, ids_name: str, occurrence: int) -> Optional[str]:
+        key = (ids_name, occurrence)
+        if key not in self._content_fingerprints:
+            ids_instance = self._load_ids_instance(ids_name, occurrence)
+            self._content_fingerprints[key] = (
+                None
+                if ids_instance is None
+                else self._ids_content_fingerprint(ids_instance[0])
+            )
+        return self._content_fingerprints[key]
+
+    def _ids_content_fingerprint(
+        self, ids: imas.ids_toplevel.IDSToplevel
+    ) -> Optional[str]:
+        # Hashing the content of a lazy loaded IDS would read all its data
+        if ids._lazy:
+            return None
+        return ids_content_fingerprint(ids)
+
+    def _get_cached_results(
+        self, key: Optional[str]
+    ) -> Optional[List[IDSValidationResult]]:
+        """Return the cached results of a key, or None when they are not cached or
+        the cache is refreshed"""
+        if (
+            key is None
+            or self.result_cache is None
+            or self.validate_options.refresh_cache
+        ):
+            return None
+        return self.result_cache.get(key, self._rules_by_name)
+
+    def _get_time_windows(
+        self, ids_name: str, occurrence: int
+    ) -> Optional[List[TimeWindow]]:
+        """Get the windows of time slices in which an IDS occurrence is validated.
+
+        Returns:
+            The time windows, or None when the IDS occurrence is loaded whole
+        """
+        window_size = self.validate_options.time_window
+        if window_size < 1:
+            return None
+        for rule, _ in self.rule_index.find_arguments(ids_name, occurrence):
+            if not rule.slice_safe or len(rule.ids_names) > 1:
+                return None
+        try:
+            with self._load_lock:
+                lazy_ids = self.db_entry.get(
+                    ids_name, occurrence, lazy=True, autoconvert=False
+                )
+                homogeneous_time = lazy_ids.ids_properties.homogeneous_time.value
+                time = lazy_ids.time.value
+        except Exception as e:
+            logger.info(f"Cannot read the time base of {ids_name}:{occurrence}: {e}")
+            return None
+        if homogeneous_time != 1 or len(time) <= window_size:
+            return None
+        return get_time_windows(time, window_size)
+
+    def _iter_time_windows(
+        self, ids_name: str, occurrence: int, time_windows: List[TimeWindow]
+    ) -> Iterator[Tuple[IDSInstance, int]]:
+        """Load an IDS occurrence window by window with get_sample.
+
+        Falls back to loading the full IDS when the backend does not support reading
+        time ranges.
+
+        Yields:
+            IDS instance of the window and the index of its first time slice
+        """
+        logger.info(
+            f"Streaming IDS: {ids_name}, occurrence = {occurrence} in "
+            f"{len(time_windows)} windows"
+        )
+        for time_slice_offset, tmin, tmax in time_windows:
+            try:
+                with self._load_lock, self._measure_load(ids_name, occurrence):
+                    ids = self.db_entry.get_sample(
+                        ids_name, tmin, tmax, occurrence=occurrence, autoconvert=False
+                    )
+            except Exception as e:
+                if time_slice_offset == 0:
+                    logger.info(f"Time windows not available, loading full IDS: {e}")
+                    ids_instance = self._load_ids_instance(ids_name, occurrence)
+                    if ids_instance is not None:
+                        yield ids_instance, 0
+                    return
+                logger.error(
+                    f"Unable to load IDS: {ids_name}, occurrence = {occurrence}, "
+                    f"time = [{tmin}, {tmax}], uri: {self.db_entry.uri}"
+                )
+                if self.validate_options.stop_at_load_error:
+                    raise e
+                return
+            yield (ids, ids_name, occurrence), time_slice_offset
+
+    def _prefetch_depth(self) -> int:
+        """Return the number of IDS occurrences that are loaded ahead.
+
+        Lazy loaded IDSs read from the backend while the rules run on them, outside
+        the load lock, so no other IDS may be loaded at the same time.
+        """
+        if self.validate_options.lazy_load:
+            return 0
+        return self.validate_options.prefetch
+
+    def _prefetch_ids_instance(
+        self, ids_name: str, occurrence: int
+    ) -> Tuple[Optional[IDSInstance], int]:
+        """Load an IDS instance and return it with its estimated size in bytes"""
+        ids_instance = self._load_ids_instance(ids_name, occurrence)
+        if ids_instance is None:
+            return None, 0
+        if self._prefetch_depth() < 1:
+            return ids_instance, 0  # The size is only needed to limit prefetching
+        nbytes = self.ids_cache.nbytes_of((ids_name, occurrence))
+        if nbytes is None:
+            nbytes = estimate_nbytes(ids_instance[0])
+        return ids_instance, nbytes
 
     def _load_ids_instance(
         self, ids_name: str, occurrence: int
+    ) -> Optional[IDSInstance]:
+        # The DBEntry and cache are shared with the prefetch thread
+        with self._load_lock:
+            return self._load_ids_instance_unlocked(ids_name, occurrence)
+
+    def _load_ids_instance_unlocked(
+        self, ids_name: str, occurrence: int
     ) -> Optional[IDSInstance]:
         logger.debug(f"Processing IDS: {ids_name}, occurrence = {occurrence}")
+        # Only IDSs that are used as other than the first argument of a rule are
+        # cached, so the cache is not consulted for the others
+        cacheable = self._is_secondary_argument(ids_name, occurrence)
+        if cacheable:
+            ids = self.ids_cache.get((ids_name, occurrence))
+            if ids is not None:
+                return ids, ids_name, occurrence
         try:
-            ids_instance = (
-                self.db_entry.get(ids_name, occurrence, autoconvert=False),
-                ids_name,
-                occurrence,
-            )
+            with self._measure_load(ids_name, occurrence):
+                ids = self._get_ids(ids_name, occurrence)
         except Exception as e:
             logger.error(
                 f"Unable to load IDS: {ids_name}, occurrence = {occurrence}, "
@@ -159,20 +577,100 @@ class RuleExecutor:
             if self.validate_options.stop_at_load_error:
                 raise e
             else:
-                ids_instance = None
-        return ids_instance
+                return None
+        if cacheable:
+            self.ids_cache.put((ids_name, occurrence), ids)
+        return ids, ids_name, occurrence
+
+    def _is_secondary_argument(self, ids_name: str, occurrence: int) -> bool:
+        """Return whether a multi-IDS rule may use an IDS occurrence as other than its
+        first argument, so that the IDS may be needed again after it is validated"""
+        arguments = self.rule_index.find_arguments(ids_name, occurrence)
+        return any(position > 0 for _, position in arguments)
+
+    def _measure_load(self, ids_name: str, occurrence: int) -> ContextManager:
+        """Return a context manager that measures loading an IDS when profiling"""
+        rule_profiler = self.result_collector.rule_profiler
+        if rule_profiler is None:
+            return nullcontext()
+        return rule_profiler.measure_load(ids_name, occurrence)
+
+    def _get_ids(self, ids_name: str, occurrence: int) -> imas.ids_toplevel.IDSToplevel:
+        """Get an IDS from the Data Entry. The IDS is lazy loaded when lazy loading is
+        enabled, and only the paths that the rules may read are loaded when partial
+        loading is enabled.
+        """
+        if self.validate_options.lazy_load:
+            return self.db_entry.get(ids_name, occurrence, lazy=True, autoconvert=False)
+        access = self._get_argument_access(ids_name, occurrence)
+        if access is not None:
+            try:
+                lazy_ids = self.db_entry.get(
+                    ids_name, occurrence, lazy=True, autoconvert=False
+                )
+            except Exception as e:
+                logger.info(f"Lazy loading not available, loading full IDS: {e}")
+            else:
+                tree = resolve_requirements(lazy_ids.metadata, access)
+                if tree is not None:
+                    logger.debug(
+                        f"Partially loading IDS: {ids_name}, occurrence = "
+                        f"{occurrence}, paths: {', '.join(sorted(tree))}"
+                    )
+                    ids = imas.IDSFactory(lazy_ids._dd_version).new(ids_name)
+                    copy_requirements(lazy_ids, ids, tree)
+                    return ids
+        return self.db_entry.get(ids_name, occurrence, autoconvert=False)
+
+    def _get_argument_access(
+        self, ids_name: str, occurrence: int
+    ) -> Optional[ArgumentAccess]:
+        """Get the paths that the rules may read from an IDS occurrence.
+
+        Returns:
+            The accessed paths, or None when the full IDS must be loaded
+        """
+        if (
+            not self.validate_options.partial_load
+            # Node coverage requires all filled nodes
+            or self.validate_options.track_node_dict
+        ):
+            return None
+        access = ArgumentAccess()
+        for rule, position in self.rule_index.find_arguments(ids_name, occurrence):
+            argument_access = analyze_rule(rule.func, len(rule.ids_names))[position]
+            if argument_access is None:
+                return None
+            access.update(argument_access)
+        return access
 
     def _get_ids_list(self) -> List[Tuple[str, int]]:
-        """Get list of all ids occurrences combined with their corresponding names
+        """Get list of all ids occurrences combined with their corresponding names.
+
+        IDSs and occurrences that no rule applies to are left out, so they are never
+        loaded.
 
         Returns:
             List of tuples with ids names and occurrences
         """
         ids_list: List[Tuple[str, int]] = []  # (ids_name, occurrence)
+        skipped_ids = 0
+        skipped_occurrences = 0
         for ids_name in self.db_entry.factory.ids_names():
+            if not self.rule_index.applies_to_ids(ids_name):
+                skipped_ids += 1
+                continue
             occurrence_list = self.db_entry.list_all_occurrences(ids_name)
             for occurrence in occurrence_list:
-                ids_list.append((ids_name, occurrence))
+                if self.rule_index.applies_to(ids_name, occurrence):
+                    ids_list.append((ids_name, occurrence))
+                else:
+                    skipped_occurrences += 1
+        if skipped_ids or skipped_occurrences:
+            logger.info(
+                f"Skipped {skipped_ids} IDSs and {skipped_occurrences} IDS "
+                "occurrences that no rule applies to"
+            )
         return ids_list
 
     def progress_start(self) -> None:
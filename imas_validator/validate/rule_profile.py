@@ -0,0 +1,245 @@
+"""
+This file describes the rule profiler, which measures the resources that every rule
+uses on the IDS occurrences it is applied to
+"""
+
+import cProfile
+import fnmatch
+import json
+import pstats
+import re
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Union
+
+from imas_validator.validate.result import RuleCallStats, RuleProfile
+
+ProfileKey = Tuple[str, Tuple[Tuple[str, int], ...]]
+
+
+class RuleProfiler:
+    """Collects the wall time, CPU time, peak memory and number of assertions of rules
+    per IDS occurrences, and the load time of the IDS occurrences.
+
+    Runs of a rule on the same IDS occurrences, e.g. on windows of time slices, are
+    added up. Memory is traced with :py:mod:`tracemalloc` while rules are measured.
+    """
+
+    def __init__(self) -> None:
+        self._profiles: Dict[ProfileKey, RuleProfile] = {}
+        self._load_times: Dict[Tuple[str, int], float] = {}
+        self._started_tracing = False
+
+    @contextmanager
+    def measure_rule(
+        self,
+        rule_name: str,
+        idss: List[Tuple[str, int]],
+        num_assertions: Callable[[], int],
+    ) -> Iterator[None]:
+        """Measure the execution of a rule
+
+        Args:
+            rule_name: Name of the rule
+            idss: IDS names and occurrences to which the rule is applied
+            num_assertions: Returns the total number of assertions so far
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        memory = tracemalloc.get_traced_memory()[0]
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        assertions = num_assertions()
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            cpu_time = time.thread_time() - cpu_start
+            wall_time = time.perf_counter() - wall_start
+            peak_memory = max(tracemalloc.get_traced_memory()[1] - memory, 0)
+            key = (rule_name, tuple(idss))
+            profile = self._profiles.get(key)
+            if profile is None:
+                profile = RuleProfile(rule_name, list(idss))
+                self._profiles[key] = profile
+            profile.wall_time += wall_time
+            profile.cpu_time += cpu_time
+            profile.peak_memory = max(profile.peak_memory, peak_memory)
+            profile.num_assertions += num_assertions() - assertions
+            profile.load_time = sum(self._load_times.get(ids, 0.0) for ids in idss)
+
+    @contextmanager
+    def measure_load(self, ids_name: str, occurrence: int) -> Iterator[None]:
+        """Measure loading (part of) an IDS occurrence
+
+        Args:
+            ids_name: Name of the IDS
+            occurrence: Occurrence number of the IDS
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            key = (ids_name, occurrence)
+            self._load_times[key] = (
+                self._load_times.get(key, 0.0) + time.perf_counter() - start
+            )
+
+    def merge(self, profiles: Iterable[RuleProfile]) -> None:
+        """Add profiles that were measured elsewhere, e.g. by a worker process
+
+        Args:
+            profiles: Profiles to add
+        """
+        for other in profiles:
+            key = (other.rule_name, tuple(other.idss))
+            profile = self._profiles.get(key)
+            if profile is None:
+                self._profiles[key] = RuleProfile(**asdict(other))
+                continue
+            profile.wall_time += other.wall_time
+            profile.cpu_time += other.cpu_time
+            profile.peak_memory = max(profile.peak_memory, other.peak_memory)
+            profile.num_assertions += other.num_assertions
+            profile.load_time = max(profile.load_time, other.load_time)
+
+    def stop(self) -> None:
+        """Stop tracing memory if it was started by this profiler"""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @property
+    def profiles(self) -> List[RuleProfile]:
+        """Profiles in the order in which the rules were first executed"""
+        return list(self._profiles.values())
+
+
+def save_rule_profiles(
+    rule_profiles: Iterable[RuleProfile], file_name: Union[str, Path]
+) -> None:
+    """Save rule profiles as a JSON file, slowest rules first
+
+    Args:
+        rule_profiles: Profiles to save
+        file_name: Name of the file
+    """
+    profiles = sorted(rule_profiles, key=lambda profile: -profile.wall_time)
+    with open(file_name, "w") as file:
+        json.dump([asdict(profile) for profile in profiles], file, indent=2)
+
+
+class RuleCallProfiler:
+    """Profiles the function calls of the rules that match a pattern with
+    :py:mod:`cProfile`, per rule and IDS occurrences.
+
+    Runs of a rule on the same IDS occurrences, e.g. on windows of time slices, are
+    added up.
+    """
+
+    def __init__(self, pattern: str) -> None:
+        """Initialize RuleCallProfiler
+
+        Args:
+            pattern: Glob pattern of the names of the rules to profile
+        """
+        self.pattern = pattern
+        self._stats: RuleCallStats = {}
+
+    def matches(self, rule_name: str) -> bool:
+        """Return whether the calls of a rule are profiled"""
+        return fnmatch.fnmatchcase(rule_name, self.pattern)
+
+    @contextmanager
+    def profile_rule(
+        self, rule_name: str, idss: List[Tuple[str, int]]
+    ) -> Iterator[None]:
+        """Profile the function calls of a rule
+
+        Args:
+            rule_name: Name of the rule
+            idss: IDS names and occurrences to which the rule is applied
+        """
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            profile.create_stats()
+            self._add((rule_name, tuple(idss)), profile.stats)
+
+    def _add(
+        self, key: Tuple[str, Tuple[Tuple[str, int], ...]], stats: Dict[Any, Any]
+    ) -> None:
+        if key in self._stats:
+            stats = _combine_stats([self._stats[key], stats])
+        self._stats[key] = stats
+
+    def merge(self, rule_call_stats: RuleCallStats) -> None:
+        """Add statistics that were collected elsewhere, e.g. by a worker process
+
+        Args:
+            rule_call_stats: Statistics per rule and IDS occurrences
+        """
+        for key, stats in rule_call_stats.items():
+            self._add(key, stats)
+
+    @property
+    def stats(self) -> RuleCallStats:
+        """Statistics per rule and IDS occurrences, in the format of
+        :py:attr:`pstats.Stats.stats`"""
+        return dict(self._stats)
+
+
+class _RawStats:
+    """Statistics in the format of a :py:class:`cProfile.Profile` after
+    ``create_stats``, which can be loaded by :py:class:`pstats.Stats`"""
+
+    def __init__(self, stats: Dict[Any, Any]) -> None:
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+def _combine_stats(stats_list: List[Dict[Any, Any]]) -> Dict[Any, Any]:
+    combined = pstats.Stats(_RawStats(dict(stats_list[0])))  # type: ignore[arg-type]
+    for stats in stats_list[1:]:
+        combined.add(_RawStats(stats))  # type: ignore[arg-type]
+    return combined.stats  # type: ignore[attr-defined]
+
+
+def save_rule_call_stats(
+    rule_call_stats: RuleCallStats, directory: Union[str, Path]
+) -> List[Path]:
+    """Save cProfile statistics as ``.pstats`` files, one per rule and IDS
+    occurrences and ``merged.pstats`` with the statistics of all of them
+
+    Args:
+        rule_call_stats: Statistics per rule and IDS occurrences
+        directory: Directory in which the files are saved
+
+    Returns:
+        Paths of the saved files
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for (rule_name, idss), stats in rule_call_stats.items():
+        idss_name = "_".join(f"{ids}:{occurrence}" for ids, occurrence in idss)
+        file_name = re.sub(r"[^\w.-]+", "_", f"{rule_name}__{idss_name}")
+        path = directory / f"{file_name}.pstats"
+        pstats.Stats(_RawStats(stats)).dump_stats(path)  # type: ignore[arg-type]
+        paths.append(path)
+    if rule_call_stats:
+        path = directory / "merged.pstats"
+        merged = _combine_stats(list(rule_call_stats.values()))
+        pstats.Stats(_RawStats(merged)).dump_stats(path)  # type: ignore[arg-type]
+        paths.append(path)
+    return paths
@@ -0,0 +1,81 @@
+"""
+This file describes the splitting of dynamic IDSs into windows of time slices, which
+allows validating very long IDSs without loading them whole
+"""
+
+import re
+from functools import lru_cache
+from typing import FrozenSet, List, Tuple
+
+import imas  # type: ignore
+import numpy
+from imas.ids_data_type import IDSDataType  # type: ignore
+
+# Index of the first time slice, and first and last time of a window
+TimeWindow = Tuple[int, float, float]
+
+_INDEX_PATTERN = re.compile(r"^(.*)\[(\d+)\]$")
+
+
+def get_time_windows(time: numpy.ndarray, window_size: int) -> List[TimeWindow]:
+    """Split a homogeneous time base into windows of consecutive time slices.
+
+    Args:
+        time: Homogeneous time base of an IDS
+        window_size: Maximum number of time slices in a window
+
+    Returns:
+        Windows that together cover the full time base
+    """
+    return [
+        (
+            start,
+            float(time[start]),
+            float(time[min(start + window_size, len(time)) - 1]),
+        )
+        for start in range(0, len(time), window_size)
+    ]
+
+
+def remap_path(
+    metadata: imas.ids_metadata.IDSMetadata, path: str, time_slice_offset: int
+) -> str:
+    """Convert the path of a node in a window to the path in the full IDS.
+
+    The indices of time dependent arrays of structures are shifted by the index of the
+    first time slice in the window, other indices are not changed.
+
+    Args:
+        metadata: Metadata of the IDS toplevel
+        path: Path of the node in the window, e.g. ``time_slice[0]/profiles_1d/q``
+        time_slice_offset: Index of the first time slice of the window
+
+    Returns:
+        Path of the node in the full IDS, e.g. ``time_slice[20]/profiles_1d/q``
+    """
+    if not time_slice_offset or "[" not in path:
+        return path
+    dynamic_paths = _dynamic_aos_paths(metadata)
+    parts = []
+    path_string = ""
+    for part in path.split("/"):
+        match = _INDEX_PATTERN.match(part)
+        name = part if match is None else match.group(1)
+        path_string = f"{path_string}/{name}" if path_string else name
+        if match is not None and path_string in dynamic_paths:
+            part = f"{name}[{int(match.group(2)) + time_slice_offset}]"
+        parts.append(part)
+    return "/".join(parts)
+
+
+@lru_cache(maxsize=None)
+def _dynamic_aos_paths(metadata: imas.ids_metadata.IDSMetadata) -> FrozenSet[str]:
+    """Return the paths of the time dependent arrays of structures in an IDS"""
+    paths = set()
+    todo = list(metadata)
+    while todo:
+        child = todo.pop()
+        if child.data_type is IDSDataType.STRUCT_ARRAY and child.type.is_dynamic:
+            paths.add(child.path_string)
+        todo.extend(child)
+    return frozenset(paths)
@@ -0,0 +1,138 @@
+"""
+This file describes the traversal cache, which shares the filled nodes and the Select
+results of an IDS between the rules that are applied to it
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import AbstractSet, Dict, Iterator, List, Optional, Tuple
+
+import imas  # type: ignore
+
+from imas_validator.validate.ids_wrapper import IDSWrapper
+
+SelectionKey = Tuple[str, bool, bool]
+"""Query, has_value and leaf_only arguments of a Select"""
+
+
+class _IDSTraversal:
+    """Traversal results of a single IDS"""
+
+    def __init__(self, ids: imas.ids_toplevel.IDSToplevel) -> None:
+        # Keep a reference, so the id of the IDS is not reused while it is cached
+        self.ids = ids
+        self.filled_nodes: Optional[List[imas.ids_primitive.IDSPrimitive]] = None
+        # Positions in filled_nodes per path string
+        self.positions: Dict[str, List[int]] = {}
+        self.selections: Dict[SelectionKey, List[IDSWrapper]] = {}
+
+
+class TraversalCache:
+    """Cache of the traversals of the IDSs that the rules are applied to.
+
+    The filled data nodes of an IDS are collected once, and are shared by the Select
+    queries on the IDS and by node coverage. The results of Select queries on an IDS
+    are memoized, so rules that run the same query do not traverse the IDS again.
+    Rules do not modify the IDSs, and the cache is cleared when the rules move on to
+    the next IDS.
+    """
+
+    def __init__(self) -> None:
+        self._idss: Dict[int, _IDSTraversal] = {}
+
+    def _get(self, ids: imas.ids_toplevel.IDSToplevel) -> _IDSTraversal:
+        traversal = self._idss.get(id(ids))
+        if traversal is None:
+            traversal = _IDSTraversal(ids)
+            self._idss[id(ids)] = traversal
+        return traversal
+
+    def clear(self) -> None:
+        """Remove the traversals of all IDSs"""
+        self._idss.clear()
+
+    def filled_nodes(
+        self, ids: imas.ids_toplevel.IDSToplevel
+    ) -> List[imas.ids_primitive.IDSPrimitive]:
+        """Return the filled data nodes of a fully loaded IDS, in the order of
+        imas.util.visit_children
+
+        Args:
+            ids: IDS of which the data nodes are returned
+        """
+        traversal = self._get(ids)
+        if traversal.filled_nodes is None:
+            nodes: List[imas.ids_primitive.IDSPrimitive] = []
+            imas.util.visit_children(nodes.append, ids, leaf_only=True)
+            for position, node in enumerate(nodes):
+                path = node.metadata.path_string
+                traversal.positions.setdefault(path, []).append(position)
+            traversal.filled_nodes = nodes
+        return traversal.filled_nodes
+
+    def filled_nodes_matching(
+        self, ids: imas.ids_toplevel.IDSToplevel, paths: AbstractSet[str]
+    ) -> List[imas.ids_primitive.IDSPrimitive]:
+        """Return the filled data nodes of a fully loaded IDS of which the path string
+        is in a set of paths, in the order of imas.util.visit_children
+
+        Args:
+            ids: IDS of which the data nodes are returned
+            paths: Path strings of the data nodes to return
+        """
+        nodes = self.filled_nodes(ids)
+        positions = self._get(ids).positions
+        if len(paths) < len(positions):
+            matching = [positions[path] for path in paths if path in positions]
+        else:
+            matching = [value for path, value in positions.items() if path in paths]
+        return [nodes[i] for i in sorted(i for value in matching for i in value)]
+
+    def get_selection(
+        self, ids: imas.ids_toplevel.IDSToplevel, key: SelectionKey
+    ) -> Optional[List[IDSWrapper]]:
+        """Return the memoized result of a Select query on an IDS, if any
+
+        Args:
+            ids: IDS on which the query is run
+            key: Arguments of the query
+        """
+        traversal = self._idss.get(id(ids))
+        if traversal is None:
+            return None
+        return traversal.selections.get(key)
+
+    def put_selection(
+        self,
+        ids: imas.ids_toplevel.IDSToplevel,
+        key: SelectionKey,
+        matches: List[IDSWrapper],
+    ) -> None:
+        """Memoize the result of a Select query on an IDS
+
+        Args:
+            ids: IDS on which the query is run
+            key: Arguments of the query
+            matches: Selected nodes
+        """
+        self._get(ids).selections[key] = matches
+
+    @contextmanager
+    def activate(self) -> Iterator[None]:
+        """Use this cache for the traversals in the current context, e.g. while a rule
+        is executed"""
+        token = _active_cache.set(self)
+        try:
+            yield
+        finally:
+            _active_cache.reset(token)
+
+
+_active_cache: ContextVar[Optional[TraversalCache]] = ContextVar(
+    "traversal_cache", default=None
+)
+
+
+def active_traversal_cache() -> Optional[TraversalCache]:
+    """Return the traversal cache of the current context, if any"""
+    return _active_cache.get()
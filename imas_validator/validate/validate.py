@@ -4,14 +4,20 @@ This file describes the main function for the IMAS IDS validation tool
 
 import logging
 import sys
+from typing import List
 
 import imas  # type: ignore
 from packaging.version import Version
+from rich.progress import Progress
 
 # from imas_validator.exceptions import IMASVersionError
-from imas_validator.rules.loading import load_rules
+from imas_validator.rules.data import IDSValidationRule
+from imas_validator.rules.index import RuleIndex
+from imas_validator.rules.loading import bind_rules, load_rules
+from imas_validator.validate.parallel import ParallelRuleExecutor
 from imas_validator.validate.result import IDSValidationResultCollection
 from imas_validator.validate.result_collector import ResultCollector
+from imas_validator.validate.result_store import count_assertions
 from imas_validator.validate.rule_executor import RuleExecutor
 from imas_validator.validate_options import ValidateOptions
 
@@ -34,30 +40,86 @@ def validate(
     Returns:
         List of IDSValidationResult objects
     """
+    return Validator(validate_options=validate_options).validate(imas_uri)
 
-    _check_imas_version()
+
+class Validator:
+    """Validation session that loads the rules once and applies them to any number
+    of data entries.
+
+    Example:
+        .. code-block:: python
+
+            validator = Validator(validate_options)
+            for imas_uri in imas_uris:
+                results = validator.validate(imas_uri)
+    """
+
+    def __init__(self, validate_options: ValidateOptions = default_val_opts) -> None:
+        """Initialize Validator and load the rules
+
+        Args:
+            validate_options: dataclass with options for validate function
+        """
+        _check_imas_version()
+        self.validate_options = validate_options
+        self.show_progress = True
+        self.rules: List[IDSValidationRule] = load_rules(
+            result_collector=ResultCollector(
+                validate_options=validate_options, imas_uri=""
+            ),
+            validate_options=validate_options,
+        )
+        self.rule_index = RuleIndex(self.rules)
+
+    def validate(self, imas_uri: str) -> IDSValidationResultCollection:
+        """Apply the loaded rules to a data entry
+
+        Args:
+            imas_uri: url for DBEntry object
+
+        Returns:
+            List of IDSValidationResult objects
+        """
+        dbentry = _open_dbentry(imas_uri)
+
+        result_collector = ResultCollector(
+            validate_options=self.validate_options, imas_uri=imas_uri
+        )
+        bind_rules(self.rules, result_collector)
+        executor_class = RuleExecutor
+        if self.validate_options.jobs > 1:
+            if self.validate_options.use_pdb:
+                logger.warning(
+                    "Debugger cannot be used with multiple jobs, using 1 job."
+                )
+            else:
+                executor_class = ParallelRuleExecutor
+        rule_executor = executor_class(
+            dbentry,
+            self.rules,
+            result_collector,
+            validate_options=self.validate_options,
+        )
+        rule_executor.rule_index = self.rule_index
+        if not self.show_progress:
+            rule_executor.progress = Progress(disable=True)
+        rule_executor.apply_rules_to_data()
+        results_collection = result_collector.result_collection(self.rules)
+        num_results = count_assertions(results_collection.results)
+        logger.info(f"{num_results} results obtained")
+        dbentry.close()
+        return results_collection
+
+
+def _open_dbentry(imas_uri: str) -> imas.DBEntry:
+    """Open the DBEntry for reading, exit when it cannot be opened."""
     try:
-        dbentry = imas.DBEntry(imas_uri, "r")
+        return imas.DBEntry(imas_uri, "r")
     except (imas.exception.ALException, imas.exception.LowlevelError) as e:
         logger.error(e)
         sys.exit(1)
 
-    result_collector = ResultCollector(
-        validate_options=validate_options, imas_uri=imas_uri
-    )
-    rules = load_rules(
-        result_collector=result_collector,
-        validate_options=validate_options,
-    )
-    rule_executor = RuleExecutor(
-        dbentry, rules, result_collector, validate_options=validate_options
-    )
-    rule_executor.apply_rules_to_data()
-    results_collection = result_collector.result_collection()
-    logger.info(f"{len(results_collection.results)} results obtained")
-    dbentry.close()
-    return results_collection
-
 
 def _check_imas_version() -> None:
     """Check if the installed IMAS version is sufficient."""
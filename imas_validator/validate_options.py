@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from imas_validator.rules.data import IDSValidationRule
 
@@ -57,3 +57,74 @@ class ValidateOptions:
     """Whether or not a node coverage dictionary should be created."""
     stop_at_load_error: bool = False
     """Whether or not to raise an error when an IDS cannot be loaded."""
+    jobs: int = 1
+    """Number of worker processes used to apply the rules to the IDS occurrences in
+    the data entry. Each worker opens the data entry and loads the rules itself."""
+    ids_cache_size: int = 100_000_000
+    """Memory budget in bytes of the cache of loaded IDSs, which avoids loading an IDS
+    again for every multi-IDS rule. Only IDSs that multi-IDS rules use as other than
+    their first argument are cached. The budget counts the array data of the IDSs, not
+    the overhead of the IDS nodes. Set to 0 to disable the cache."""
+    prefetch: int = 1
+    """Number of IDS occurrences that are loaded in a background thread while the
+    rules are executed on the current IDS. Set to 0 to disable prefetching. IDSs are
+    not prefetched when lazy_load is enabled."""
+    prefetch_max_nbytes: int = 1_000_000_000
+    """Maximum estimated size in bytes of prefetched IDSs that are waiting for the
+    rules to be executed on them."""
+    partial_load: bool = False
+    """Whether or not to load only the IDS paths that the rules may read, as found by
+    static analysis of the rule functions. IDSs that are used by a rule whose accesses
+    cannot be determined (e.g. rules that use ``Parent``) are fully loaded."""
+    lazy_load: bool = False
+    """Whether or not to lazy load the IDSs, so data is only read from the data entry
+    when a rule accesses it. Takes precedence over ``partial_load``. Requires a backend
+    that supports lazy loading. Node coverage then only counts the filled nodes that
+    were loaded while executing the rules."""
+    aggregate_passes: bool = False
+    """Whether or not to count passing assertions per rule, source location and IDSs
+    instead of storing a result for each of them. Failures and errors are always
+    stored as separate results."""
+    time_window: int = 0
+    """Number of time slices per window when streaming IDSs with a homogeneous time
+    base. IDSs with more time slices are read window by window with ``get_sample``
+    when all rules that apply to them are declared ``slice_safe``. Set to 0 to always
+    load IDSs whole."""
+    columnar_results: bool = False
+    """Whether or not to store the results in a
+    :py:class:`~imas_validator.validate.result_store.ColumnarResultStore`, which keeps
+    them in arrays instead of separate result objects. This reduces the memory use of
+    validation runs with many results and speeds up generating reports."""
+    results_dir: Optional[Path] = None
+    """Directory in which the results of every validated data entry are written to a
+    JSON Lines file while they are produced, so they are kept when validation is
+    interrupted. Results are then not kept in memory during validation, but read
+    back into a
+    :py:class:`~imas_validator.validate.result_store.ColumnarResultStore` when
+    validation is done."""
+    resume: bool = False
+    """Whether or not to resume an interrupted validation run from the checkpoints in
+    the results files in ``results_dir``. Rules and IDS occurrences that were
+    completed are not validated again, and their results are read from the results
+    file."""
+    cache_dir: Optional[Path] = None
+    """Directory of the persistent result cache. When set, the results of every IDS
+    occurrence are stored in the cache, and reused instead of executing the rules when
+    the IDS data, the rules that apply to it and the validator version did not change.
+    Unchanged backend files are detected without loading the IDS, otherwise the
+    loaded data is hashed. The cache is not used when node coverage is tracked."""
+    refresh_cache: bool = False
+    """Whether or not to execute all rules instead of reusing results from the
+    result cache. The cached results are replaced by the new results."""
+    profile: bool = False
+    """Whether or not to measure the wall time, CPU time, peak memory and number of
+    assertions of every rule per IDS occurrences, and the load time of the IDSs.
+    Memory is traced with :py:mod:`tracemalloc`, which slows down validation."""
+    profile_rules: Optional[str] = None
+    """Glob pattern of the names of the rules of which the function calls are
+    profiled with :py:mod:`cProfile`, e.g. ``"generic/ggd.py:*"``. Statistics are
+    collected per rule and IDS occurrences. Set to None to disable."""
+    node_report: bool = True
+    """Whether or not to record the IDS nodes that were used by every assertion, which
+    are listed in the reports. Disabling this skips tracking the nodes while the rules
+    are executed, unless ``track_node_dict`` is enabled."""
@@ -0,0 +1,82 @@
+from imas_validator.rules.access_analysis import analyze_rule
+
+
+def rule_attributes(ids):
+    for time_slice in ids.time_slice:
+        assert -17e6 <= time_slice.global_quantities.ip <= 0
+    assert ids.vacuum_toroidal_field.b0.has_value
+
+
+def rule_select(ids):
+    for node in Select(ids.profiles_1d, "_min$", has_value=True):  # noqa: F821
+        assert node.metadata.units == "eV"
+
+
+def rule_loop_binding(ids):
+    previous = None
+    for time_slice in ids.time_slice:
+        if previous is not None:
+            assert previous.time < time_slice.time
+        previous = time_slice
+
+
+def rule_enumerate(eq, cp):
+    for i, profiles_1d in enumerate(cp.profiles_1d):
+        assert Approx(profiles_1d.q, eq.time_slice[i].profiles_1d.q)  # noqa: F821
+
+
+def rule_parent(ids):
+    for node in Select(ids, "time$"):  # noqa: F821
+        assert Parent(node).time  # noqa: F821
+
+
+def helper(node):
+    return node.value
+
+
+def rule_unknown_function(ids):
+    assert helper(ids.time)
+
+
+def rule_full_ids(ids):
+    assert ids
+
+
+def test_analyze_attributes():
+    (access,) = analyze_rule(rule_attributes, 1)
+    assert access.subtrees == {
+        "time_slice/global_quantities/ip",
+        "vacuum_toroidal_field/b0/has_value",
+    }
+    assert access.navigations == {"time_slice"}
+    assert access.queries == set()
+
+
+def test_analyze_select():
+    (access,) = analyze_rule(rule_select, 1)
+    assert access.queries == {("profiles_1d", "_min$")}
+    assert access.subtrees == set()
+
+
+def test_analyze_loop_binding():
+    (access,) = analyze_rule(rule_loop_binding, 1)
+    assert access.subtrees == {"time_slice/time"}
+
+
+def test_analyze_multiple_arguments():
+    eq_access, cp_access = analyze_rule(rule_enumerate, 2)
+    assert eq_access.subtrees == {"time_slice/profiles_1d/q"}
+    assert cp_access.subtrees == {"profiles_1d/q"}
+    assert cp_access.navigations == {"profiles_1d"}
+
+
+def test_analyze_unresolved():
+    assert analyze_rule(rule_parent, 1) == [None]
+    assert analyze_rule(rule_unknown_function, 1) == [None]
+    # Rules with fewer parameters than IDSs cannot be analyzed
+    assert analyze_rule(rule_full_ids, 2) == [None, None]
+
+
+def test_analyze_full_ids():
+    (access,) = analyze_rule(rule_full_ids, 1)
+    assert access.subtrees == {""}
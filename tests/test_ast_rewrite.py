@@ -1,7 +1,11 @@
 import unittest.mock
 from textwrap import dedent
 
-from imas_validator.rules.ast_rewrite import rewrite_assert
+from imas_validator.rules.ast_rewrite import (
+    _get_cache_path,
+    compile_rule_file,
+    rewrite_assert,
+)
 
 
 class WrapperClass:
@@ -52,3 +56,41 @@ def test_overwritten_assert_with_msg():
     glob = {"assert": mock}
     exec(new_code, glob)
     mock.assert_called_with(False, "test_string")
+
+
+def test_compile_rule_file_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr("sys.dont_write_bytecode", False)
+    rule_path = tmp_path / "rules.py"
+    rule_path.write_text("x = 2\nassert x == 2\n")
+    target = "imas_validator.rules.ast_rewrite.rewrite_assert"
+
+    with unittest.mock.patch(target, wraps=rewrite_assert) as mock_rewrite:
+        code = compile_rule_file(rule_path)
+        assert mock_rewrite.call_count == 1
+        assert _get_cache_path(rule_path).exists()
+        # warm cache
+        cached_code = compile_rule_file(rule_path)
+        assert mock_rewrite.call_count == 1
+        assert cached_code == code
+
+        # changed file content invalidates the cache
+        rule_path.write_text("x = 3\nassert x == 3\n")
+        compile_rule_file(rule_path)
+        assert mock_rewrite.call_count == 2
+
+    mock = unittest.mock.Mock()
+    exec(compile_rule_file(rule_path), {"assert": mock})
+    mock.assert_called_with(True)
+
+
+def test_compile_rule_file_unwritable_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr("sys.dont_write_bytecode", False)
+    rule_path = tmp_path / "rules.py"
+    rule_path.write_text("x = 2\n")
+    # cache directory cannot be created
+    (tmp_path / "__pycache__").write_text("")
+
+    code = compile_rule_file(rule_path)
+    glob = {}
+    exec(code, glob)
+    assert glob["x"] == 2
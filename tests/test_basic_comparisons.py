@@ -227,3 +227,26 @@ def test_transfer_ids_nodes_between_arrays():
     assert wrapper[0]._ids_nodes == ["a"]
     assert wrapper[index]._ids_nodes == ["a", "b"]
     assert not isinstance([1, 2, 3][index], IDSWrapper)
+    # Indexing does not change the nodes of the indexed wrapper
+    assert wrapper._ids_nodes == ["a"]
+
+
+def test_ids_nodes_of_long_expressions():
+    cp = imas.IDSFactory("3.40.1").core_profiles()
+    cp.profiles_1d.resize(1)
+    cp.profiles_1d[0].ion.resize(3)
+    for ion in cp.profiles_1d[0].ion:
+        ion.z_ion = 1.0
+        ion.density = [1.0, 2.0]
+    ions = IDSWrapper(cp).profiles_1d[0].ion
+    result = sum(ion.density * ion.z_ion for ion in ions)
+    assert [node._path for node in result._ids_nodes] == [
+        f"profiles_1d[0]/ion[{i}]/{name}"
+        for i in range(3)
+        for name in ("density", "z_ion")
+    ]
+    z_ion = ions[0].z_ion
+    result = z_ion
+    for _ in range(100_000):
+        result = result + z_ion
+    assert len(result._ids_nodes) == 100_001
@@ -0,0 +1,28 @@
+import imas  # type: ignore
+
+from imas_validator.training.benchmark_setup import (
+    benchmark_uri,
+    create_benchmark_db_entry,
+)
+from imas_validator.validate.result_store import all_successful
+from imas_validator.validate.validate import validate
+from imas_validator.validate_options import ValidateOptions
+
+
+def test_create_benchmark_db_entry(tmp_path):
+    uri = create_benchmark_db_entry(benchmark_uri(tmp_path, "entry"), 3, 2, 5)
+    with imas.DBEntry(uri, "r") as entry:
+        cp = entry.get("core_profiles")
+        ep = entry.get("edge_profiles")
+    assert len(cp.time) == 3
+    assert len(cp.profiles_1d[0].ion) == 2
+    assert len(ep.grid_ggd) == 3
+    assert len(ep.grid_ggd[0].space[0].objects_per_dimension[0].object) == 5
+    assert len(ep.ggd[2].ion[1].density[0].values) == 5
+
+
+def test_benchmark_db_entry_is_valid(tmp_path):
+    uri = create_benchmark_db_entry(benchmark_uri(tmp_path, "entry"), 2, 2, 4)
+    results = validate(uri, ValidateOptions(rulesets=["generic"]))
+    assert len(results.results) > 0
+    assert all_successful(results.results)
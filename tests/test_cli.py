@@ -89,6 +89,22 @@ def test_validate_command_str_cast():
         filter_name=[],
         filter_ids=[],
         filter=[["homogeneous_time", "core_profiles"]],
+        jobs=1,
+        ids_cache_size=0,
+        prefetch=0,
+        partial_load=False,
+        lazy_load=False,
+        time_window=0,
+        aggregate_passes=False,
+        columnar_results=False,
+        results_dir=None,
+        resume=None,
+        cache_dir=None,
+        refresh_cache=False,
+        prune_cache=None,
+        profile=False,
+        profile_rules=None,
+        no_node_report=False,
     )
 
     command_object = validate_command.ValidateCommand(args)
@@ -106,3 +122,41 @@ def test_explore_command():
     argv = ["explore"]
 
     imas_validator_cli.main(argv)
+
+
+@pytest.mark.parametrize("batch_workers", ["1", "2"])
+def test_validate_multiple_uris(tmp_path, capsys, batch_workers):
+    uris = []
+    for name in ["first", "second", "third"]:
+        uri = f"{tmp_path}/{name}.nc"
+        with imas.DBEntry(uri, "w", dd_version="3.40.1") as entry:
+            cp = entry.factory.core_profiles()
+            cp.ids_properties.homogeneous_time = 1
+            cp.time = [0.0]
+            entry.put(cp)
+        uris.append(uri)
+    output = tmp_path / "reports"
+    argv = [
+        "validate",
+        *uris,
+        "--no-generic",
+        "--no-bundled",
+        "-e",
+        "tests/rulesets/validate-test",
+        "-r",
+        "test-ruleset",
+        "-o",
+        str(output),
+        "--batch-workers",
+        batch_workers,
+    ]
+
+    imas_validator_cli.main(argv)
+
+    # Failed URIs are printed in input order
+    assert capsys.readouterr().out.splitlines()[-1] == " ".join(uris)
+    (report_dir,) = output.iterdir()
+    for uri in uris:
+        for suffix in ["xml", "txt", "html"]:
+            assert (report_dir / f"{uri.replace('/', '|')}.{suffix}").exists()
+    assert (report_dir / "report.html").exists()
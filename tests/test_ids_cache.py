@@ -0,0 +1,41 @@
+import imas  # type: ignore
+import numpy
+
+from imas_validator.validate.ids_cache import IDSCache, estimate_nbytes
+
+
+def create_ids(size):
+    ids = imas.IDSFactory("3.40.1").core_profiles()
+    ids.ids_properties.homogeneous_time = 1
+    ids.time = numpy.zeros(size)
+    return ids
+
+
+def test_estimate_nbytes():
+    ids = create_ids(100)
+    ids.ids_properties.comment = "test"
+    # 800 bytes time array, 8 bytes homogeneous_time, 4 bytes comment
+    assert estimate_nbytes(ids) == 812
+
+
+def test_ids_cache_lru_eviction():
+    idss = [create_ids(99) for _ in range(3)]  # 800 bytes each
+    cache = IDSCache(max_nbytes=2000)
+    cache.put(("core_profiles", 0), idss[0])
+    cache.put(("core_profiles", 1), idss[1])
+    assert cache.get(("core_profiles", 0)) is idss[0]
+    # core_profiles:1 is least recently used
+    cache.put(("core_profiles", 2), idss[2])
+    assert cache.get(("core_profiles", 1)) is None
+    assert cache.get(("core_profiles", 0)) is idss[0]
+    assert cache.get(("core_profiles", 2)) is idss[2]
+    assert cache.nbytes == 1600
+    assert cache.hits == 3
+    assert cache.misses == 1
+
+
+def test_ids_cache_too_large():
+    cache = IDSCache(max_nbytes=100)
+    cache.put(("core_profiles", 0), create_ids(99))
+    assert cache.get(("core_profiles", 0)) is None
+    assert cache.nbytes == 0
@@ -0,0 +1,80 @@
+from pathlib import Path
+
+import imas  # type: ignore
+import pytest
+
+from imas_validator.validate.validate import validate
+from imas_validator.validate_options import ValidateOptions
+
+
+@pytest.fixture
+def uri(tmp_path):
+    uri = f"{tmp_path}/pulse.nc"
+    with imas.DBEntry(uri, "w", dd_version="3.40.1") as dbentry:
+        for occurrence in range(3):
+            cp = dbentry.factory.core_profiles()
+            cp.ids_properties.homogeneous_time = 1
+            cp.time = [0.0]
+            dbentry.put(cp, occurrence)
+        eq = dbentry.factory.equilibrium()
+        eq.ids_properties.homogeneous_time = 1
+        eq.time = [0.0]
+        dbentry.put(eq)
+    return uri
+
+
+def result_summary(results_collection):
+    return [
+        (res.rule.name, res.success, res.msg, res.idss, res.nodes_dict, type(res.exc))
+        for res in results_collection.results
+    ]
+
+
+@pytest.mark.parametrize("track_node_dict", [False, True])
+def test_parallel_validate(uri, track_node_dict):
+    validate_options = ValidateOptions(
+        rulesets=["test-ruleset"],
+        extra_rule_dirs=[Path("tests/rulesets/validate-test")],
+        apply_generic=False,
+        track_node_dict=track_node_dict,
+    )
+    serial = validate(uri, validate_options)
+    parallel_options = ValidateOptions(
+        rulesets=["test-ruleset"],
+        extra_rule_dirs=[Path("tests/rulesets/validate-test")],
+        apply_generic=False,
+        track_node_dict=track_node_dict,
+        jobs=2,
+    )
+    parallel = validate(uri, parallel_options)
+
+    assert len(parallel.results) == 7  # 3x success + 3x error for cp, 1x fail for eq
+    assert result_summary(parallel) == result_summary(serial)
+    assert parallel.coverage_dict == serial.coverage_dict
+    # Rule objects are those loaded in the main process
+    assert parallel.results[0].rule.func.__name__ == "validate_test_rule_success"
+    assert parallel.results[0].tb[-1].name == "validate_test_rule_success"
+    assert isinstance(parallel.results[1].exc, ZeroDivisionError)
+
+
+def test_parallel_profile(uri):
+    validate_options = ValidateOptions(
+        rulesets=["test-ruleset"],
+        extra_rule_dirs=[Path("tests/rulesets/validate-test")],
+        apply_generic=False,
+        profile=True,
+        profile_rules="*",
+    )
+    serial = validate(uri, validate_options)
+    parallel = validate(uri, ValidateOptions(**{**vars(validate_options), "jobs": 2}))
+
+    def summary(results_collection):
+        return [
+            (profile.rule_name, profile.idss, profile.num_assertions)
+            for profile in results_collection.rule_profiles
+        ]
+
+    assert summary(parallel) == summary(serial)
+    assert len(serial.rule_profiles) == 7
+    assert list(parallel.rule_call_stats) == list(serial.rule_call_stats)
+    assert len(serial.rule_call_stats) == 7
@@ -0,0 +1,83 @@
+import imas  # type: ignore
+import numpy
+
+from imas_validator.rules.access_analysis import ArgumentAccess
+from imas_validator.validate.partial_load import (
+    copy_requirements,
+    resolve_requirements,
+)
+from imas_validator.validate.validate import validate
+from imas_validator.validate_options import ValidateOptions
+
+
+def create_equilibrium():
+    eq = imas.IDSFactory("3.40.1").equilibrium()
+    eq.ids_properties.homogeneous_time = 1
+    eq.time = [0.0, 1.0]
+    eq.vacuum_toroidal_field.b0 = [-5.0, -5.0]
+    eq.time_slice.resize(2)
+    for time_slice in eq.time_slice:
+        time_slice.global_quantities.ip = -1.0e6
+        time_slice.profiles_1d.psi = numpy.linspace(0, 1, 5)
+        time_slice.profiles_1d.q = numpy.linspace(1, 3, 5)
+    return eq
+
+
+def test_resolve_requirements():
+    metadata = create_equilibrium().metadata
+    access = ArgumentAccess(
+        subtrees={"time_slice/global_quantities/ip", "time/has_value"},
+        navigations={"time_slice"},
+        queries={("time_slice/profiles_1d", "q$")},
+    )
+    tree = resolve_requirements(metadata, access)
+    assert tree == {
+        "time": (True, {}),
+        "time_slice": (
+            False,
+            {
+                "global_quantities": (False, {"ip": (True, {})}),
+                "profiles_1d": (False, {"q": (True, {})}),
+            },
+        ),
+    }
+
+    # Selecting everything or the toplevel itself requires the full IDS
+    assert resolve_requirements(metadata, ArgumentAccess(subtrees={""})) is None
+    access = ArgumentAccess(queries={("", ".*")})
+    assert resolve_requirements(metadata, access) is None
+
+
+def test_copy_requirements():
+    eq = create_equilibrium()
+    access = ArgumentAccess(
+        subtrees={"time_slice/global_quantities/ip"}, navigations={"time_slice"}
+    )
+    tree = resolve_requirements(eq.metadata, access)
+    partial = imas.IDSFactory("3.40.1").equilibrium()
+    copy_requirements(eq, partial, tree)
+
+    assert len(partial.time_slice) == 2
+    assert partial.time_slice[1].global_quantities.ip == -1.0e6
+    assert not partial.time_slice[1].profiles_1d.psi.has_value
+    assert not partial.time.has_value
+
+
+def test_validate_partial_load(tmp_path):
+    uri = f"{tmp_path}/pulse.nc"
+    with imas.DBEntry(uri, "w", dd_version="3.40.1") as dbentry:
+        dbentry.put(create_equilibrium())
+
+    results = {}
+    for partial_load in [False, True]:
+        validate_options = ValidateOptions(
+            rulesets=["iter"],
+            apply_generic=False,
+            partial_load=partial_load,
+        )
+        results[partial_load] = [
+            (result.rule.name, result.success, result.nodes_dict)
+            for result in validate(uri, validate_options).results
+        ]
+    assert results[True] == results[False]
+    assert len(results[True]) == 3
@@ -0,0 +1,86 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from imas_validator.validate import prefetch as prefetch_module
+from imas_validator.validate.prefetch import prefetch
+
+ids_list = [("core_profiles", occurrence) for occurrence in range(10)]
+
+
+@pytest.mark.parametrize("depth", [0, 1, 3])
+def test_prefetch_order(depth):
+    def load(ids_name, occurrence):
+        return f"{ids_name}:{occurrence}", 1
+
+    result = list(prefetch(load, ids_list, depth=depth, max_nbytes=100))
+    assert result == [(key, f"{key[0]}:{key[1]}") for key in ids_list]
+
+
+def test_prefetch_depth():
+    loaded = []
+
+    def load(ids_name, occurrence):
+        loaded.append(occurrence)
+        return occurrence, 1
+
+    ids_instances = prefetch(load, ids_list, depth=2, max_nbytes=100)
+    assert next(ids_instances) == (("core_profiles", 0), 0)
+    assert set(loaded) <= {0, 1, 2}
+    ids_instances.close()
+
+
+def test_prefetch_max_nbytes():
+    loaded = []
+
+    def load(ids_name, occurrence):
+        loaded.append(occurrence)
+        return occurrence, 1
+
+    # Only the IDS that is consumed next is loaded
+    ids_instances = prefetch(load, ids_list, depth=2, max_nbytes=0)
+    assert next(ids_instances) == (("core_profiles", 0), 0)
+    assert loaded == [0]
+    assert next(ids_instances) == (("core_profiles", 1), 1)
+    assert loaded == [0, 1]
+    ids_instances.close()
+
+
+def test_prefetch_max_nbytes_while_loading(monkeypatch):
+    submitted = []
+    submitted_while_loading = []
+
+    class RecordingExecutor(ThreadPoolExecutor):
+        def submit(self, fn, *args):
+            submitted.append(args[1])
+            return super().submit(fn, *args)
+
+    def load(ids_name, occurrence):
+        if occurrence < 2:
+            time.sleep(0.1)
+        if occurrence == 1:
+            submitted_while_loading.extend(submitted)
+        return occurrence, 6
+
+    monkeypatch.setattr(prefetch_module, "ThreadPoolExecutor", RecordingExecutor)
+    ids_instances = prefetch(load, ids_list, depth=3, max_nbytes=10)
+    assert next(ids_instances) == (("core_profiles", 0), 0)
+    # No other IDS is loaded ahead while the first one is loading
+    assert submitted == [0]
+    assert next(ids_instances) == (("core_profiles", 1), 1)
+    # The IDS that is still loading counts as large as the first one
+    assert submitted_while_loading == [0, 1, 2]
+    ids_instances.close()
+
+
+def test_prefetch_error():
+    def load(ids_name, occurrence):
+        if occurrence == 1:
+            raise ValueError("Cannot load IDS")
+        return occurrence, 1
+
+    ids_instances = prefetch(load, ids_list, depth=2, max_nbytes=100)
+    assert next(ids_instances) == (("core_profiles", 0), 0)
+    with pytest.raises(ValueError):
+        next(ids_instances)
@@ -0,0 +1,92 @@
+import os
+import time
+from pathlib import Path
+
+import imas  # type: ignore
+import pytest
+
+from imas_validator.rules.data import IDSValidationRule
+from imas_validator.validate.result import IDSValidationResult, LazyStackSummary
+from imas_validator.validate.result_cache import (
+    ResultCache,
+    cache_key,
+    ids_content_fingerprint,
+    ids_file_fingerprint,
+    rule_fingerprint,
+)
+
+
+def rule_a(cp):
+    pass
+
+
+def rule_b(cp):
+    assert cp.time
+
+
+RULE_A = IDSValidationRule(Path("/dummy/rules.py"), rule_a, "core_profiles")
+RULE_B = IDSValidationRule(Path("/dummy/rules.py"), rule_b, "core_profiles")
+CP = ("core_profiles", 0)
+
+
+def test_cache_put_get_prune(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    key = cache_key("core_profiles", 0)
+    rules = {RULE_A.name: RULE_A}
+    assert cache.get(key, rules) is None
+
+    tb = LazyStackSummary([(rule_a.__code__, 20)])
+    results = [
+        IDSValidationResult(True, "", RULE_A, [CP], tb, {CP: {"time"}}, count=2),
+        IDSValidationResult(False, "msg", RULE_A, [CP], tb, {}),
+    ]
+    cache.put(key, results)
+    cached = cache.get(key, rules)
+    assert [(res.success, res.msg, res.nodes_dict, res.count) for res in cached] == [
+        (True, "", {CP: {"time"}}, 2),
+        (False, "msg", {}, 1),
+    ]
+    assert all(res.cached for res in cached)
+    # Results of rules that are not loaded are not reused
+    assert cache.get(key, {}) is None
+
+    other_key = cache_key("core_profiles", 1)
+    cache.put(other_key, results)
+    old = time.time() - 3 * 86400
+    os.utime(cache._path(other_key), (old, old))
+    assert cache.prune(86400) == 1
+    assert cache.get(other_key, rules) is None
+    assert cache.get(key, rules) is not None
+    assert cache.prune() == 1
+    assert cache.prune() == 0
+
+
+def test_rule_fingerprint():
+    assert rule_fingerprint(RULE_A) == rule_fingerprint(RULE_A)
+    assert rule_fingerprint(RULE_A) != rule_fingerprint(RULE_B)
+
+
+@pytest.mark.parametrize("uri_format", ["{}/pulse.nc", "imas:hdf5?path={}"])
+def test_ids_file_fingerprint(tmp_path, uri_format):
+    path = tmp_path / "pulse.nc" if uri_format.endswith(".nc") else tmp_path
+    uri = uri_format.format(tmp_path)
+    assert ids_file_fingerprint(uri, "equilibrium") is None
+    (path if path.suffix else path / "equilibrium.h5").write_bytes(b"data")
+    fingerprint = ids_file_fingerprint(uri, "equilibrium")
+    assert fingerprint is not None
+    assert ids_file_fingerprint(uri, "equilibrium") == fingerprint
+    (path if path.suffix else path / "equilibrium.h5").write_bytes(b"changed")
+    assert ids_file_fingerprint(uri, "equilibrium") != fingerprint
+    # Data entries that are not stored in local files
+    assert ids_file_fingerprint("imas:mdsplus?user=test;pulse=1", "equilibrium") is None
+
+
+def test_ids_content_fingerprint():
+    factory = imas.IDSFactory("3.40.1")
+    cp = factory.core_profiles()
+    cp.time = [0.0, 1.0]
+    other = factory.core_profiles()
+    other.time = [0.0, 1.0]
+    assert ids_content_fingerprint(cp) == ids_content_fingerprint(other)
+    other.time[1] = 2.0
+    assert ids_content_fingerprint(cp) != ids_content_fingerprint(other)
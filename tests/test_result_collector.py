@@ -1,13 +1,25 @@
+import pickle
+import traceback
 from pathlib import Path
 from unittest.mock import Mock
 
+import numpy
 import pytest
 
 from imas_validator.rules.ast_rewrite import rewrite_assert
 from imas_validator.rules.data import ValidatorRegistry
+from imas_validator.rules.helpers import Approx, Increasing
 from imas_validator.validate.ids_wrapper import IDSWrapper
-from imas_validator.validate.result import CoverageMap
-from imas_validator.validate.result_collector import ResultCollector
+from imas_validator.validate.result import (
+    CoverageMap,
+    ElementFailures,
+    LazyStackSummary,
+)
+from imas_validator.validate.result_collector import (
+    MAX_ELEMENT_FAILURES,
+    ResultCollector,
+    find_element_failures,
+)
 from imas_validator.validate_options import ValidateOptions
 
 
@@ -63,7 +75,7 @@ def check_attrs(val_result, success):
     assert val_result.msg == ""
     assert val_result.rule.func.__name__ == "cool_func_name"
     assert val_result.idss == [("core_profiles", 0)]
-    assert val_result.tb[-1].lineno == 26
+    assert val_result.tb[-1].lineno == 38
     assert val_result.exc is None
 
 
@@ -72,7 +84,7 @@ def check_attrs_error(val_result):
     assert val_result.msg == ""
     assert val_result.rule.func.__name__ == val_result.tb[-1].name == "func_error"
     assert val_result.idss == [("core_profiles", 0)]
-    assert val_result.tb[-1].lineno == 37
+    assert val_result.tb[-1].lineno == 49
     assert isinstance(val_result.exc, ZeroDivisionError)
 
 
@@ -165,6 +177,28 @@ def test_rewritten_rule(res_collector, rewritten_rule, test_data_core_profiles):
     assert val_result.exc is None
 
 
+def test_lazy_traceback(res_collector, rule, test_data_core_profiles):
+    res_collector.set_context(
+        rule, [(test_data_core_profiles._obj, "core_profiles", 0)]
+    )
+    rule.func(True)
+    tb = res_collector.results[0].tb
+    assert isinstance(tb, LazyStackSummary)
+    assert len(tb) == 1
+    assert tb[-1].filename == __file__
+    assert tb[-1].line == "res_collector.assert_(ids_name)"
+    # The StackSummary interface is available
+    assert tb.format() == tb.summary.format()
+    assert tb.format()[-1].endswith("res_collector.assert_(ids_name)\n")
+    assert str(tb) == str(tb.summary)
+    assert tb == traceback.StackSummary.from_list(list(tb))
+    assert tb.format_frame_summary(tb[-1]) == tb.format()[-1]
+    # Unpickled results contain a regular StackSummary
+    unpickled = pickle.loads(pickle.dumps(tb))
+    assert isinstance(unpickled, traceback.StackSummary)
+    assert str(unpickled[-1]) == str(tb[-1])
+
+
 def test_nodes_dicts(res_collector, rule, test_data_core_profiles, test_data_waves):
     for i in range(2):
         res_collector.set_context(
@@ -212,3 +246,74 @@ def test_nodes_dicts(res_collector, rule, test_data_core_profiles, test_data_wav
         for i in range(2)
     }
     assert res_collector.coverage_dict() == expected_dict
+
+
+def test_aggregate_passes(rule, test_data_core_profiles):
+    res_collector = ResultCollector(
+        validate_options=ValidateOptions(aggregate_passes=True, track_node_dict=True),
+        imas_uri="",
+    )
+    rule.func = lambda test: res_collector.assert_(test)
+    res_collector.set_context(
+        rule, [(test_data_core_profiles._obj, "core_profiles", 0)]
+    )
+    ids_properties = test_data_core_profiles.ids_properties
+    rule.func(ids_properties.homogeneous_time == 0)
+    rule.func(IDSWrapper(False))
+    rule.func(ids_properties.comment == "Comment")
+    rule.func(IDSWrapper(False))
+
+    assert res_collector.num_results == 4
+    assert [(res.success, res.count) for res in res_collector.results] == [
+        (True, 2),
+        (False, 1),
+        (False, 1),
+    ]
+    assert res_collector.results[0].nodes_dict == {
+        ("core_profiles", 0): {
+            "ids_properties/homogeneous_time",
+            "ids_properties/comment",
+        }
+    }
+
+    res_collector.reset()
+    rule.func(IDSWrapper(True))
+    assert [(res.success, res.count) for res in res_collector.results] == [(True, 1)]
+
+
+def test_element_failures(res_collector, rule, test_data_core_profiles):
+    res_collector.set_context(
+        rule, [(test_data_core_profiles._obj, "core_profiles", 0)]
+    )
+    rho_tor_norm = test_data_core_profiles.profiles_1d[0].grid.rho_tor_norm
+    rule.func(rho_tor_norm < 0.5)
+    rule.func(Approx(rho_tor_norm, 0.0))
+    rule.func(Increasing(rho_tor_norm[::-1]))
+    rule.func(rho_tor_norm >= 0)
+
+    failures = [result.element_failures for result in res_collector.results]
+    assert failures[0] == ElementFailures(
+        indices=[(i,) for i in range(8, 16)][:MAX_ELEMENT_FAILURES],
+        count=8,
+        shape=(16,),
+    )
+    assert failures[1].count == 15
+    assert failures[1].indices[0] == (1,)
+    # The first element of an ordered array cannot be out of order
+    assert failures[2].count == 15
+    assert failures[2].indices[0] == (1,)
+    assert failures[3] is None
+
+
+def test_find_element_failures():
+    array = numpy.ones((3, 4), dtype=bool)
+    array[1, 2] = array[2, 0] = array[2, 3] = False
+    assert find_element_failures(array) == ElementFailures(
+        indices=[(1, 2), (2, 0), (2, 3)], count=3, shape=(3, 4)
+    )
+    assert find_element_failures(IDSWrapper(array), max_indices=1) == ElementFailures(
+        indices=[(1, 2)], count=3, shape=(3, 4)
+    )
+    assert find_element_failures(numpy.array([0.0, 1.0])).indices == [(0,)]
+    assert find_element_failures(IDSWrapper(False)) is None
+    assert find_element_failures(numpy.array(["a"])) is None
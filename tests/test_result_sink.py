@@ -0,0 +1,145 @@
+import traceback
+from pathlib import Path
+
+from imas_validator.rules.data import IDSValidationRule
+from imas_validator.validate.result import (
+    ElementFailures,
+    IDSValidationResult,
+    LazyStackSummary,
+)
+from imas_validator.validate.result_sink import (
+    JSONLinesResultSink,
+    iter_results,
+    read_checkpoint,
+    read_results,
+    results_file_path,
+)
+from imas_validator.validate.result_store import ColumnarResultStore
+
+
+def rule_func(cp):
+    pass
+
+
+RULE = IDSValidationRule(Path("/dummy/rules.py"), rule_func, "core_profiles")
+CP = ("core_profiles", 0)
+
+
+def create_result(index, success=True):
+    return IDSValidationResult(
+        success,
+        "" if success else "msg",
+        RULE,
+        [CP],
+        LazyStackSummary([(rule_func.__code__, index)]),
+        {CP: {f"profiles_1d[{index}]/t_i_average"}},
+        element_failures=None if success else ElementFailures([(0, 1)], 2, (2, 3)),
+    )
+
+
+def summarize(result):
+    return (
+        result.success,
+        result.msg,
+        result.rule,
+        result.idss,
+        [(frame.filename, frame.lineno, frame.name) for frame in result.tb],
+        result.nodes_dict,
+        result.count,
+        result.element_failures,
+    )
+
+
+def test_results_file_path(tmp_path):
+    assert results_file_path(tmp_path, "imas:hdf5?path=/a/b") == (
+        tmp_path / "imas:hdf5?path=|a|b.jsonl"
+    )
+
+
+def test_sink_roundtrip(tmp_path):
+    results = [create_result(i, success=i != 2) for i in range(5)]
+    results.append(
+        IDSValidationResult(
+            False,
+            "",
+            RULE,
+            [CP],
+            traceback.extract_stack(),
+            {},
+            exc=ZeroDivisionError("division by zero"),
+        )
+    )
+    sink = JSONLinesResultSink(tmp_path / "results.jsonl")
+    sink.extend(results)
+    assert len(sink) == len(results)
+    # Update of an aggregated result
+    results[0].count = 3
+    sink[0] = results[0]
+    sink.close()
+
+    store = sink.read()
+    assert isinstance(store, ColumnarResultStore)
+    assert [summarize(result) for result in store] == [
+        summarize(result) for result in results
+    ]
+    assert str(store[-1].exc) == "ZeroDivisionError: division by zero"
+
+
+def test_sink_writes_batches(tmp_path):
+    path = tmp_path / "results.jsonl"
+    sink = JSONLinesResultSink(path, batch_size=2)
+    sink.append(create_result(0))
+    assert not path.exists()
+    sink.append(create_result(1))
+    assert len(path.read_text().splitlines()) == 2
+    sink.append(create_result(2))
+    assert len(path.read_text().splitlines()) == 2
+    sink.close()
+    assert len(path.read_text().splitlines()) == 3
+
+
+def test_read_interrupted_file(tmp_path):
+    path = tmp_path / "results.jsonl"
+    sink = JSONLinesResultSink(path)
+    sink.extend(create_result(i) for i in range(3))
+    sink.close()
+    # Simulate an interruption while writing the last line
+    path.write_text(path.read_text()[:-10])
+
+    assert [index for index, _ in iter_results(path, [RULE])] == [0, 1]
+    assert len(read_results(path, [RULE])) == 2
+
+
+def test_resume_from_checkpoint(tmp_path):
+    path = tmp_path / "results.jsonl"
+    sink = JSONLinesResultSink(path)
+    sink.extend(create_result(i) for i in range(2))
+    sink.write_checkpoint(
+        ("rule", 0, RULE.name, (CP,), 0),
+        visited_nodes_dict={CP: {"time"}},
+        filled_nodes_dict={CP: {"time", "ids_properties/homogeneous_time"}},
+    )
+    # Results and coverage of the interrupted work are discarded
+    sink.append(create_result(2))
+    sink.write_checkpoint(("ids", *CP))
+    sink.append(create_result(3))
+    sink.flush()
+
+    checkpoint = read_checkpoint(path)
+    assert checkpoint.completed == {("rule", 0, RULE.name, (CP,), 0), ("ids", *CP)}
+    assert checkpoint.num_results == 3
+    assert checkpoint.visited_nodes_dict == {CP: {"time"}}
+
+    resumed = JSONLinesResultSink(path, resume=True)
+    assert len(resumed) == 3
+    assert resumed.checkpoint.completed == checkpoint.completed
+    resumed.append(create_result(4))
+    resumed.close()
+    store = resumed.read([RULE])
+    assert [result.tb[-1].lineno for result in store] == [0, 1, 2, 4]
+
+
+def test_resume_without_results_file(tmp_path):
+    sink = JSONLinesResultSink(tmp_path / "results.jsonl", resume=True)
+    assert len(sink) == 0
+    assert sink.checkpoint.completed == set()
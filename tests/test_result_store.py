@@ -0,0 +1,178 @@
+import pickle
+import traceback
+from pathlib import Path
+
+import numpy
+import pytest
+
+from imas_validator.report.utils import convert_result_into_custom_collection
+from imas_validator.report.validationReportGenerator import ValidationReportGenerator
+from imas_validator.rules.data import IDSValidationRule
+from imas_validator.validate.result import (
+    ElementFailures,
+    IDSValidationResult,
+    IDSValidationResultCollection,
+    LazyStackSummary,
+)
+from imas_validator.validate.result_collector import ResultCollector
+from imas_validator.validate.result_store import (
+    ColumnarResultStore,
+    all_successful,
+    count_assertions,
+    count_failures,
+)
+from imas_validator.validate_options import ValidateOptions
+
+
+def rule_a(cp):
+    pass
+
+
+def rule_b(cp, eq):
+    pass
+
+
+RULE_A = IDSValidationRule(Path("/dummy/rules.py"), rule_a, "core_profiles")
+RULE_B = IDSValidationRule(
+    Path("/dummy/rules.py"), rule_b, "core_profiles:0", "equilibrium:1"
+)
+CP = ("core_profiles", 0)
+EQ = ("equilibrium", 1)
+
+
+def create_results():
+    code = rule_a.__code__
+    tb = LazyStackSummary([(code, 10)])
+    tb_other = LazyStackSummary([(code, 11)])
+    return [
+        IDSValidationResult(True, "", RULE_A, [CP], tb, {CP: {"time"}}, count=3),
+        # First failure of a rule without affected nodes
+        IDSValidationResult(False, "msg", RULE_A, [CP], tb_other, {CP: set()}),
+        IDSValidationResult(False, "msg", RULE_A, [CP], tb_other, {CP: set()}),
+        IDSValidationResult(
+            False,
+            "msg",
+            RULE_A,
+            [CP],
+            tb,
+            {CP: {"a", "b"}},
+            element_failures=ElementFailures([(3,), (7,)], 5, (16,)),
+        ),
+        IDSValidationResult(True, "", RULE_B, [CP, EQ], tb, {CP: {"a"}, EQ: set()}),
+        IDSValidationResult(False, "", RULE_B, [CP, EQ], tb, {CP: set(), EQ: {"x"}}),
+        # Nodes dict that does not have an entry for every IDS
+        IDSValidationResult(False, "", RULE_B, [CP, EQ], tb, {EQ: {"y"}}),
+        IDSValidationResult(True, "", RULE_A, [EQ], tb, {}),
+        IDSValidationResult(
+            False,
+            "",
+            RULE_A,
+            [CP],
+            traceback.extract_stack(),
+            {},
+            exc=RuntimeError("Dummy exception"),
+        ),
+    ]
+
+
+def test_store_rows():
+    results = create_results()
+    store = ColumnarResultStore(results)
+
+    assert len(store) == len(results)
+    assert list(store) == results
+    assert store[3] == results[3]
+    assert store[-1] == results[-1]
+    assert store[1:3] == results[1:3]
+    assert store.row(6).nodes_dict == {EQ: {"y"}}
+    assert store.row(0).count == 3
+    assert store.row(0).rule is RULE_A
+    assert isinstance(store.row(8).exc, RuntimeError)
+    unpickled = pickle.loads(pickle.dumps(store))[3]
+    assert (unpickled.success, unpickled.msg, unpickled.nodes_dict) == (
+        False,
+        "msg",
+        {CP: {"a", "b"}},
+    )
+
+    # Rules, messages and tracebacks are interned
+    assert len(store.rules) == 2
+    assert store.messages == ["", "msg"]
+    assert len(store.locations) == 3
+    assert store.node_offsets()[-1] == len(store.node_ids())
+
+
+def test_store_columns():
+    store = ColumnarResultStore(create_results())
+
+    success = store.success()
+    assert numpy.flatnonzero(success).tolist() == [0, 4, 7]
+    assert store.counts()[0] == 3
+    assert count_assertions(store) == 11
+    assert count_failures(store) == 6
+    assert not all_successful(store)
+    passed = store.select(success)
+    assert all_successful(passed)
+    assert count_assertions(passed) == 5
+    assert [row.rule for row in passed] == [RULE_A, RULE_B, RULE_A]
+
+
+def test_store_setitem():
+    results = create_results()
+    store = ColumnarResultStore(results)
+    results[0].count = 5
+    results[0].nodes_dict[CP].add("time_slice")
+    store[0] = results[0]
+    assert store[0] == results[0]
+    assert store[1] == results[1]
+
+
+@pytest.mark.parametrize("order", ["forward", "reverse"])
+def test_report_collection(order):
+    results = create_results()
+    if order == "reverse":
+        results.reverse()
+
+    def create_collection(results):
+        return IDSValidationResultCollection(
+            results=results,
+            coverage_dict={},
+            validate_options=ValidateOptions(),
+            imas_uri="imas:mdsplus?test_result_store",
+        )
+
+    objects = create_collection(results)
+    columnar = create_collection(ColumnarResultStore(results))
+
+    objects_collection = convert_result_into_custom_collection(objects)
+    columnar_collection = convert_result_into_custom_collection(columnar)
+    assert [(x.ids, x.occurrence, x.rules) for x in columnar_collection] == [
+        (x.ids, x.occurrence, x.rules) for x in objects_collection
+    ]
+    for x, y in zip(columnar_collection, objects_collection):
+        assert [row.to_result() for row in x.result_list] == y.result_list
+
+    objects_report = ValidationReportGenerator(objects)
+    columnar_report = ValidationReportGenerator(columnar)
+    assert columnar_report.txt == objects_report.txt
+    assert columnar_report.xml == objects_report.xml
+    failed_elements = "a b: 5 of 16 elements failed at 3, 7 and 3 more"
+    assert f"FAILED ELEMENTS: {failed_elements}" in objects_report.txt
+    assert failed_elements in objects_report.xml
+
+
+def test_result_collector_columnar():
+    validate_options = ValidateOptions(
+        track_node_dict=True, aggregate_passes=True, columnar_results=True
+    )
+    result_collector = ResultCollector(validate_options, "")
+    result_collector.set_context(RULE_A, [])
+    for value in numpy.arange(5):
+        result_collector.assert_(value != 3)
+    assert isinstance(result_collector.results, ColumnarResultStore)
+    assert len(result_collector.results) == 2
+    results_collection = result_collector.result_collection()
+    assert [result.count for result in results_collection.results] == [4, 1]
+    result_collector.reset()
+    assert isinstance(result_collector.results, ColumnarResultStore)
+    assert len(result_collector.results) == 0
@@ -229,3 +229,52 @@ def test_parse_ids_names(dbentry):
     for ids_names in inputs:
         with pytest.raises(ValueError):
             rule = IDSValidationRule(Path("/my_path.py"), mock, *ids_names)
+
+
+def test_multi_ids_rules_load_ids_once(dbentry):
+    mocks = []
+    for i in range(3):
+        mock = Mock()
+        mock.__name__ = f"Mock func {i}"  # IDSValidationRule requires __name__
+        mocks.append(mock)
+    rules = [
+        IDSValidationRule(Path("t/multi.py"), mock, "equilibrium:0", "pf_active:0")
+        for mock in mocks
+    ]
+    result_collector = ResultCollector(
+        validate_options=ValidateOptions(), imas_uri=dbentry.uri
+    )
+    rule_executor = RuleExecutor(
+        dbentry, rules, result_collector, validate_options=ValidateOptions()
+    )
+    rule_executor.apply_rules_to_data([("equilibrium", 0)])
+
+    for mock in mocks:
+        mock.assert_called_once()
+    assert dbentry.get.call_count == 2
+    assert rule_executor.ids_cache.hits == 2
+    # The cache is only consulted for the IDS that the rules use as second argument
+    assert rule_executor.ids_cache.misses == 1
+    # Only the IDS that the rules use as second argument is kept in the cache
+    assert rule_executor.ids_cache.nbytes_of(("equilibrium", 0)) is None
+    assert rule_executor.ids_cache.nbytes_of(("pf_active", 0)) is not None
+
+
+def test_skip_ids_without_rules(rule_executor, caplog):
+    dbentry = rule_executor.db_entry
+    # Only keep the core_profiles rule
+    rule_executor.rules = rule_executor.rules[1:2]
+    with caplog.at_level(logging.INFO):
+        rule_executor.apply_rules_to_data()
+
+    assert rule_executor.rules[0].func.call_count == 4
+    loaded = {args.args[0] for args in dbentry.get.call_args_list}
+    listed = {args.args[0] for args in dbentry.list_all_occurrences.call_args_list}
+    assert loaded == listed == {"core_profiles"}
+    n_skipped = len(dbentry.factory.ids_names()) - 1
+    message = f"Skipped {n_skipped} IDSs and 0 IDS occurrences that no rule applies to"
+    assert (
+        "imas_validator.validate.rule_executor",
+        logging.INFO,
+        message,
+    ) in caplog.record_tuples
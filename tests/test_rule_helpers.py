@@ -6,6 +6,7 @@ import numpy as np
 import pytest
 
 from imas_validator.rules.helpers import Approx, Decreasing, Increasing, Parent, Select
+from imas_validator.rules.helpers import _select_trie
 from imas_validator.validate.ids_wrapper import IDSWrapper
 
 
@@ -114,6 +115,47 @@ def test_select_empty_nodes(select_ids):
     )
 
 
+def test_select_trie(select_ids):
+    trie = _select_trie(select_ids.metadata, "(^|/)time$")
+    # Only the children that lead to matching paths are in the trie
+    assert "ids_properties" not in trie
+    assert "vacuum_toroidal_field" not in trie
+    assert trie["time"] == (True, None)
+    assert trie["profiles_1d"] == (False, {"time": (True, None)})
+    # The trie is built once per DD version and query
+    other_ids = imas.IDSFactory("3.40.1").new("core_profiles")
+    assert _select_trie(other_ids.metadata, "(^|/)time$") is trie
+    # The number of cached tries is bounded
+    assert _select_trie.cache_info().maxsize is not None
+
+
+def test_select_after_setting_values():
+    # Nodes that are filled after the IDS was created are selected, also when they
+    # are filled through a reference to their parent structure
+    ids = imas.IDSFactory("3.40.1").new("core_profiles")
+    global_quantities = ids.global_quantities
+    global_quantities.ip = [1.0]
+    ids.profiles_1d.resize(1)
+    profiles_1d = ids.profiles_1d[0]
+    profiles_1d.grid.rho_tor_norm = [0.0, 1.0]
+    assert_select_matches(
+        Select(IDSWrapper(ids), "(/ip|rho_tor_norm)$"),
+        [global_quantities.ip, profiles_1d.grid.rho_tor_norm],
+    )
+
+
+def test_select_substructure(select_ids):
+    assert_select_matches(
+        Select(IDSWrapper(select_ids.profiles_1d[0]), "time"),
+        [select_ids.profiles_1d[0].time],
+    )
+    assert_select_matches(
+        Select(IDSWrapper(select_ids.time), "time"), [select_ids.time]
+    )
+    selection = list(Select(IDSWrapper(select_ids), ".*", leaf_only=False))
+    assert selection[0]._obj is select_ids
+
+
 @pytest.mark.parametrize("func", (Increasing, Decreasing))
 def test_increasing_decreasing_errors(select_ids, func):
     with pytest.raises(TypeError):  # IDS must be wrapped
@@ -205,3 +247,46 @@ def test_parent(select_ids):
     # Getting parents <= 0 will just return and IDSWrapper with the same node:
     assert Parent(node, 0)._obj is node._obj
     assert Parent(node, -1)._obj is node._obj
+
+
+@pytest.mark.parametrize(
+    "query, kwargs",
+    [
+        ("time", {}),
+        ("(^|/)time$", {}),
+        ("(^|/)time$", {"has_value": False}),
+        ("profiles_1d", {"leaf_only": False}),
+    ],
+)
+def test_select_lazy(select_ids, tmp_path, monkeypatch, query, kwargs):
+    # profiles_1d[1].time is intentionally left empty
+    monkeypatch.setenv("IMAS_AL_DISABLE_VALIDATE", "1")
+    with imas.DBEntry(f"{tmp_path}/test.nc", "w", dd_version="3.40.1") as dbentry:
+        dbentry.put(select_ids)
+        lazy_ids = dbentry.get("core_profiles", lazy=True, autoconvert=False)
+
+        selection = Select(IDSWrapper(lazy_ids), query, **kwargs)
+        expected = Select(IDSWrapper(select_ids), query, **kwargs)
+        assert [node._obj._path for node in selection] == [
+            node._obj._path for node in expected
+        ]
+        # Subtrees without matching paths are not loaded
+        assert "vacuum_toroidal_field" not in lazy_ids.__dict__
+
+
+def test_helpers_return_single_boolean():
+    # Combined with other expressions, the helpers mean "all elements pass"
+    partly_close = Approx(IDSWrapper([1.0, 2.0]), [1.0, 3.0])
+    assert partly_close._obj is False
+    assert not partly_close
+    assert partly_close == False  # noqa: E712
+    np.testing.assert_array_equal(partly_close._element_results, [True, False])
+
+    partly_increasing = Increasing(IDSWrapper([1, 2, 1]))
+    assert partly_increasing._obj is False
+    assert (partly_increasing == False)._obj is True  # noqa: E712
+    np.testing.assert_array_equal(
+        partly_increasing._element_results, [True, True, False]
+    )
+    # Derived expressions do not keep the elementwise results
+    assert (partly_increasing == False)._element_results is None  # noqa: E712
@@ -0,0 +1,53 @@
+from pathlib import Path
+from unittest.mock import Mock
+
+from imas_validator.rules.data import IDSValidationRule
+from imas_validator.rules.index import RuleIndex
+
+
+def create_rule(*ids_names, version=""):
+    mock = Mock()
+    mock.__name__ = "Mock func"  # IDSValidationRule requires __name__
+    return IDSValidationRule(Path("t/rules.py"), mock, *ids_names, version=version)
+
+
+def test_rule_index_find():
+    rules = [
+        create_rule("*", version="==3.40.1"),
+        create_rule("core_profiles"),
+        create_rule("core_profiles:1"),
+        create_rule("*:1"),
+        create_rule("*", version="==3.40.0"),
+        create_rule("equilibrium:0", "core_profiles:0"),
+    ]
+    index = RuleIndex(rules)
+
+    assert index.find("core_profiles", 0, "3.40.1") == [rules[0], rules[1]]
+    assert index.find("core_profiles", 1, "3.40.1") == rules[:4]
+    assert index.find("core_profiles", 1, "3.40.0") == rules[1:5]
+    # Multi-IDS rules are matched on their first IDS only
+    assert index.find("equilibrium", 0, "3.39.0") == [rules[5]]
+    assert index.find("pf_active", 2, "3.39.0") == []
+
+
+def test_rule_index_memoizes_versions():
+    index = RuleIndex([create_rule("*", version=">=3.40")])
+    assert index.find("core_profiles", 0, "3.40.1") is index.find(
+        "core_profiles", 0, "3.40.1"
+    )
+    assert len(index._version_matches) == 1
+    assert index.find("core_profiles", 0, "3.39.0") == []
+    assert len(index._version_matches) == 2
+
+
+def test_rule_index_applies_to():
+    index = RuleIndex([create_rule("core_profiles:1"), create_rule("*:2")])
+    assert index.applies_to_ids("core_profiles")
+    assert index.applies_to_ids("equilibrium")
+    assert index.applies_to("core_profiles", 1)
+    assert index.applies_to("equilibrium", 2)
+    assert not index.applies_to("core_profiles", 0)
+
+    index = RuleIndex([create_rule("equilibrium:0", "core_profiles:0")])
+    assert index.applies_to_ids("equilibrium")
+    assert not index.applies_to_ids("core_profiles")
@@ -0,0 +1,122 @@
+import json
+import pstats
+import time
+import tracemalloc
+
+from imas_validator.validate.result import RuleProfile
+from imas_validator.validate.rule_profile import (
+    RuleCallProfiler,
+    RuleProfiler,
+    save_rule_call_stats,
+    save_rule_profiles,
+)
+
+CP = ("core_profiles", 0)
+EQ = ("equilibrium", 0)
+
+
+def test_measure_rule():
+    profiler = RuleProfiler()
+    assertions = [0]
+    with profiler.measure_load(*CP):
+        time.sleep(0.01)
+    for _ in range(2):
+        with profiler.measure_rule("rules.py:rule", [CP], lambda: assertions[0]):
+            data = [0] * 100_000
+            assertions[0] += 3
+            del data
+    with profiler.measure_rule("rules.py:other", [CP, EQ], lambda: assertions[0]):
+        assertions[0] += 1
+    profiler.stop()
+    assert not tracemalloc.is_tracing()
+
+    profile, other = profiler.profiles
+    assert (profile.rule_name, profile.idss, profile.num_assertions) == (
+        "rules.py:rule",
+        [CP],
+        6,
+    )
+    assert profile.wall_time > 0
+    assert profile.peak_memory >= 800_000
+    assert profile.load_time >= 0.01
+    assert other.num_assertions == 1
+    assert other.load_time == profile.load_time
+
+
+def test_merge_and_save(tmp_path):
+    profiler = RuleProfiler()
+    profiler.merge([RuleProfile("a", [CP], wall_time=1.0, num_assertions=2)])
+    profiler.merge(
+        [
+            RuleProfile("a", [CP], wall_time=0.5, peak_memory=10, num_assertions=1),
+            RuleProfile("b", [EQ], wall_time=2.0),
+        ]
+    )
+    profiles = profiler.profiles
+    assert [(p.rule_name, p.wall_time, p.num_assertions) for p in profiles] == [
+        ("a", 1.5, 3),
+        ("b", 2.0, 0),
+    ]
+
+    save_rule_profiles(profiles, tmp_path / "profile.json")
+    saved = json.loads((tmp_path / "profile.json").read_text())
+    assert [profile["rule_name"] for profile in saved] == ["b", "a"]
+    assert saved[1]["idss"] == [list(CP)]
+
+
+def helper(n):
+    return sum(range(n))
+
+
+def test_rule_call_profiler(tmp_path):
+    profiler = RuleCallProfiler("ggd/*")
+    assert profiler.matches("ggd/ggd.py:validate_grid")
+    assert not profiler.matches("generic/generic.py:validate_time")
+
+    for _ in range(2):
+        with profiler.profile_rule("ggd/ggd.py:validate_grid", [CP, EQ]):
+            helper(10)
+    with profiler.profile_rule("ggd/ggd.py:validate_other", [CP]):
+        helper(10)
+    stats = profiler.stats
+    assert list(stats) == [
+        ("ggd/ggd.py:validate_grid", (CP, EQ)),
+        ("ggd/ggd.py:validate_other", (CP,)),
+    ]
+    (helper_stats,) = [
+        value
+        for (_, _, name), value in stats[("ggd/ggd.py:validate_grid", (CP, EQ))].items()
+        if name == "helper"
+    ]
+    assert helper_stats[1] == 2  # Number of calls of both runs
+
+    merged_profiler = RuleCallProfiler("*")
+    merged_profiler.merge(stats)
+    merged_profiler.merge(stats)
+    paths = save_rule_call_stats(merged_profiler.stats, tmp_path / "pstats")
+    assert [path.name for path in paths] == [
+        "ggd_ggd.py_validate_grid__core_profiles_0_equilibrium_0.pstats",
+        "ggd_ggd.py_validate_other__core_profiles_0.pstats",
+        "merged.pstats",
+    ]
+    merged = pstats.Stats(str(paths[-1]))
+    (calls,) = [
+        value[1]
+        for (_, _, name), value in merged.stats.items()  # type: ignore[attr-defined]
+        if name == "helper"
+    ]
+    assert calls == 6
+
+
+def test_save_rule_call_stats_keeps_input(tmp_path):
+    profiler = RuleCallProfiler("*")
+    for rule_name in ["generic.py:validate_a", "generic.py:validate_b"]:
+        with profiler.profile_rule(rule_name, [CP]):
+            helper(10)
+    stats = profiler.stats
+    copies = {key: dict(value) for key, value in stats.items()}
+
+    save_rule_call_stats(stats, tmp_path / "pstats")
+    assert stats == copies
+    save_rule_call_stats(stats, tmp_path / "pstats")
+    assert stats == copies
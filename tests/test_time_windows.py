@@ -0,0 +1,115 @@
+from pathlib import Path
+
+import imas  # type: ignore
+import numpy
+
+from imas_validator.rules.data import IDSValidationRule
+from imas_validator.validate.result_collector import ResultCollector
+from imas_validator.validate.rule_executor import RuleExecutor
+from imas_validator.validate.time_windows import get_time_windows, remap_path
+from imas_validator.validate_options import ValidateOptions
+
+TIME = numpy.linspace(0.0, 4.5, 10)
+
+
+def create_equilibrium(time):
+    eq = imas.IDSFactory("3.40.1").equilibrium()
+    eq.ids_properties.homogeneous_time = 1
+    eq.time = time
+    eq.time_slice.resize(len(time))
+    for t, time_slice in zip(time, eq.time_slice):
+        # The fourth time slice is invalid
+        time_slice.global_quantities.ip = 1.0 if t == TIME[3] else -1.0
+        time_slice.profiles_1d.psi = [0.0, 1.0]
+    return eq
+
+
+class StreamingDBEntry:
+    """DBEntry with a single equilibrium IDS that supports get_sample"""
+
+    uri = ""
+    factory = imas.IDSFactory("3.40.1")
+
+    def __init__(self):
+        self.samples = []
+
+    def list_all_occurrences(self, ids_name):
+        return [0] if ids_name == "equilibrium" else []
+
+    def get(self, ids_name, occurrence=0, lazy=False, autoconvert=True):
+        return create_equilibrium(TIME)
+
+    def get_sample(self, ids_name, tmin, tmax, occurrence=0, autoconvert=True):
+        self.samples.append((tmin, tmax))
+        return create_equilibrium(TIME[(TIME >= tmin) & (TIME <= tmax)])
+
+
+def validate_equilibrium(time_window, slice_safe=True):
+    validate_options = ValidateOptions(time_window=time_window, track_node_dict=True)
+    result_collector = ResultCollector(validate_options, "")
+
+    def validate_ip(eq):
+        for time_slice in eq.time_slice:
+            result_collector.assert_(time_slice.global_quantities.ip < 0)
+
+    rule = IDSValidationRule(
+        Path("t/rules.py"), validate_ip, "equilibrium", slice_safe=slice_safe
+    )
+    dbentry = StreamingDBEntry()
+    rule_executor = RuleExecutor(dbentry, [rule], result_collector, validate_options)
+    rule_executor.apply_rules_to_data()
+    return dbentry, result_collector
+
+
+def test_get_time_windows():
+    assert get_time_windows(TIME, 4) == [(0, 0.0, 1.5), (4, 2.0, 3.5), (8, 4.0, 4.5)]
+    assert get_time_windows(TIME, 10) == [(0, 0.0, 4.5)]
+
+
+def test_remap_path():
+    metadata = imas.IDSFactory("3.40.1").equilibrium().metadata
+    assert remap_path(metadata, "time_slice[1]/profiles_2d[1]/psi", 4) == (
+        "time_slice[5]/profiles_2d[1]/psi"
+    )
+    assert remap_path(metadata, "time_slice[1]/global_quantities/ip", 0) == (
+        "time_slice[1]/global_quantities/ip"
+    )
+    assert remap_path(metadata, "vacuum_toroidal_field/b0", 4) == (
+        "vacuum_toroidal_field/b0"
+    )
+
+
+def test_streaming_validation():
+    dbentry, full = validate_equilibrium(time_window=0)
+    assert dbentry.samples == []
+
+    dbentry, streamed = validate_equilibrium(time_window=4)
+    assert dbentry.samples == [(0.0, 1.5), (2.0, 3.5), (4.0, 4.5)]
+
+    def summarize(result_collector):
+        return [
+            (result.success, result.nodes_dict) for result in result_collector.results
+        ]
+
+    assert summarize(streamed) == summarize(full)
+    assert not streamed.results[3].success
+    assert streamed.results[3].nodes_dict[("equilibrium", 0)] == {
+        "time_slice[3]/global_quantities/ip"
+    }
+    assert streamed.filled_nodes_dict == full.filled_nodes_dict
+    assert streamed.coverage_dict() == full.coverage_dict()
+
+
+def test_rules_not_slice_safe_load_full_ids():
+    dbentry, result_collector = validate_equilibrium(time_window=4, slice_safe=False)
+    assert dbentry.samples == []
+    assert len(result_collector.results) == len(TIME)
+
+
+def test_streaming_not_supported(monkeypatch):
+    def get_sample(*args, **kwargs):
+        raise NotImplementedError("`get_sample` is not available for netCDF files.")
+
+    monkeypatch.setattr(StreamingDBEntry, "get_sample", get_sample)
+    _, result_collector = validate_equilibrium(time_window=4)
+    assert len(result_collector.results) == len(TIME)
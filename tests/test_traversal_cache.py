@@ -0,0 +1,71 @@
+import imas  # type: ignore
+import pytest
+
+from imas_validator.rules.helpers import Select
+from imas_validator.validate.ids_wrapper import IDSWrapper
+from imas_validator.validate.traversal_cache import (
+    TraversalCache,
+    active_traversal_cache,
+)
+
+
+@pytest.fixture
+def ids() -> imas.ids_toplevel.IDSToplevel:
+    ids = imas.IDSFactory("3.40.1").new("core_profiles")
+    ids.ids_properties.homogeneous_time = 0
+    ids.time = [0.0, 1.1]
+    ids.profiles_1d.resize(2)
+    ids.profiles_1d[0].time = 0.0
+    ids.profiles_1d[1].time = 1.1
+    ids.profiles_1d[1].grid.rho_tor_norm = [0.0, 1.0]
+    return ids
+
+
+def test_filled_nodes(ids):
+    cache = TraversalCache()
+    nodes = cache.filled_nodes(ids)
+    expected = []
+    imas.util.visit_children(expected.append, ids)
+    assert nodes == expected
+    assert cache.filled_nodes(ids) is nodes
+    matching = cache.filled_nodes_matching(ids, {"time", "profiles_1d/time"})
+    assert matching == [ids.profiles_1d[0].time, ids.profiles_1d[1].time, ids.time]
+    cache.clear()
+    assert cache.filled_nodes(ids) is not nodes
+
+
+@pytest.mark.parametrize(
+    "query, kwargs",
+    [
+        ("(^|/)time$", {}),
+        (".*", {}),
+        ("profiles_1d", {"leaf_only": False}),
+        ("(^|/)time$", {"has_value": False}),
+    ],
+)
+def test_select_with_cache(ids, query, kwargs):
+    expected = [node._obj for node in Select(IDSWrapper(ids), query, **kwargs)]
+    cache = TraversalCache()
+    assert active_traversal_cache() is None
+    with cache.activate():
+        assert active_traversal_cache() is cache
+        selection = [node._obj for node in Select(IDSWrapper(ids), query, **kwargs)]
+        assert selection == expected
+        memoized = cache.get_selection(
+            ids, (query, kwargs.get("has_value", True), kwargs.get("leaf_only", True))
+        )
+        assert [node._obj for node in memoized] == expected
+        # Memoized results are returned for the same query
+        selection = [node._obj for node in Select(IDSWrapper(ids), query, **kwargs)]
+        assert selection == expected
+    assert active_traversal_cache() is None
+
+
+def test_select_substructure_not_cached(ids):
+    cache = TraversalCache()
+    with cache.activate():
+        selection = Select(IDSWrapper(ids.profiles_1d[1]), "rho_tor_norm")
+        assert [node._obj for node in selection] == [
+            ids.profiles_1d[1].grid.rho_tor_norm
+        ]
+    assert cache.get_selection(ids.profiles_1d[1], ("rho_tor_norm", True, True)) is None
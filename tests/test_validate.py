@@ -1,13 +1,24 @@
-import imas  # type: ignore    
+import imas  # type: ignore
+import gc
 import logging
+import threading
+import tracemalloc
+import weakref
 from functools import lru_cache
 from pathlib import Path
 from unittest.mock import patch
+from xml.dom import minidom
 
 import numpy
+import pytest
 
+from imas_validator.report.validationReportGenerator import ValidationReportGenerator
+from imas_validator.rules.data import IDSValidationRule
+from imas_validator.rules.loading import load_rules
+from imas_validator.training.benchmark_setup import create_benchmark_db_entry
 from imas_validator.validate.result import IDSValidationResult
-from imas_validator.validate.validate import validate
+from imas_validator.validate.result_store import ColumnarResultStore
+from imas_validator.validate.validate import Validator, validate
 from imas_validator.validate_options import ValidateOptions
 
 _occurrence_dict = {
@@ -24,7 +35,9 @@ def list_all_occurrences(ids_name: str):
 def get(ids_name: str, occurrence: int = 0, autoconvert: bool = False):
     # Trying to get an IDS that isn't filled is an error:
     if occurrence not in list_all_occurrences(ids_name):
-        raise imas.exception.DataEntryException(f"IDS {ids_name!r}, occurrence {occurrence} is empty.")
+        raise imas.exception.DataEntryException(
+            f"IDS {ids_name!r}, occurrence {occurrence} is empty."
+        )
 
     ids = imas.IDSFactory("3.40.1").new(ids_name)
     ids.ids_properties.comment = f"Test IDS: {ids_name}/{occurrence}"
@@ -85,3 +98,440 @@ def test_validate(caplog):
             logging.INFO,
             "3 results obtained",
         )
+
+
+def test_validator_reuses_rules():
+    module = "imas_validator.validate.validate"
+    with patch(
+        f"{module}.imas.DBEntry",
+        spec=True,
+        list_all_occurrences=list_all_occurrences,
+        get=get,
+        uri="",
+        factory=imas.IDSFactory("3.40.1"),
+    ), patch(f"{module}._check_imas_version"), patch(
+        f"{module}.load_rules", wraps=load_rules
+    ) as mock_load_rules:
+        validate_options = ValidateOptions(
+            rulesets=["test-ruleset"],
+            extra_rule_dirs=[Path("tests/rulesets/validate-test")],
+            apply_generic=False,
+        )
+        validator = Validator(validate_options=validate_options)
+        first = validator.validate("first")
+        second = validator.validate("second")
+
+        mock_load_rules.assert_called_once()
+        # Every URI has its own results
+        assert first.imas_uri == "first"
+        assert second.imas_uri == "second"
+        assert len(first.results) == len(second.results) == 3
+        assert all(
+            res1.rule is res2.rule and res1.success == res2.success
+            for res1, res2 in zip(first.results, second.results)
+        )
+
+
+def create_equilibrium_entry(uri):
+    eq = imas.IDSFactory("3.40.1").equilibrium()
+    eq.ids_properties.homogeneous_time = 1
+    eq.time = [0.0, 1.0, 2.0, 3.0]
+    eq.vacuum_toroidal_field.b0 = [-5.0] * 4
+    eq.time_slice.resize(4)
+    for time_slice in eq.time_slice:
+        time_slice.global_quantities.ip = -1.0e6
+        time_slice.profiles_1d.psi = numpy.linspace(0, 1, 5)
+    # Invalid current in the last time slice
+    eq.time_slice[3].global_quantities.ip = 1.0e6
+    with imas.DBEntry(uri, "w", dd_version="3.40.1") as dbentry:
+        dbentry.put(eq)
+
+
+def test_validate_lazy_load(tmp_path):
+    uri = f"{tmp_path}/pulse.nc"
+    create_equilibrium_entry(uri)
+
+    results = {}
+    coverage = {}
+    for lazy_load in [False, True]:
+        validate_options = ValidateOptions(
+            rulesets=["iter"], track_node_dict=True, lazy_load=lazy_load
+        )
+        results_collection = validate(uri, validate_options)
+        results[lazy_load] = [
+            (res.rule.name, res.success, res.nodes_dict)
+            for res in results_collection.results
+        ]
+        coverage[lazy_load] = results_collection.coverage_dict[("equilibrium", 0)]
+    assert results[True] == results[False]
+    # Only the filled nodes that the rules loaded are known in lazy mode
+    assert coverage[True].visited == coverage[False].visited
+    assert 0 < coverage[True].filled <= coverage[False].filled
+
+
+def test_validate_lazy_load_generic_ggd(tmp_path):
+    uri = create_benchmark_db_entry(f"{tmp_path}/pulse.nc", 2, 2, 4)
+
+    results = {}
+    for lazy_load in [False, True]:
+        validate_options = ValidateOptions(rulesets=["generic"], lazy_load=lazy_load)
+        results_collection = validate(uri, validate_options)
+        results[lazy_load] = [
+            (res.rule.name, res.idss, res.success, res.msg, res.exc is None)
+            for res in results_collection.results
+        ]
+    assert any(name.startswith("generic/ggd.py:") for name, *_ in results[False])
+    assert all(res[-1] for res in results[False])
+    assert results[True] == results[False]
+
+
+def test_validate_lazy_load_prefetch(tmp_path):
+    uri = f"{tmp_path}/pulse.nc"
+    eq = imas.IDSFactory("3.40.1").equilibrium()
+    eq.ids_properties.homogeneous_time = 1
+    eq.time = [0.0]
+    with imas.DBEntry(uri, "w", dd_version="3.40.1") as dbentry:
+        for occurrence in range(3):
+            dbentry.put(eq, occurrence)
+
+    get = imas.DBEntry.get
+    threads = []
+
+    def recording_get(self, *args, **kwargs):
+        threads.append(threading.current_thread())
+        return get(self, *args, **kwargs)
+
+    results = {}
+    with patch.object(imas.DBEntry, "get", recording_get):
+        for lazy_load in [False, True]:
+            threads.clear()
+            validate_options = ValidateOptions(
+                rulesets=["generic"], lazy_load=lazy_load, prefetch=2
+            )
+            results[lazy_load] = [
+                (res.rule.name, res.idss, res.success)
+                for res in validate(uri, validate_options).results
+            ]
+            main_thread_only = all(
+                thread is threading.main_thread() for thread in threads
+            )
+            # Lazy loaded IDSs read from the backend while the rules run, so they
+            # are not loaded in a background thread
+            assert main_thread_only == lazy_load
+    assert results[True] == results[False]
+
+
+def test_validate_lazy_load_releases_idss(tmp_path):
+    uri = f"{tmp_path}/pulse.nc"
+    with imas.DBEntry(uri, "w", dd_version="3.40.1") as dbentry:
+        for occurrence in range(3):
+            eq = imas.IDSFactory("3.40.1").equilibrium()
+            eq.ids_properties.homogeneous_time = 1
+            eq.time = [float(occurrence)]
+            dbentry.put(eq, occurrence)
+
+    get = imas.DBEntry.get
+    loaded = []
+    alive = []
+
+    def recording_get(self, *args, **kwargs):
+        gc.collect()
+        alive.append(sum(ref() is not None for ref in loaded))
+        ids = get(self, *args, **kwargs)
+        loaded.append(weakref.ref(ids))
+        return ids
+
+    validate_options = ValidateOptions(
+        rulesets=["generic"], lazy_load=True, track_node_dict=True
+    )
+    with patch.object(imas.DBEntry, "get", recording_get):
+        results_collection = validate(uri, validate_options)
+    # Only the IDS that was validated last is still referenced when the next one is
+    # loaded, the filled nodes of the others have been collected already
+    assert alive == [0, 1, 1]
+    for occurrence in range(3):
+        assert results_collection.coverage_dict[("equilibrium", occurrence)].filled
+
+
+def test_validate_aggregate_passes(tmp_path):
+    uri = f"{tmp_path}/pulse.nc"
+    create_equilibrium_entry(uri)
+
+    results_collections = {}
+    for aggregate_passes in [False, True]:
+        validate_options = ValidateOptions(
+            rulesets=["iter"], track_node_dict=True, aggregate_passes=aggregate_passes
+        )
+        results_collections[aggregate_passes] = validate(uri, validate_options)
+    full = results_collections[False]
+    aggregated = results_collections[True]
+
+    assert len(aggregated.results) < len(full.results)
+    assert sum(result.count for result in aggregated.results) == len(full.results)
+    # Failures are stored separately
+    failures = [result for result in full.results if not result.success]
+    assert failures
+    assert [
+        (result.rule.name, result.nodes_dict)
+        for result in aggregated.results
+        if not result.success
+    ] == [(result.rule.name, result.nodes_dict) for result in failures]
+    assert aggregated.coverage_dict == full.coverage_dict
+
+    full_report = ValidationReportGenerator(full)
+    aggregated_report = ValidationReportGenerator(aggregated)
+    assert aggregated_report.txt == full_report.txt
+    full_xml = minidom.parseString(full_report.xml).documentElement
+    aggregated_xml = minidom.parseString(aggregated_report.xml).documentElement
+    for attribute in ["tests", "failures"]:
+        assert aggregated_xml.getAttribute(attribute) == full_xml.getAttribute(
+            attribute
+        )
+
+
+@pytest.mark.parametrize("aggregate_passes", [False, True])
+def test_validate_columnar_results(tmp_path, aggregate_passes):
+    uri = f"{tmp_path}/pulse.nc"
+    create_equilibrium_entry(uri)
+
+    results_collections = {}
+    for columnar_results in [False, True]:
+        validate_options = ValidateOptions(
+            rulesets=["iter"],
+            track_node_dict=True,
+            aggregate_passes=aggregate_passes,
+            columnar_results=columnar_results,
+        )
+        results_collections[columnar_results] = validate(uri, validate_options)
+    objects = results_collections[False]
+    columnar = results_collections[True]
+
+    assert isinstance(columnar.results, ColumnarResultStore)
+
+    def summarize(results_collection):
+        return [
+            (res.rule.name, res.success, res.msg, res.nodes_dict, res.count)
+            for res in results_collection.results
+        ]
+
+    assert summarize(columnar) == summarize(objects)
+    objects_report = ValidationReportGenerator(objects)
+    columnar_report = ValidationReportGenerator(columnar)
+    assert columnar_report.txt == objects_report.txt
+    assert columnar_report.xml == objects_report.xml
+
+
+@pytest.mark.parametrize("aggregate_passes", [False, True])
+def test_validate_results_dir(tmp_path, aggregate_passes):
+    uri = f"{tmp_path}/pulse.nc"
+    create_equilibrium_entry(uri)
+    results_dir = tmp_path / "results"
+
+    in_memory = validate(
+        uri,
+        ValidateOptions(
+            rulesets=["iter"], track_node_dict=True, aggregate_passes=aggregate_passes
+        ),
+    )
+    streamed = validate(
+        uri,
+        ValidateOptions(
+            rulesets=["iter"],
+            track_node_dict=True,
+            aggregate_passes=aggregate_passes,
+            results_dir=results_dir,
+        ),
+    )
+
+    assert list(results_dir.iterdir()) == [
+        results_dir / f"{uri.replace('/', '|')}.jsonl"
+    ]
+    assert isinstance(streamed.results, ColumnarResultStore)
+
+    def summarize(results_collection):
+        return [
+            (res.rule.name, res.success, res.nodes_dict, res.count)
+            for res in results_collection.results
+        ]
+
+    assert summarize(streamed) == summarize(in_memory)
+    in_memory_report = ValidationReportGenerator(in_memory)
+    streamed_report = ValidationReportGenerator(streamed)
+    assert streamed_report.txt == in_memory_report.txt
+    assert streamed_report.xml == in_memory_report.xml
+
+
+def test_validate_resume(tmp_path):
+    uri = f"{tmp_path}/pulse.nc"
+    create_equilibrium_entry(uri)
+
+    def validate_options(results_dir, resume=False):
+        return ValidateOptions(
+            rulesets=["iter"],
+            track_node_dict=True,
+            aggregate_passes=True,
+            results_dir=results_dir,
+            resume=resume,
+        )
+
+    applied_rules = []
+    apply_func = IDSValidationRule.apply_func
+
+    def counting_apply_func(rule, ids_instances):
+        applied_rules.append(rule.name)
+        apply_func(rule, ids_instances)
+
+    with patch.object(IDSValidationRule, "apply_func", counting_apply_func):
+        uninterrupted = validate(uri, validate_options(tmp_path / "full"))
+    all_rules = applied_rules
+    assert len(all_rules) > 3
+
+    def interrupting_apply_func(rule, ids_instances):
+        if len(applied_rules) == 3:
+            raise KeyboardInterrupt
+        counting_apply_func(rule, ids_instances)
+
+    applied_rules = []
+    results_dir = tmp_path / "resumed"
+    with patch.object(IDSValidationRule, "apply_func", interrupting_apply_func):
+        with pytest.raises(KeyboardInterrupt):
+            validate(uri, validate_options(results_dir))
+    # The last line was being written when validation was interrupted
+    (results_file,) = results_dir.iterdir()
+    with open(results_file, "a") as file:
+        file.write('{"index": 3, "rule": ')
+
+    applied_rules = []
+    with patch.object(IDSValidationRule, "apply_func", counting_apply_func):
+        resumed = validate(uri, validate_options(results_dir, resume=True))
+    # Completed rules are not applied again
+    assert applied_rules == all_rules[3:]
+
+    assert resumed.coverage_dict == uninterrupted.coverage_dict
+    uninterrupted_report = ValidationReportGenerator(uninterrupted)
+    resumed_report = ValidationReportGenerator(resumed)
+    assert resumed_report.txt == uninterrupted_report.txt
+    assert resumed_report.xml == uninterrupted_report.xml
+
+
+def test_validate_result_cache(tmp_path):
+    uri = f"{tmp_path}/pulse.nc"
+    create_equilibrium_entry(uri)
+    cache_dir = tmp_path / "cache"
+
+    applied_rules = []
+    apply_func = IDSValidationRule.apply_func
+
+    def counting_apply_func(rule, ids_instances):
+        applied_rules.append(rule.name)
+        apply_func(rule, ids_instances)
+
+    def run(uri, **kwargs):
+        applied_rules.clear()
+        with patch.object(IDSValidationRule, "apply_func", counting_apply_func):
+            return validate(uri, ValidateOptions(rulesets=["iter"], **kwargs))
+
+    def summarize(results_collection):
+        return [
+            (res.rule.name, res.success, res.msg, res.nodes_dict, res.count)
+            for res in results_collection.results
+        ]
+
+    uncached = run(uri)
+    all_rules = list(applied_rules)
+    first = run(uri, cache_dir=cache_dir)
+    assert applied_rules == all_rules
+    assert not any(res.cached for res in first.results)
+
+    # Results are reused when the files did not change
+    second = run(uri, cache_dir=cache_dir)
+    assert applied_rules == []
+    assert all(res.cached for res in second.results)
+    assert summarize(second) == summarize(uncached)
+    report = ValidationReportGenerator(second)
+    assert "Number of tests reused from cache" in report.txt
+    assert "(cached)" in report.txt
+    assert '<property name="cached" value="true"/>' in report.xml
+
+    # Copied data is recognized by its content
+    copy_uri = f"{tmp_path}/copy.nc"
+    Path(copy_uri).write_bytes(Path(uri).read_bytes())
+    assert summarize(run(copy_uri, cache_dir=cache_dir)) == summarize(uncached)
+    assert applied_rules == []
+
+    # Changed data is validated again
+    with imas.DBEntry(copy_uri, "w", dd_version="3.40.1") as dbentry:
+        eq = imas.IDSFactory("3.40.1").equilibrium()
+        eq.ids_properties.homogeneous_time = 1
+        eq.time = [0.0]
+        dbentry.put(eq)
+    run(copy_uri, cache_dir=cache_dir)
+    assert applied_rules == all_rules
+
+    run(uri, cache_dir=cache_dir, refresh_cache=True)
+    assert applied_rules == all_rules
+    # Results of lazy loaded IDSs are cached separately
+    run(uri, cache_dir=cache_dir, lazy_load=True)
+    assert applied_rules == all_rules
+    # Coverage requires the rules to be executed
+    run(uri, cache_dir=cache_dir, track_node_dict=True)
+    assert applied_rules == all_rules
+
+
+def test_validate_profile(tmp_path):
+    uri = f"{tmp_path}/pulse.nc"
+    create_equilibrium_entry(uri)
+
+    unprofiled = validate(uri, ValidateOptions(rulesets=["iter"]))
+    assert unprofiled.rule_profiles == []
+    assert "Rule profile" not in ValidationReportGenerator(unprofiled).txt
+
+    profiled = validate(uri, ValidateOptions(rulesets=["iter"], profile=True))
+    assert not tracemalloc.is_tracing()
+    profiles = profiled.rule_profiles
+    assert profiles
+    assert sum(profile.num_assertions for profile in profiles) == len(profiled.results)
+    assert all(profile.idss == [("equilibrium", 0)] for profile in profiles)
+    assert all(profile.load_time > 0 for profile in profiles)
+
+    report = ValidationReportGenerator(profiled)
+    assert "Rule profile (slowest first):" in report.txt
+    testcases = minidom.parseString(report.xml).getElementsByTagName("testcase")
+    assert all(testcase.getAttribute("time") for testcase in testcases)
+
+
+def test_validate_node_report(tmp_path):
+    uri = f"{tmp_path}/pulse.nc"
+    create_equilibrium_entry(uri)
+
+    reported = validate(uri, ValidateOptions(rulesets=["iter"]))
+    assert any(result.nodes_dict[("equilibrium", 0)] for result in reported.results)
+
+    unreported = validate(uri, ValidateOptions(rulesets=["iter"], node_report=False))
+    assert len(unreported.results) == len(reported.results)
+    assert all(not result.nodes_dict for result in unreported.results)
+    ValidationReportGenerator(unreported)
+
+    # Node coverage needs the nodes of every assertion
+    covered = validate(
+        uri,
+        ValidateOptions(rulesets=["iter"], node_report=False, track_node_dict=True),
+    )
+    assert [result.nodes_dict for result in covered.results] == [
+        result.nodes_dict for result in reported.results
+    ]
+
+
+def test_validate_profile_rules(tmp_path):
+    uri = f"{tmp_path}/pulse.nc"
+    create_equilibrium_entry(uri)
+
+    assert validate(uri, ValidateOptions(rulesets=["iter"])).rule_call_stats == {}
+    results_collection = validate(
+        uri, ValidateOptions(rulesets=["iter"], profile_rules="generic/*")
+    )
+    rule_call_stats = results_collection.rule_call_stats
+    assert rule_call_stats
+    for rule_name, idss in rule_call_stats:
+        assert rule_name.startswith("generic/")
+        assert idss == (("equilibrium", 0),)